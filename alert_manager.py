@@ -1,81 +1,380 @@
+import io
+import math
 import threading
-import time
-import subprocess
-from typing import Dict, Optional
-import os
+import wave
+from array import array
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional, Tuple
 
-try:
-    import winsound
-    WINSOUND_AVAILABLE = True
-except ImportError:
-    WINSOUND_AVAILABLE = False
+from clock import SYSTEM_CLOCK, Clock
+
+SAMPLE_RATE = 22050
+
+@lru_cache(maxsize=8)
+def render_tone(frequency: int, duration: int, volume: int, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Render a sine beep as 16-bit mono PCM.
+
+    Cached per (frequency, duration, volume), so each setting is rendered once.
+    """
+    count = sample_rate * duration // 1000
+    amplitude = 32767 * 0.8 * max(0, min(100, volume)) / 100
+    # Short linear fade at both ends avoids clicks
+    fade = max(1, min(count // 10, sample_rate // 200))
+    step = 2 * math.pi * frequency / sample_rate
+    samples = array('h', bytes(2 * count))
+    for i in range(count):
+        gain = min(1.0, i / fade, (count - 1 - i) / fade)
+        samples[i] = int(amplitude * gain * math.sin(step * i))
+    return samples.tobytes()
+
+def to_wav(pcm: bytes, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Wrap 16-bit mono PCM in a WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+class AudioSink:
+    """Where the audio engine sends tones. play() may block while playing."""
+
+    def play(self, pcm: bytes, sample_rate: int) -> None:
+        raise NotImplementedError
+
+class WinsoundSink(AudioSink):
+    """Play through the Windows sound system."""
+
+    def __init__(self):
+        import winsound
+        self._winsound = winsound
+
+    def play(self, pcm: bytes, sample_rate: int) -> None:
+        self._winsound.PlaySound(to_wav(pcm, sample_rate), self._winsound.SND_MEMORY)
+
+class BellSink(AudioSink):
+    """Fallback for systems without winsound: ring the terminal bell."""
+
+    def play(self, pcm: bytes, sample_rate: int) -> None:
+        print("\a")  # ASCII bell
+
+class WavFileSink(AudioSink):
+    """Append everything played to a WAV file, for testing without speakers."""
+
+    def __init__(self, path: str, sample_rate: int = SAMPLE_RATE):
+        self._wav = wave.open(path, 'wb')
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+
+    def play(self, pcm: bytes, sample_rate: int) -> None:
+        self._wav.writeframes(pcm)
+
+    def close(self) -> None:
+        self._wav.close()
+
+class NullSink(AudioSink):
+    """Discard audio, only counting what would have been played."""
 
-class AlertManager:
     def __init__(self):
-        self.active_alerts: Dict[str, threading.Thread] = {}
-        self.alert_stop_flags: Dict[str, bool] = {}
-        self.alert_timeout = 120  # 2 minutes in seconds
+        self.plays = 0
+        self.bytes_played = 0
+
+    def play(self, pcm: bytes, sample_rate: int) -> None:
+        self.plays += 1
+        self.bytes_played += len(pcm)
+
+def default_sink() -> AudioSink:
+    try:
+        return WinsoundSink()
+    except ImportError:
+        return BellSink()
+
+class AlertPolicy:
+    """How an alert plays from start to finish.
+
+    It beeps every `interval` seconds until it is stopped or `timeout`
+    seconds have passed. Escalation is off unless `escalate_after` is set:
+    after that many seconds it beeps every `escalated_interval` seconds
+    instead (by default half the interval, however that is changed later),
+    with the escalated frequency and volume where they are set. Snoozing
+    silences it for `snooze` seconds by default, after which it starts over.
+    """
+
+    def __init__(self, timeout: float = 120.0, interval: float = 1.0,
+                 escalate_after: Optional[float] = None, escalated_interval: Optional[float] = None,
+                 escalated_frequency: Optional[int] = None, escalated_volume: Optional[int] = None,
+                 snooze: float = 300.0):
+        self.timeout = timeout
+        self.interval = interval
+        self.escalate_after = escalate_after
+        self.escalated_interval = escalated_interval
+        self.escalated_frequency = escalated_frequency
+        self.escalated_volume = escalated_volume
+        self.snooze = snooze
+
+class Alert:
+    """One timer's alert: its policy, when it (re)started and its stage."""
+    __slots__ = ('name', 'policy', 'started', 'escalated', 'snoozed', 'handles')
+
+    def __init__(self, name: str, policy: AlertPolicy, started: float):
+        self.name = name
+        self.policy = policy
+        self.started = started
+        self.escalated = False
+        self.snoozed = False
+        # Pending deadlines (timeout, escalation or end of snooze)
+        self.handles: List[object] = []
+
+    @property
+    def interval(self) -> float:
+        policy = self.policy
+        if not self.escalated:
+            return policy.interval
+        if policy.escalated_interval is None:
+            return policy.interval / 2
+        return policy.escalated_interval
+
+class AlertManager:
+    """Runs alerts for finished timers on deadlines, and plays them from
+    a single audio engine thread.
+
+    Each alert's timeout, escalation and snooze are calls on a shared
+    scheduler, and every sounding alert shares one beep, scheduled at the
+    shortest interval among them. No thread waits on an alert, so the cost
+    is the same for one alert or a hundred: the scheduler's thread (the
+    TimerManager's, when it passes its own) and the audio thread, which
+    only plays queued tones. On a TimingWheel scheduler, beeps fall on its
+    ticks. active_alerts maps timer names to their Alert.
+    Without an explicit sink, the platform's audio backend is loaded the
+    first time `sink` is used.
+    """
+
+    def __init__(self, sink: Optional[AudioSink] = None, clock: Clock = SYSTEM_CLOCK,
+                 scheduler=None, policy: Optional[AlertPolicy] = None):
+        self._sink = sink
+        self.clock = clock
+        # A timer_manager.Scheduler (or LoopScheduler); own one if not given
+        self._scheduler = scheduler
+        self._owns_scheduler = False
+        self.policy = policy if policy is not None else AlertPolicy()
+        self.active_alerts: Dict[str, Alert] = {}
         self.volume = 100  # Volume percentage (1-100)
         self.beep_frequency = 880  # Hz
         self.beep_duration = 500  # milliseconds
-        self.beep_interval = 1.0  # seconds between beeps
+        self._condition = threading.Condition()
+        # Tones for the audio thread; None tells it to exit
+        self._tones: Deque[Optional[Tuple[int, int, int]]] = deque()
+        # The shared beat: its scheduled call and when it is due
+        self._beat = None
+        self._beat_due = math.inf
+        # Whether a beat's tone is queued and not yet played
+        self._beat_queued = False
+        self._thread: Optional[threading.Thread] = None
+        # Set by TimerManager.enable_metrics()
+        self.metrics = None
+
+    @property
+    def sink(self) -> AudioSink:
+        if self._sink is None:
+            self._sink = default_sink()
+        return self._sink
+
+    @sink.setter
+    def sink(self, sink: AudioSink) -> None:
+        self._sink = sink
+
+    @property
+    def scheduler(self):
+        if self._scheduler is None:
+            from timer_manager import Scheduler
+            self._scheduler = Scheduler(clock=self.clock)
+            self._owns_scheduler = True
+        return self._scheduler
+
+    @scheduler.setter
+    def scheduler(self, scheduler) -> None:
+        self._scheduler = scheduler
+        self._owns_scheduler = False
+
+    @property
+    def alert_timeout(self) -> float:
+        """Seconds an alert plays before it stops by itself."""
+        return self.policy.timeout
 
-    def _play_alert(self, timer_name: str):
-        """Play a beep sound repeatedly until stopped"""
-        while not self.alert_stop_flags.get(timer_name, True):
+    @alert_timeout.setter
+    def alert_timeout(self, seconds: float) -> None:
+        self.policy.timeout = seconds
+
+    @property
+    def beep_interval(self) -> float:
+        return self.policy.interval
+
+    @beep_interval.setter
+    def beep_interval(self, seconds: float) -> None:
+        self.policy.interval = seconds
+
+    def thread_count(self) -> int:
+        """Number of audio engine threads running (0 or 1)."""
+        return int(self._thread is not None and self._thread.is_alive())
+
+    def _ensure_engine(self):
+        """Start the audio engine thread on first use. Caller holds the lock."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="AudioEngine")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._tones:
+                    self._condition.wait()
+                tone = self._tones.popleft()
+                if tone is None:
+                    return
+                if not self._tones:
+                    self._beat_queued = False
             try:
-                if WINSOUND_AVAILABLE:
-                    # Use Windows beep with configurable settings
-                    winsound.Beep(self.beep_frequency, self.beep_duration)
-                else:
-                    # Fallback for non-Windows systems
-                    print(f"\a")  # ASCII bell
-                time.sleep(self.beep_interval)
+                self.sink.play(render_tone(*tone), SAMPLE_RATE)
+                if self.metrics is not None:
+                    self.metrics.beeps.inc()
             except Exception as e:
                 print(f"Error playing alert: {str(e)}")
-                # If sound fails, try a simple print
-                print(f"\a\nTimer {timer_name} completed!")  # \a is ASCII bell
-                break
-
-    def start_alert(self, timer_name: str):
-        """Start a new alert for a timer"""
-        # Stop existing alert if any
-        self.stop_alert(timer_name)
-
-        # Set up new alert
-        self.alert_stop_flags[timer_name] = False
-        alert_thread = threading.Thread(
-            target=self._alert_with_timeout,
-            args=(timer_name,)
-        )
-        alert_thread.daemon = True
-        self.active_alerts[timer_name] = alert_thread
-        alert_thread.start()
-
-    def _alert_with_timeout(self, timer_name: str):
-        """Run alert with 2-minute timeout"""
-        start_time = time.time()
-        self._play_alert(timer_name)
-
-        # Stop if 2 minutes have passed
-        if time.time() - start_time >= self.alert_timeout:
-            self.stop_alert(timer_name)
+                # If sound fails, fall back to the terminal bell
+                self.sink = BellSink()
+
+    def _queue_tone(self, tone: Tuple[int, int, int]) -> None:
+        """Hand a tone to the audio thread. Caller holds the lock."""
+        self._tones.append(tone)
+        self._ensure_engine()
+        self._condition.notify()
+
+    def _schedule_beat(self, when: float) -> None:
+        """Make the shared beat due at `when` unless it is due sooner. Caller holds the lock."""
+        if when >= self._beat_due:
+            return
+        self.scheduler.cancel(self._beat)
+        self._beat_due = when
+        self._beat = self.scheduler.call_at(when, self._on_beat)
+
+    def _cancel_beat(self) -> None:
+        """Stop beeping if no alert is sounding. Caller holds the lock."""
+        if any(not alert.snoozed for alert in self.active_alerts.values()):
+            return
+        self.scheduler.cancel(self._beat)
+        self._beat = None
+        self._beat_due = math.inf
+
+    def _on_beat(self) -> None:
+        with self._condition:
+            self._beat = None
+            self._beat_due = math.inf
+            sounding = [alert for alert in self.active_alerts.values() if not alert.snoozed]
+            if not sounding:
+                return
+            escalated = [alert.policy for alert in sounding if alert.escalated]
+            frequency, volume = self.beep_frequency, self.volume
+            if escalated:
+                frequency = escalated[0].escalated_frequency or frequency
+                volume = escalated[0].escalated_volume or volume
+            # A beep still waiting to play makes this one redundant
+            if not self._beat_queued:
+                self._beat_queued = True
+                self._queue_tone((frequency, self.beep_duration, volume))
+            interval = min(alert.interval for alert in sounding)
+            self._schedule_beat(self.clock.monotonic() + interval)
+
+    def _start(self, alert: Alert) -> None:
+        """Schedule an alert's timeout and escalation and beep now. Caller holds the lock."""
+        policy = alert.policy
+        now = self.clock.monotonic()
+        alert.started = now
+        alert.escalated = alert.snoozed = False
+        alert.handles = [self.scheduler.call_at(now + policy.timeout, self._expire, alert)]
+        if policy.escalate_after is not None and policy.escalate_after < policy.timeout:
+            alert.handles.append(self.scheduler.call_at(now + policy.escalate_after, self._escalate, alert))
+        self._schedule_beat(now)
+
+    def _cancel(self, alert: Alert) -> None:
+        for handle in alert.handles:
+            self.scheduler.cancel(handle)
+        alert.handles = []
+
+    def _expire(self, alert: Alert) -> None:
+        """The alert played for its whole timeout; drop it."""
+        with self._condition:
+            if self.active_alerts.get(alert.name) is alert:
+                del self.active_alerts[alert.name]
+                self._cancel(alert)
+                self._cancel_beat()
+
+    def _escalate(self, alert: Alert) -> None:
+        with self._condition:
+            if self.active_alerts.get(alert.name) is alert and not alert.snoozed:
+                alert.escalated = True
+                self._schedule_beat(self.clock.monotonic() + alert.interval)
+
+    def _wake(self, alert: Alert) -> None:
+        """A snooze ended; the alert starts over."""
+        with self._condition:
+            if self.active_alerts.get(alert.name) is alert:
+                self._start(alert)
+
+    def start_alert(self, timer_name: str, policy: Optional[AlertPolicy] = None):
+        """Start (or restart) the alert for a timer, by default with self.policy"""
+        with self._condition:
+            previous = self.active_alerts.pop(timer_name, None)
+            if previous is not None:
+                self._cancel(previous)
+            alert = Alert(timer_name, policy if policy is not None else self.policy, 0.0)
+            self.active_alerts[timer_name] = alert
+            self._start(alert)
+
+    def snooze_alert(self, timer_name: str, seconds: Optional[float] = None) -> Optional[float]:
+        """Silence an alert for `seconds` (the policy's snooze by default),
+        then start it over. Returns the seconds, or None if the timer has
+        no alert."""
+        with self._condition:
+            alert = self.active_alerts.get(timer_name)
+            if alert is None:
+                return None
+            self._cancel(alert)
+            alert.snoozed = True
+            if seconds is None:
+                seconds = alert.policy.snooze
+            alert.handles = [self.scheduler.call_at(self.clock.monotonic() + seconds, self._wake, alert)]
+            self._cancel_beat()
+            return seconds
 
     def stop_alert(self, timer_name: str):
         """Stop an active alert"""
-        if timer_name in self.alert_stop_flags:
-            self.alert_stop_flags[timer_name] = True
-            if timer_name in self.active_alerts:
-                self.active_alerts[timer_name].join(0.1)
-                del self.active_alerts[timer_name]
-            del self.alert_stop_flags[timer_name]
+        with self._condition:
+            alert = self.active_alerts.pop(timer_name, None)
+            if alert is not None:
+                self._cancel(alert)
+                self._cancel_beat()
 
     def stop_all_alerts(self):
         """Stop all active alerts"""
-        for timer_name in list(self.active_alerts.keys()):
-            self.stop_alert(timer_name)
-    
-    def set_audio_settings(self, frequency=None, duration=None, interval=None):
+        with self._condition:
+            for alert in self.active_alerts.values():
+                self._cancel(alert)
+            self.active_alerts.clear()
+            self._cancel_beat()
+
+    def play_tone(self, frequency=None, duration=None):
+        """Play a single beep, e.g. to preview settings"""
+        with self._condition:
+            self._queue_tone((
+                int(frequency) if frequency is not None else self.beep_frequency,
+                int(duration) if duration is not None else self.beep_duration,
+                self.volume,
+            ))
+
+    def set_audio_settings(self, frequency=None, duration=None, interval=None, volume=None):
         """Update audio settings for notifications"""
         if frequency is not None:
             self.beep_frequency = max(37, min(32767, int(frequency)))  # Windows beep limits
@@ -83,11 +382,36 @@ class AlertManager:
             self.beep_duration = max(10, min(5000, int(duration)))  # Reasonable duration limits
         if interval is not None:
             self.beep_interval = max(0.1, min(10.0, float(interval)))  # Reasonable interval limits
-    
+        if volume is not None:
+            self.volume = max(1, min(100, int(volume)))
+        # Render the new tone now rather than on the next beep
+        render_tone(self.beep_frequency, self.beep_duration, self.volume)
+
+    def close(self) -> None:
+        """Stop every alert and the audio thread, and wait for it to exit.
+
+        Tones still queued are dropped. Playing a tone afterwards starts
+        a new audio thread.
+        """
+        self.stop_all_alerts()
+        if self._owns_scheduler:
+            self._scheduler.shutdown()
+        with self._condition:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._tones.clear()
+            self._tones.append(None)
+            self._beat_queued = False
+            self._condition.notify()
+        if thread is not threading.current_thread():
+            thread.join()
+
     def get_audio_settings(self):
         """Get current audio settings"""
         return {
             'frequency': self.beep_frequency,
             'duration': self.beep_duration,
-            'interval': self.beep_interval
-        }
\ No newline at end of file
+            'interval': self.beep_interval,
+            'volume': self.volume
+        }
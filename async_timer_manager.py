@@ -0,0 +1,127 @@
+import asyncio
+from typing import AsyncIterator, List, Optional
+from timer_manager import Timer, TimerCompleted, TimerManager, TimerStore
+
+class LoopScheduler:
+    """Scheduler interface backed by an asyncio event loop.
+
+    Deadlines are time.monotonic() values, which is also the clock used by
+    the standard asyncio loops, so they are handed to loop.call_at as is.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def call_at(self, when: float, callback, *args) -> asyncio.TimerHandle:
+        return self._loop.call_at(when, callback, *args)
+
+    def call_later(self, delay: float, callback, *args) -> asyncio.TimerHandle:
+        return self._loop.call_later(delay, callback, *args)
+
+    def cancel(self, handle: Optional[asyncio.TimerHandle]) -> None:
+        if handle is not None:
+            handle.cancel()
+
+    def shutdown(self) -> None:
+        """Nothing to stop, pending handles belong to the loop."""
+
+class AsyncTimer(Timer):
+    """Timer whose completion can be awaited and whose countdown can be iterated.
+
+    `await timer` returns True once the timer completes, or False if it is
+    stopped or deleted first.
+    """
+
+    def __init__(self, name: str, duration: int, loop: asyncio.AbstractEventLoop,
+                 store: Optional[TimerStore] = None):
+        super().__init__(name, duration, store)
+        self._loop = loop
+        self.completed: asyncio.Future = loop.create_future()
+        self._watchers: List[asyncio.Queue] = []
+
+    def __await__(self):
+        return asyncio.shield(self.completed).__await__()
+
+    def start_countdown(self) -> None:
+        # A restarted or refreshed timer gets a fresh completion future
+        if self.completed.done():
+            self.completed = self._loop.create_future()
+        super().start_countdown()
+
+    def report(self):
+        previous = self.last_output
+        super().report()
+        if self.last_output != previous:
+            for queue in self._watchers:
+                queue.put_nowait(self.last_output)
+
+    def finish(self, completed: bool) -> None:
+        """Resolve the completion future and end all update iterators."""
+        if not self.completed.done():
+            self.completed.set_result(completed)
+        for queue in self._watchers:
+            queue.put_nowait(None)
+
+    async def updates(self) -> AsyncIterator[str]:
+        """Yield the formatted remaining time each time it changes.
+
+        Iteration ends when the timer completes, is stopped or is deleted.
+        """
+        if not self.running or self.completed.done():
+            return
+        queue = asyncio.Queue()
+        self._watchers.append(queue)
+        try:
+            while True:
+                update = await queue.get()
+                if update is None:
+                    return
+                yield update
+        finally:
+            self._watchers.remove(queue)
+
+class AsyncTimerManager(TimerManager):
+    """TimerManager that runs every timer on an asyncio event loop.
+
+    Countdowns are loop.call_at handles, so no threads are started for them.
+    All methods must be called from the loop's thread. Without `loop`, the
+    manager has to be created from a coroutine running on the target loop.
+    Audible alerts are off unless `alerts` is True, because they still play
+    through AlertManager.
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None, alerts: bool = False):
+        super().__init__()
+        self.loop = loop if loop is not None else asyncio.get_running_loop()
+        self.scheduler = LoopScheduler(self.loop)
+        self.alert_manager.scheduler = self.scheduler
+        self.alerts = alerts
+
+    def _new_timer(self, name: str, duration: int) -> AsyncTimer:
+        return AsyncTimer(name, duration, self.loop, self.store)
+
+    def _complete(self, timer: AsyncTimer) -> None:
+        if self.alerts:
+            super()._complete(timer)
+        else:
+            self.events.publish(TimerCompleted(timer.name, timer.lateness))
+            timer.alerting = True
+        timer.finish(True)
+
+    def _start_alert(self, timer: AsyncTimer) -> None:
+        if self.alerts:
+            super()._start_alert(timer)
+
+    def _stop(self, timer: AsyncTimer, bulk: bool = False) -> None:
+        super()._stop(timer, bulk)
+        timer.finish(False)
+
+    def clear_all_timers(self) -> None:
+        timers = list(self.timers.values())
+        super().clear_all_timers()
+        for timer in timers:
+            timer.finish(False)
+
+    async def wait_all(self) -> None:
+        """Wait until every current timer has completed or been stopped."""
+        await asyncio.gather(*(timer.completed for timer in self.timers.values()))
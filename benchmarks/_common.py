@@ -0,0 +1,50 @@
+"""Helpers shared by the benchmark scripts."""
+import os
+import resource
+import sys
+import threading
+import time
+
+# Benchmarks run as plain scripts, so make the application modules importable
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def rss_mb() -> float:
+    """Current resident set size in MiB (falls back to peak RSS off Linux)."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 if sys.platform != 'darwin' else peak / (1024 * 1024)
+
+
+def cpu_seconds() -> float:
+    """User plus system CPU time consumed by this process."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def context_switches() -> int:
+    """Voluntary plus involuntary context switches of all threads so far.
+
+    Each time a sleeping thread wakes up counts at least one.
+    """
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_nvcsw + usage.ru_nivcsw
+
+
+def thread_count() -> int:
+    return threading.active_count()
+
+
+def measure_window(seconds: float) -> float:
+    """Sleep for `seconds` and return the CPU percentage used meanwhile."""
+    cpu_start = cpu_seconds()
+    wall_start = time.perf_counter()
+    time.sleep(seconds)
+    wall = time.perf_counter() - wall_start
+    return 100.0 * (cpu_seconds() - cpu_start) / wall
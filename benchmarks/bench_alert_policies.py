@@ -0,0 +1,127 @@
+"""Alert lifecycles of many finished timers on the shared scheduler.
+
+Real time: creates `timers` one-second timers on a TimerManager with a
+short AlertPolicy (escalation after 1s, timeout after `timeout` seconds),
+snoozes a tenth of the alerts once they sound, and samples the thread
+count and CPU while they beep, escalate and time out. Every alert is a
+set of deadlines on the manager's scheduler, so the thread count stays at
+the scheduler and audio threads however many timers finish, and alerts
+that time out are gone without anyone stopping them.
+
+Virtual time: the same lifecycle with escalation after a minute on a
+VirtualClock, checking that alerts escalate, expire and come back from a
+snooze at exactly their deadlines, and that nothing is left scheduled
+once they have all timed out.
+
+Usage: python benchmarks/bench_alert_policies.py [timers] [timeout]
+"""
+import sys
+import threading
+import time
+
+import _common
+from alert_manager import AlertPolicy, NullSink
+from clock import VirtualClock
+from timer_manager import TimerManager
+
+
+def run_real(timers: int, timeout: float) -> dict:
+    manager = TimerManager()
+    sink = NullSink()
+    alerts = manager.alert_manager
+    alerts.sink = sink
+    alerts.policy = AlertPolicy(timeout=timeout, interval=0.2, escalate_after=1.0, snooze=timeout)
+    manager.set_output_callback(lambda message: None, include_events=False)
+    threads_before = _common.thread_count()
+    names = [f"timer-{i}" for i in range(timers)]
+    for name in names:
+        manager.create_timer(name, 1)
+
+    # Snooze a tenth of them as soon as they sound
+    while len(alerts.active_alerts) < timers:
+        time.sleep(0.01)
+    snoozed = names[::10]
+    for name in snoozed:
+        manager.snooze_timer(name)
+
+    peak_threads = 0
+    samples = 0
+    cpu_start = _common.cpu_seconds()
+    wall_start = time.perf_counter()
+    escalated = 0
+    while time.perf_counter() - wall_start < timeout + 0.5:
+        peak_threads = max(peak_threads, _common.thread_count())
+        escalated = max(escalated, sum(alert.escalated for alert in list(alerts.active_alerts.values())))
+        samples += 1
+        time.sleep(0.05)
+    wall = time.perf_counter() - wall_start
+    cpu_percent = 100.0 * (_common.cpu_seconds() - cpu_start) / wall
+
+    remaining = sorted(alerts.active_alerts)
+    result = {
+        'timers': timers,
+        'threads_before': threads_before,
+        'peak_threads': peak_threads,
+        'alert_threads': peak_threads - threads_before,
+        'cpu_percent': round(cpu_percent, 1),
+        'beeps': sink.plays,
+        'max_escalated': escalated,
+        'left_after_timeout': len(remaining),
+        'only_snoozed_left': remaining == sorted(snoozed),
+    }
+    manager.clear_all_timers()
+    manager.shutdown()
+    return result
+
+
+def run_virtual(timers: int) -> dict:
+    clock = VirtualClock()
+    manager = TimerManager(clock=clock)
+    alerts = manager.alert_manager
+    alerts.sink = NullSink()
+    policy = alerts.policy = AlertPolicy(escalate_after=60.0)
+    manager.set_output_callback(lambda message: None, include_events=False)
+    names = [f"timer-{i}" for i in range(timers)]
+    for name in names:
+        manager.create_timer(name, 60)
+    snoozed = names[::10]
+    checks = {}
+
+    clock.advance(60)
+    checks['all sounding'] = len(alerts.active_alerts) == timers
+    for name in snoozed:
+        manager.snooze_timer(name)
+    clock.advance(policy.escalate_after - 0.5)
+    checks['none escalated early'] = not any(alert.escalated for alert in alerts.active_alerts.values())
+    clock.advance(1)
+    checks['escalated on time'] = all(alert.escalated != alert.snoozed for alert in alerts.active_alerts.values())
+    clock.advance(policy.timeout - policy.escalate_after - 1)
+    checks['none expired early'] = len(alerts.active_alerts) == timers
+    clock.advance(1)
+    checks['expired on time'] = sorted(alerts.active_alerts) == sorted(snoozed)
+    clock.advance(policy.snooze - policy.timeout)
+    checks['snoozed sound again'] = all(not alerts.active_alerts[name].snoozed for name in snoozed)
+    elapsed = clock.run()
+    checks['all expired'] = not alerts.active_alerts
+    checks['nothing left scheduled'] = clock.next_deadline() is None
+    checks['ran out on time'] = elapsed == policy.timeout - 0.5
+    manager.shutdown()
+    return checks
+
+
+def main(argv):
+    timers = int(argv[0]) if argv else 500
+    timeout = float(argv[1]) if len(argv) > 1 else 3.0
+    print(f"real time: {timers} timers finishing together, {timeout:g}s alert timeout")
+    for key, value in run_real(timers, timeout).items():
+        print(f"{key:>20}: {value}")
+    print(f"virtual time: {timers} timers, escalating after 60s")
+    for check, passed in run_virtual(timers).items():
+        print(f"{check:>24}: {'ok' if passed else 'FAILED'}")
+    threads = [thread.name for thread in threading.enumerate()]
+    print("threads at exit:", threads)
+    assert 'AudioEngine' not in threads, "audio threads outlived their managers"
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,52 @@
+"""Cost of many simultaneous alerts on the single audio engine thread.
+
+Starts alerts for many timers at once into a NullSink (or a WAV file when a
+path is given) and reports threads, CPU and beeps played.
+
+Usage: python benchmarks/bench_alerts.py [alerts] [seconds] [wav_path]
+"""
+import sys
+import time
+
+import _common
+from alert_manager import AlertManager, NullSink, WavFileSink
+
+
+def run(alerts: int, seconds: float, wav_path: str = None) -> dict:
+    sink = WavFileSink(wav_path) if wav_path else NullSink()
+    manager = AlertManager(sink)
+    manager.set_audio_settings(interval=0.2)
+
+    start = time.perf_counter()
+    for i in range(alerts):
+        manager.start_alert(f"timer-{i}")
+    start_seconds = time.perf_counter() - start
+
+    cpu_percent = _common.measure_window(seconds)
+    threads = _common.thread_count()
+
+    start = time.perf_counter()
+    manager.stop_all_alerts()
+    stop_seconds = time.perf_counter() - start
+    if wav_path:
+        sink.close()
+    return {
+        'alerts': alerts,
+        'threads': threads,
+        'cpu_percent': round(cpu_percent, 1),
+        'start_us_per_alert': round(1e6 * start_seconds / alerts, 2),
+        'stop_all_ms': round(1000 * stop_seconds, 2),
+        'beeps': getattr(sink, 'plays', None),
+    }
+
+
+def main(argv):
+    alerts = int(argv[0]) if argv else 100
+    seconds = float(argv[1]) if len(argv) > 1 else 3.0
+    wav_path = argv[2] if len(argv) > 2 else None
+    for key, value in run(alerts, seconds, wav_path).items():
+        print(f"{key:>18}: {value}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,43 @@
+"""Tens of thousands of awaitable timers on a single asyncio event loop.
+
+Usage: python benchmarks/bench_async.py [count]
+"""
+import asyncio
+import sys
+import time
+
+import _common
+from async_timer_manager import AsyncTimerManager
+
+
+async def run(count: int) -> dict:
+    manager = AsyncTimerManager()
+    manager.set_output_callback(lambda message: None, include_events=False)
+
+    rss_before = _common.rss_mb()
+    start = time.perf_counter()
+    for i in range(count):
+        manager.create_timer(f"timer-{i}", 1 + i % 3)
+    create_seconds = time.perf_counter() - start
+
+    results = await asyncio.gather(*(timer for timer in manager.timers.values()))
+    stats = manager.lateness_stats()
+    return {
+        'timers': count,
+        'completed': sum(results),
+        'threads': _common.thread_count(),
+        'rss_mb': round(_common.rss_mb() - rss_before, 1),
+        'create_per_sec': round(count / create_seconds),
+        'p99_lateness_ms': round(stats['p99'] * 1000, 2),
+        'wall_seconds': round(time.perf_counter() - start, 2),
+    }
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 50_000
+    for key, value in asyncio.run(run(count)).items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
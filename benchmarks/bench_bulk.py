@@ -0,0 +1,55 @@
+"""Bulk operations against per-timer commands.
+
+Creates `count` timers, half tagged "work", and times pausing, resuming,
+stopping and deleting the tagged half one command at a time and then with
+one bulk call. Also reports how many output messages each produced.
+
+Usage: python benchmarks/bench_bulk.py [count]
+"""
+import sys
+import time
+
+import _common
+from alert_manager import NullSink
+from timer_manager import TimerManager
+
+
+def make_manager(count: int):
+    manager = TimerManager()
+    manager.alert_manager.sink = NullSink()
+    messages = []
+    manager.set_output_callback(messages.append)
+    for i in range(count):
+        # 3599s shows "59m" for a minute, so no ticks are printed during the run
+        manager.create_timer(f"timer-{i}", 3599, ('work',) if i % 2 else ('home',))
+    messages.clear()
+    return manager, messages
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 10000
+    print(f"{count} timers, {count // 2} tagged 'work'")
+    print(f"{'action':>8} {'one by one ms':>14} {'messages':>9} {'bulk ms':>9} {'messages':>9}")
+    single, single_messages = make_manager(count)
+    bulk, bulk_messages = make_manager(count)
+    for action in ('pause', 'resume', 'stop', 'delete'):
+        method = getattr(single, f"{action}_timer")
+        start = time.perf_counter()
+        for name in single.select(tag='work'):
+            method(name)
+        one_by_one = time.perf_counter() - start
+
+        start = time.perf_counter()
+        getattr(bulk, f"{action}_timers")(tag='work')
+        at_once = time.perf_counter() - start
+
+        print(f"{action:>8} {one_by_one * 1000:>14.1f} {len(single_messages):>9} "
+              f"{at_once * 1000:>9.1f} {len(bulk_messages):>9}")
+        single_messages.clear()
+        bulk_messages.clear()
+    single.scheduler.shutdown()
+    bulk.scheduler.shutdown()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,77 @@
+"""Load test for timer_daemon: requests per second and latency percentiles.
+
+Starts the daemon in a subprocess, then opens many concurrent client
+connections. Each client keeps `depth` requests in flight on its connection
+and cycles through create/get/pause/resume/delete on its own timers.
+
+Usage: python benchmarks/bench_daemon.py [clients] [requests_per_client] [depth]
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import _common
+from timer_client import AsyncTimerClient
+
+OPS = ['create', 'get', 'pause', 'resume', 'delete']
+
+
+async def client_load(index: int, path: str, requests: int, depth: int, latencies: list):
+    client = AsyncTimerClient(path)
+    await client.connect()
+
+    async def worker(lane: int):
+        for i in range(requests // depth):
+            name = f"c{index}-{lane}-{i // len(OPS)}"
+            op = OPS[i % len(OPS)]
+            params = {'name': name, 'duration': 3600} if op == 'create' else {'name': name}
+            start = time.perf_counter()
+            await client.request(op, **params)
+            latencies.append(time.perf_counter() - start)
+
+    # Each lane runs the op cycle in order, so its timers always exist
+    await asyncio.gather(*(worker(lane) for lane in range(depth)))
+    await client.close()
+
+
+async def run(path: str, clients: int, requests: int, depth: int) -> dict:
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client_load(i, path, requests, depth, latencies) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'clients': clients,
+        'requests': len(latencies),
+        'requests_per_sec': round(len(latencies) / elapsed),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 3),
+        'p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3),
+    }
+
+
+def main(argv):
+    clients = int(argv[0]) if argv else 500
+    requests = int(argv[1]) if len(argv) > 1 else 100
+    depth = int(argv[2]) if len(argv) > 2 else 5
+    # Keep whole op cycles per lane
+    requests -= requests % (len(OPS) * depth)
+
+    path = os.path.join(tempfile.mkdtemp(), 'timerd.sock')
+    daemon = subprocess.Popen([sys.executable, os.path.join(_common.REPO_ROOT, 'timer_daemon.py'),
+                               '--socket', path], stderr=subprocess.DEVNULL)
+    try:
+        while not os.path.exists(path):
+            time.sleep(0.05)
+        for key, value in asyncio.run(run(path, clients, requests, depth)).items():
+            print(f"{key:>17}: {value}")
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,55 @@
+"""Stress test for timer firing lateness with many concurrent timers.
+
+Creates timers with staggered 1-10 second durations, waits for all of them
+to fire and checks how late they fired compared to their deadlines.
+
+Usage: python benchmarks/bench_drift.py [count] [max_p99_ms]
+"""
+import sys
+import time
+
+import _common
+from alert_manager import NullSink
+from timer_manager import TimerManager
+
+
+def run(count: int) -> dict:
+    manager = TimerManager()
+    manager.set_output_callback(lambda message: None, include_events=False)
+    manager.alert_manager.sink = NullSink()
+
+    for i in range(count):
+        manager.create_timer(f"timer-{i}", 1 + i % 10)
+
+    timers = list(manager.timers.values())
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        fired = [t.lateness for t in timers if t.lateness is not None]
+        if len(fired) == count:
+            break
+        time.sleep(0.1)
+    manager.scheduler.shutdown()
+
+    fired.sort()
+    return {
+        'count': len(fired),
+        'mean': sum(fired) / max(len(fired), 1),
+        'p50': fired[len(fired) // 2] if fired else 0.0,
+        'p99': fired[min(len(fired) - 1, int(len(fired) * 0.99))] if fired else 0.0,
+        'max': fired[-1] if fired else 0.0,
+    }
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 5000
+    max_p99_ms = float(argv[1]) if len(argv) > 1 else 250.0
+    stats = run(count)
+    print(f"timers fired: {stats['count']}/{count}")
+    print(f"lateness ms: mean={stats['mean'] * 1000:.2f} p50={stats['p50'] * 1000:.2f} "
+          f"p99={stats['p99'] * 1000:.2f} max={stats['max'] * 1000:.2f}")
+    assert stats['count'] == count, "not every timer fired"
+    assert stats['p99'] * 1000 <= max_p99_ms, f"p99 lateness above {max_p99_ms}ms"
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,70 @@
+"""Create/cancel churn across scheduler engines.
+
+Each cycle schedules a call a few seconds out and cancels the one scheduled
+`window` cycles earlier, so about `window` calls stay pending. The heap and
+timing wheel run the full cycle count; the old thread-per-timer approach is
+sampled on fewer cycles and its rate extrapolated.
+
+Usage: python benchmarks/bench_engines.py [cycles] [window]
+"""
+import sys
+import threading
+import time
+from collections import deque
+
+import _common
+from timer_manager import HeapQueue, Scheduler, TimingWheel
+
+
+def churn_scheduler(scheduler: Scheduler, cycles: int, window: int) -> float:
+    pending = deque()
+    noop = lambda: None
+    start = time.perf_counter()
+    for i in range(cycles):
+        pending.append(scheduler.call_later(5 + (i % 1000) * 0.001, noop))
+        if len(pending) > window:
+            scheduler.cancel(pending.popleft())
+    elapsed = time.perf_counter() - start
+    scheduler.shutdown()
+    return elapsed
+
+
+def churn_threads(cycles: int, window: int) -> float:
+    """The pre-scheduler model: one sleeping thread per timer."""
+    pending = deque()
+
+    def countdown(stop: threading.Event):
+        stop.wait(5)
+
+    start = time.perf_counter()
+    for i in range(cycles):
+        stop = threading.Event()
+        thread = threading.Thread(target=countdown, args=(stop,), daemon=True)
+        thread.start()
+        pending.append(stop)
+        if len(pending) > window:
+            pending.popleft().set()
+    elapsed = time.perf_counter() - start
+    for stop in pending:
+        stop.set()
+    return elapsed
+
+
+def main(argv):
+    cycles = int(argv[0]) if argv else 1_000_000
+    window = int(argv[1]) if len(argv) > 1 else 10_000
+    thread_cycles = min(cycles, 20_000)
+
+    results = [
+        ('heap', cycles, churn_scheduler(Scheduler(HeapQueue()), cycles, window)),
+        ('wheel', cycles, churn_scheduler(Scheduler(TimingWheel(0.01)), cycles, window)),
+        ('thread-per-timer', thread_cycles, churn_threads(thread_cycles, min(window, 1000))),
+    ]
+    print(f"{'engine':>18} {'cycles':>9} {'seconds':>9} {'cycles/s':>10} {'est. 1M s':>10}")
+    for name, n, elapsed in results:
+        rate = n / elapsed
+        print(f"{name:>18} {n:>9} {elapsed:>9.2f} {rate:>10.0f} {1_000_000 / rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,61 @@
+"""Idle cost of paused timers: CPU and wakeups per second.
+
+Creates `count` timers with a journal attached, as the app runs, pauses
+them all and then measures the process over a quiet window. Paused timers
+have nothing scheduled and the journal flusher only wakes when there is
+something to write, so both numbers should stay near zero at any count.
+Wakeups are context switches across all threads (getrusage); the main
+thread's own sleep accounts for one or two.
+
+Usage: python benchmarks/bench_idle.py [window_seconds] [count ...]
+"""
+import shutil
+import sys
+import tempfile
+import time
+
+import _common
+from timer_journal import Journal
+from timer_manager import TimerManager
+
+
+def measure(count: int, window: float) -> dict:
+    directory = tempfile.mkdtemp(prefix='bench-idle-')
+    manager = TimerManager()
+    manager.set_output_callback(lambda message: None, include_events=False)
+    journal = Journal(directory)
+    journal.attach(manager)
+    for i in range(count):
+        manager.create_timer(f"timer-{i}", 3600)
+    manager.pause_timers()
+    # Let the flusher write the burst and the scheduler drop the cancelled ticks
+    time.sleep(max(1.5, 2 * journal.flush_interval))
+
+    switches = _common.context_switches()
+    cpu_percent = _common.measure_window(window)
+    wakeups = (_common.context_switches() - switches) / window
+    result = {
+        'timers': count,
+        'paused': manager.timer_counts()['paused'],
+        'threads': _common.thread_count(),
+        'cpu_percent': round(cpu_percent, 2),
+        'wakeups_per_sec': round(wakeups, 1),
+    }
+    journal.close()
+    manager.scheduler.shutdown()
+    shutil.rmtree(directory, ignore_errors=True)
+    return result
+
+
+def main(argv):
+    window = float(argv[0]) if argv else 5.0
+    counts = [int(arg) for arg in argv[1:]] or [10, 1000, 10000]
+    print(f"{'timers':>8} {'paused':>8} {'threads':>8} {'cpu %':>7} {'wakeups/s':>10}")
+    for count in counts:
+        result = measure(count, window)
+        print(f"{result['timers']:>8} {result['paused']:>8} {result['threads']:>8} "
+              f"{result['cpu_percent']:>7} {result['wakeups_per_sec']:>10}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,165 @@
+"""Intent accuracy and latency of the word-level matcher against substring scans.
+
+Runs a labelled corpus of commands through CommandInterpreter and through
+SubstringInterpreter, a copy of the matching it replaced, which looked for
+each indicator as a substring ("go" inside "ago", "show" inside "shower")
+and split the text again for every indicator set. Reports how many
+commands each gets exactly right, how many get the right command type, and
+the uncached per-call latency of both.
+
+Usage: python benchmarks/bench_intent.py [--show-misses N]
+"""
+import itertools
+import re
+import sys
+from typing import Dict, Optional
+
+import _common
+from bench_interpreter import time_calls
+from command_interpreter import CommandInterpreter
+
+# Names chosen to contain indicators inside longer words
+NAMES = ['coffee', 'tea break', 'laundry', 'shower', 'review', 'weekend', 'household chores',
+         'cargo', 'skillet', 'bread', 'statistics', 'friend call', 'spending', 'whatnot']
+DURATIONS = {'5 minutes': 300, '25 mins': 1500, '1h30m': 5400, 'ten seconds': 10, '2 hours': 7200}
+CREATE = ['set a {d} timer for {n}', 'start a {d} {n} timer', '{n} {d}',
+          'add {d} timer named {n}', 'new {n} timer {d}', 'make a timer for {d} called {n}']
+CONTROL = [
+    ('pause the {n} timer', 'pause'), ('hold {n}', 'pause'), ('freeze the {n} timer', 'pause'),
+    ('resume {n}', 'resume'), ('continue the {n} timer', 'resume'), ('unpause {n}', 'resume'),
+    ('stop {n} timer', 'stop'), ('cancel {n}', 'stop'), ('kill the {n} timer', 'stop'),
+    ('delete the {n} timer', 'delete'), ('remove {n}', 'delete'), ('get rid of the {n} timer', 'delete'),
+]
+FIXED = [
+    ('show all timers', {'type': 'list'}),
+    ('list', {'type': 'list'}),
+    ('timers', {'type': 'list'}),
+    ('timer status', {'type': 'list'}),
+    ("what's running", {'type': 'list'}),
+    ('how long is left on the coffee timer', {'type': 'list'}),
+    ('clear all timers', {'type': 'clear'}),
+    ('delete everything', {'type': 'clear'}),
+    ('remove the timers', {'type': 'clear'}),
+    ('turn off the oven timer', {'type': 'stop', 'name': 'oven'}),
+    ('carry on with laundry', {'type': 'resume', 'name': 'with laundry'}),
+    ('set a 10 minute timer for the show', {'type': 'create', 'name': 'show', 'duration': 600}),
+    ('cancel the every 30 minutes reminder', {'type': 'stop', 'name': 'every 30 minutes reminder'}),
+    ('show timers every minute', {'type': 'list'}),
+    ('every 30 minutes remind me to stretch', {'type': 'recurring', 'every': 1800, 'name': 'stretch'}),
+    ('whatever', None),
+    ('a while ago', None),
+    ('hello there', None),
+]
+
+
+def build_corpus():
+    """[(command, expected result)]"""
+    corpus = []
+    for template, (duration, seconds), name in itertools.product(CREATE, DURATIONS.items(), NAMES):
+        corpus.append((template.format(d=duration, n=name),
+                       {'type': 'create', 'name': name, 'duration': seconds}))
+    for (template, intent), name in itertools.product(CONTROL, NAMES):
+        corpus.append((template.format(n=name), {'type': intent, 'name': name}))
+    return corpus + FIXED
+
+
+class SubstringInterpreter(CommandInterpreter):
+    """The intent matching before the word-level trie, kept verbatim for comparison."""
+
+    def _interpret(self, text: str) -> Optional[Dict]:
+
+        # Check for commands on groups of timers
+        command = self._bulk_command(text) or self._recurring_command(text)
+        if command:
+            return command
+
+        # Check for list command
+        if any(indicator in text for indicator in self.list_indicators):
+            return {"type": "list"}
+
+        # Check for clear all timers command
+        if any(word in text for word in ['clear', 'delete', 'remove']) and any(word in text for word in ['all', 'everything', 'timers']):
+            return {"type": "clear"}
+
+        # Check for delete commands first (more specific)
+        if any(indicator in text for indicator in self.delete_indicators):
+            for indicator in self.delete_indicators:
+                if indicator in text:
+                    parts = text.split(indicator, 1)
+                    if len(parts) > 1:
+                        name = parts[1].strip()
+                        name = re.sub(r'^(the|a|an)\s+', '', name)
+                        name = name.replace('timer', '').strip()
+                        if name:
+                            return self._target("delete", name)
+                    return {"type": "delete", "name": "timer"}
+
+        # Check for pause/resume/stop commands
+        for command_type, indicators in [
+            ("pause", self.pause_indicators),
+            ("resume", self.resume_indicators),
+            ("stop", self.stop_indicators)
+        ]:
+            if any(indicator in text for indicator in indicators):
+                # Extract timer name (everything after the command word)
+                for indicator in indicators:
+                    if indicator in text:
+                        parts = text.split(indicator, 1)
+                        if len(parts) > 1:
+                            name = parts[1].strip()
+                            name = re.sub(r'^(the|a|an)\s+', '', name)
+                            name = name.replace('timer', '').strip()
+                            if name:
+                                return self._target(command_type, name)
+                        return {"type": command_type, "name": "timer"}
+
+        # Handle create/start command
+        duration, spans = self._scan_duration(text)
+        if duration:
+            pieces = []
+            position = 0
+            for begin, end in spans:
+                pieces.append(text[position:begin])
+                position = end
+            pieces.append(text[position:])
+            name = self._extract_timer_name(' '.join(pieces))
+            return {"type": "create", "name": name, "duration": duration}
+
+        return None
+
+
+def score(interpreter, corpus):
+    exact = intent = 0
+    misses = []
+    for text, expected in corpus:
+        result = interpreter._interpret(' '.join(text.lower().split()))
+        exact += result == expected
+        intent += (result or {}).get('type') == (expected or {}).get('type')
+        if result != expected:
+            misses.append((text, expected, result))
+    return exact, intent, misses
+
+
+def main(argv):
+    show_misses = int(argv[argv.index('--show-misses') + 1]) if '--show-misses' in argv else 10
+    corpus = build_corpus()
+    texts = [' '.join(text.lower().split()) for text, _ in corpus]
+    print(f"corpus: {len(corpus)} labelled commands")
+    print(f"{'matcher':>10} {'exact':>7} {'intent':>7} {'mean us':>9} {'p99 us':>9}")
+    results = {}
+    for label, interpreter in (('substring', SubstringInterpreter()), ('words', CommandInterpreter())):
+        exact, intent, misses = score(interpreter, corpus)
+        stats = time_calls(interpreter._interpret, texts)
+        results[label] = misses
+        print(f"{label:>10} {exact / len(corpus):>7.1%} {intent / len(corpus):>7.1%} "
+              f"{stats['mean_us']:>9.1f} {stats['p99_us']:>9.1f}")
+
+    for label, misses in results.items():
+        if misses and show_misses:
+            print(f"{label} misses ({len(misses)}):")
+            for text, expected, result in misses[:show_misses]:
+                print(f"  {text!r}\n    expected: {expected}\n    got:      {result}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,277 @@
+"""Latency of CommandInterpreter.interpret and agreement with the old parser.
+
+Builds a corpus of a few thousand phrasings and times the current
+interpreter (uncached and cached) against LegacyInterpreter, a copy of the
+regex-per-unit implementation it replaced. The legacy parser needs the
+word2number package; without it only the current timings are reported.
+
+Usage: python benchmarks/bench_interpreter.py [--show-diffs N]
+"""
+import itertools
+import re
+import sys
+import time
+from typing import Dict, Optional
+
+import _common
+from command_interpreter import CommandInterpreter
+
+DURATIONS = [
+    '5 minutes', '5 min', '5m', '25 mins', '30 seconds', '45 secs', '10s', '1 hour',
+    '2 hours', '1h', '90 minutes', '1h30m', '1 hour and 30 minutes', '3 hrs',
+    'five minutes', 'twenty minutes', 'ten seconds', 'two hours', 'twenty-five minutes', '15',
+]
+NAMES = ['coffee', 'pomodoro', 'tea break', 'meeting', 'laundry', 'eggs', 'workout', 'nap']
+TEMPLATES = [
+    'set a {d} timer for {n}', 'start a {d} {n} timer', 'create {d} {n} timer',
+    '{n} {d}', 'set timer for {d} called {n}', 'timer {d} {n}', 'remind me in {d} about {n}',
+    'new {n} timer {d}', 'add {d} timer named {n}', 'make a {n} timer for {d}',
+]
+CONTROL = [
+    'pause the {n} timer', 'resume {n}', 'stop {n} timer', 'delete the {n} timer',
+    'continue {n}', 'cancel {n}', 'remove {n}', 'show all timers', 'list', 'clear all timers',
+]
+
+
+def build_corpus():
+    corpus = [t.format(d=d, n=n) for t, d, n in itertools.product(TEMPLATES, DURATIONS, NAMES)]
+    corpus += [t.format(n=n) for t, n in itertools.product(CONTROL, NAMES)]
+    return corpus
+
+
+class LegacyInterpreter:
+    """The interpreter before the single-pass lexer, kept verbatim for comparison."""
+
+    def __init__(self):
+        # Common time-related words and their multipliers (in seconds)
+        self.time_multipliers = {
+            'second': 1, 'seconds': 1, 'sec': 1, 'secs': 1, 's': 1,
+            'minute': 60, 'minutes': 60, 'min': 60, 'mins': 60, 'm': 60,
+            'hour': 3600, 'hours': 3600, 'hr': 3600, 'hrs': 3600, 'h': 3600
+        }
+
+        # Command type indicators with more variations
+        self.create_indicators = {'set', 'create', 'make', 'start', 'begin', 'add', 'new', 'timer'}
+        self.pause_indicators = {'pause', 'hold', 'wait', 'suspend', 'freeze', 'stop'}
+        self.resume_indicators = {'resume', 'continue', 'unpause', 'restart', 'unfreeze', 'go'}
+        self.stop_indicators = {'stop', 'end', 'cancel', 'kill', 'terminate', 'abort'}
+        self.delete_indicators = {'delete', 'remove', 'clear', 'destroy'}
+        self.list_indicators = {'list', 'show', 'display', 'view', 'what', 'status', 'timers'}
+
+    def _extract_duration(self, text: str) -> Optional[int]:
+        """Extract duration from text in various formats."""
+        text = text.lower().strip()
+        total_seconds = 0
+        found_time = False
+
+        # Handle combined formats first (e.g., "1 hour and 30 minutes", "1h30m")
+        time_parts = re.findall(r'(\d+)\s*([hms]|hour|minute|second|hr|min|sec)s?\b', text)
+        if time_parts:
+            for value, unit in time_parts:
+                unit = unit.lower()
+                try:
+                    number = int(value)
+                    if unit in ['h', 'hour', 'hr']:
+                        total_seconds += number * 3600
+                    elif unit in ['m', 'minute', 'min']:
+                        total_seconds += number * 60
+                    elif unit in ['s', 'second', 'sec']:
+                        total_seconds += number
+                    found_time = True
+                except ValueError:
+                    continue
+
+        # Try numeric followed by time unit format (e.g., "5 minutes", "5min")
+        if not found_time:
+            for unit, multiplier in self.time_multipliers.items():
+                pattern = rf'(\d+)\s*{unit}'
+                matches = re.finditer(pattern, text)
+                for match in matches:
+                    try:
+                        total_seconds += int(match.group(1)) * multiplier
+                        found_time = True
+                    except ValueError:
+                        continue
+
+        # Try word numbers (e.g., "five minutes")
+        if not found_time:
+            for unit, multiplier in self.time_multipliers.items():
+                pattern = rf'([a-zA-Z-]+)\s*{unit}'
+                matches = re.finditer(pattern, text)
+                for match in matches:
+                    try:
+                        from word2number import w2n
+                        number = w2n.word_to_num(match.group(1))
+                        total_seconds += number * multiplier
+                        found_time = True
+                    except (ValueError, ImportError):
+                        continue
+
+        # Try standalone numbers (assume minutes if no unit specified)
+        if not found_time and re.search(r'\b\d+\b', text):
+            match = re.search(r'\b(\d+)\b', text)
+            if match:
+                try:
+                    total_seconds = int(match.group(1)) * 60  # Assume minutes
+                    found_time = True
+                except ValueError:
+                    pass
+
+        return int(total_seconds) if found_time else None
+
+    def _extract_timer_name(self, text: str, duration_text: str) -> str:
+        """Extract timer name from the command."""
+        # Remove duration part from text
+        text = text.replace(duration_text, '').strip()
+
+        # Look for words after "for" or "called" or "named"
+        for prefix in ['for', 'called', 'named', 'label']:
+            if f" {prefix} " in text:
+                name = text.split(f" {prefix} ")[-1].strip()
+                # Remove articles and timer word
+                name = re.sub(r'^(the|a|an)\s+', '', name)
+                name = name.replace('timer', '').strip()
+                if name:
+                    return name
+
+        # Look for words that could be a name (excluding command words and time units)
+        words = text.lower().split()
+        exclude_words = (set(self.time_multipliers.keys()) | 
+                        self.create_indicators | 
+                        self.pause_indicators | 
+                        self.resume_indicators | 
+                        self.stop_indicators |
+                        self.list_indicators |
+                        {'a', 'an', 'the', 'timer', 'for', 'called', 'named', 'set'})
+
+        potential_names = [w for w in words if w not in exclude_words]
+        if potential_names:
+            return " ".join(potential_names)
+
+        # Default to "timer" if no name found
+        return "timer"
+
+    def interpret(self, text: str) -> Optional[Dict]:
+        """Interpret the natural language command and return a structured command."""
+        text = text.lower().strip()
+
+        # Check for list command
+        if any(indicator in text for indicator in self.list_indicators):
+            return {"type": "list"}
+        
+        # Check for clear all timers command
+        if any(word in text for word in ['clear', 'delete', 'remove']) and any(word in text for word in ['all', 'everything', 'timers']):
+            return {"type": "clear"}
+
+        # Check for delete commands first (more specific)
+        if any(indicator in text for indicator in self.delete_indicators):
+            for indicator in self.delete_indicators:
+                if indicator in text:
+                    parts = text.split(indicator, 1)
+                    if len(parts) > 1:
+                        name = parts[1].strip()
+                        name = re.sub(r'^(the|a|an)\s+', '', name)
+                        name = name.replace('timer', '').strip()
+                        if name:
+                            return {"type": "delete", "name": name}
+                    return {"type": "delete", "name": "timer"}
+
+        # Check for pause/resume/stop commands
+        for command_type, indicators in [
+            ("pause", self.pause_indicators),
+            ("resume", self.resume_indicators),
+            ("stop", self.stop_indicators)
+        ]:
+            if any(indicator in text for indicator in indicators):
+                # Extract timer name (everything after the command word)
+                for indicator in indicators:
+                    if indicator in text:
+                        parts = text.split(indicator, 1)
+                        if len(parts) > 1:
+                            name = parts[1].strip()
+                            name = re.sub(r'^(the|a|an)\s+', '', name)
+                            name = name.replace('timer', '').strip()
+                            if name:
+                                return {"type": command_type, "name": name}
+                        return {"type": command_type, "name": "timer"}
+
+        # Handle create/start command
+        duration = self._extract_duration(text)
+        if duration:
+            # Find the text that contains the duration
+            duration_text = text  # Default to full text if we can't isolate duration part
+
+            # Try to find the exact duration text that matched
+            for unit in self.time_multipliers.keys():
+                if unit in text:
+                    # Find the number (word or digit) before the unit
+                    match = re.search(rf'(\d+|\w+)\s*{unit}', text)
+                    if match:
+                        duration_text = match.group(0)
+                        break
+
+            name = self._extract_timer_name(text, duration_text)
+            return {"type": "create", "name": name, "duration": duration}
+
+        return None
+
+
+def time_calls(fn, corpus, repeat=3):
+    """Best-of-`repeat` per-call latencies in microseconds."""
+    best = None
+    for _ in range(repeat):
+        samples = []
+        for text in corpus:
+            start = time.perf_counter()
+            fn(text)
+            samples.append((time.perf_counter() - start) * 1e6)
+        if best is None or sum(samples) < sum(best):
+            best = samples
+    best.sort()
+    return {
+        'mean_us': sum(best) / len(best),
+        'p50_us': best[len(best) // 2],
+        'p99_us': best[int(len(best) * 0.99)],
+    }
+
+
+def main(argv):
+    show_diffs = int(argv[argv.index('--show-diffs') + 1]) if '--show-diffs' in argv else 10
+    corpus = build_corpus()
+    print(f"corpus: {len(corpus)} phrasings")
+
+    fresh = CommandInterpreter()
+    rows = [('uncached', time_calls(lambda t: fresh._interpret(' '.join(t.lower().split())), corpus))]
+    current = CommandInterpreter()
+    for text in corpus:
+        current.interpret(text)
+    rows.append(('cached', time_calls(current.interpret, corpus)))
+
+    try:
+        import word2number  # noqa: F401
+        legacy = LegacyInterpreter()
+        rows.insert(0, ('legacy', time_calls(legacy.interpret, corpus)))
+    except ImportError:
+        legacy = None
+        print("word2number not installed, skipping the legacy comparison")
+
+    print(f"{'parser':>10} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}")
+    for label, stats in rows:
+        print(f"{label:>10} {stats['mean_us']:>9.1f} {stats['p50_us']:>9.1f} {stats['p99_us']:>9.1f}")
+
+    if legacy is not None:
+        same_duration = same_result = 0
+        diffs = []
+        for text in corpus:
+            old, new = legacy.interpret(text), current.interpret(text)
+            same_result += old == new
+            same_duration += (old or {}).get('duration') == (new or {}).get('duration')
+            if old != new:
+                diffs.append((text, old, new))
+        print(f"same duration: {same_duration}/{len(corpus)}, identical result: {same_result}/{len(corpus)}")
+        for text, old, new in diffs[:show_diffs]:
+            print(f"  {text!r}\n    legacy: {old}\n    now:    {new}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,95 @@
+"""Benchmark for the timer journal: write overhead and recovery time.
+
+Measures the per-command cost of create/pause/resume/delete cycles with and
+without a Journal attached, then writes `entries` records straight to a
+journal and times recovery from it.
+
+Usage: python benchmarks/bench_journal.py [entries] [max_recovery_seconds]
+"""
+import shutil
+import sys
+import tempfile
+import time
+
+import _common
+from timer_manager import TimerManager, TimerCreated, TimerPaused, TimerResumed
+from timer_journal import Journal, recover
+
+
+def command_cost(journal_dir, cycles: int) -> float:
+    """Mean microseconds per command."""
+    manager = TimerManager()
+    manager.set_output_callback(lambda message: None, include_events=False)
+    journal = None
+    if journal_dir:
+        journal = Journal(journal_dir)
+        journal.attach(manager)
+
+    start = time.perf_counter()
+    for i in range(cycles):
+        name = f"timer-{i % 1000}"
+        manager.create_timer(name, 600)
+        manager.pause_timer(name)
+        manager.resume_timer(name)
+        manager.delete_timer(name)
+    seconds = time.perf_counter() - start
+
+    if journal is not None:
+        journal.close()
+    manager.scheduler.shutdown()
+    return seconds / (cycles * 4) * 1e6
+
+
+def recovery_time(journal_dir, entries: int, timers: int = 10000) -> dict:
+    manager = TimerManager()
+    journal = Journal(journal_dir, snapshot_every=entries + 1)
+    journal.attach(manager)
+    start = time.perf_counter()
+    for i in range(entries):
+        name = f"timer-{i % timers}"
+        phase = (i // timers) % 3
+        if phase == 0:
+            journal.record(TimerCreated(name, 600))
+        elif phase == 1:
+            journal.record(TimerPaused(name, 300.0))
+        else:
+            journal.record(TimerResumed(name, 300.0))
+    record_seconds = time.perf_counter() - start
+    journal.close()
+    manager.scheduler.shutdown()
+
+    start = time.perf_counter()
+    restored = recover(journal_dir)
+    return {
+        'record_us': record_seconds / entries * 1e6,
+        'recover_seconds': time.perf_counter() - start,
+        'restored': len(restored),
+    }
+
+
+def main(argv):
+    entries = int(argv[0]) if len(argv) > 0 else 1_000_000
+    max_recovery = float(argv[1]) if len(argv) > 1 else 1.0
+
+    directory = tempfile.mkdtemp(prefix='timer-journal-')
+    try:
+        baseline = command_cost(None, 20000)
+        journaled = command_cost(directory + '/commands', 20000)
+        recovery = recovery_time(directory + '/recovery', entries)
+    finally:
+        shutil.rmtree(directory)
+
+    print(f"{'command_us':>16}: {baseline:.2f}")
+    print(f"{'journaled_us':>16}: {journaled:.2f} (+{journaled - baseline:.2f})")
+    print(f"{'record_us':>16}: {recovery['record_us']:.2f}")
+    print(f"{'entries':>16}: {entries}")
+    print(f"{'restored':>16}: {recovery['restored']}")
+    print(f"{'recover_seconds':>16}: {recovery['recover_seconds']:.3f}")
+    if recovery['recover_seconds'] > max_recovery:
+        print(f"FAIL: recovery took longer than {max_recovery}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,73 @@
+"""Insert cost and memory of the bounded output log over a long session.
+
+Appends `frames` frames of log lines through OutputLog, as drain_ui_queue
+does, and reports frame time and RSS at intervals; both should stay flat.
+Uses a real tk.Text when a display is available, otherwise a stand-in
+that keeps the text as a list of lines. Pass a path to also spill the
+full history to a rotating file.
+
+Usage: python benchmarks/bench_output_log.py [frames] [lines_per_frame] [spill_path]
+"""
+import sys
+import time
+
+import _common
+from timer_app import OutputLog, RotatingSpill
+
+
+class ListText:
+    """Minimal tk.Text stand-in holding its lines in a list."""
+
+    def __init__(self):
+        self.lines = []
+
+    def insert(self, index, text):
+        self.lines.extend(text.splitlines())
+
+    def see(self, index):
+        pass
+
+    def delete(self, first, last):
+        if last == 'end':
+            self.lines.clear()
+        else:
+            del self.lines[:int(last.split('.')[0]) - 1]
+
+
+def make_widget():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return ListText(), None
+    text = tk.Text(root)
+    text.pack()
+    return text, root
+
+
+def main(argv):
+    frames = int(argv[0]) if argv else 100_000
+    per_frame = int(argv[1]) if len(argv) > 1 else 5
+    spill = RotatingSpill(argv[2]) if len(argv) > 2 else None
+    widget, root = make_widget()
+    log = OutputLog(widget, spill=spill)
+
+    print(f"{'frames':>9} {'lines':>10} {'frame us':>9} {'rss MiB':>8}  ({'real' if root else 'stub'} Text)")
+    report_every = max(1, frames // 10)
+    start = time.perf_counter()
+    for frame in range(1, frames + 1):
+        log.append([f"[timer-{frame % 1000}]: {frame % 60}s" for _ in range(per_frame)])
+        if root is not None and frame % 20 == 0:
+            root.update()
+        if frame % report_every == 0:
+            elapsed = time.perf_counter() - start
+            print(f"{frame:>9} {frame * per_frame:>10} {elapsed / report_every * 1e6:>9.1f} "
+                  f"{_common.rss_mb():>8.1f}")
+            start = time.perf_counter()
+    log.close()
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,99 @@
+"""Recurring schedules over a simulated day.
+
+Drives `count` schedules (mostly Every, a fifth Cron) through a scheduler
+queue with a simulated clock that advances one second at a time for 24
+hours. Each fire asks the schedule for its next occurrence and re-queues
+the same entry, as TimerManager does, so this measures the bookkeeping
+cost per fire without waiting a day. Then repeats the day with a three
+hour gap (a suspended laptop) to show catch-up staying bounded.
+
+Also reports the memory of `count` recurring timers in a real TimerManager.
+
+Usage: python benchmarks/bench_recurring.py [count] [queue: heap|wheel]
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+import _common
+from schedules import Cron, Every
+from timer_manager import HeapQueue, ScheduledCall, TimerManager, TimingWheel
+
+DAY = 24 * 3600
+CRON_EXPRESSIONS = ['*/15 * * * *', '0 * * * *', '30 9 * * 1-5', '*/5 9-17 * * *', '0 */2 * * *']
+
+
+def make_schedules(count: int, catch_up: int = 1) -> list:
+    rng = random.Random(42)
+    schedules = []
+    for i in range(count):
+        if i % 5 == 0:
+            schedules.append(Cron(rng.choice(CRON_EXPRESSIONS), catch_up=catch_up))
+        else:
+            schedules.append(Every(rng.randint(1, 120) * 60, catch_up=catch_up))
+    return schedules
+
+
+def simulate(count: int, queue_name: str, gap: tuple = None, catch_up: int = 1) -> dict:
+    """Run a day; `gap` is (start, length) in seconds during which nothing runs."""
+    schedules = make_schedules(count, catch_up)
+    queue = HeapQueue() if queue_name == 'heap' else TimingWheel(1.0)
+    start = time.time()
+    for seq, schedule in enumerate(schedules):
+        queue.push(ScheduledCall(schedule.start(start), seq, None, (schedule,)))
+
+    fires = 0
+    most_at_once = 0
+    seq = count
+    cpu = time.perf_counter()
+    now = start
+    end = start + DAY
+    while now < end:
+        now += 1.0
+        if gap is not None and start + gap[0] <= now < start + gap[0] + gap[1]:
+            continue
+        for call in queue.pop_due(now):
+            schedule = call.args[0]
+            fired, due = schedule.advance(now)
+            fires += len(fired)
+            most_at_once = max(most_at_once, len(fired))
+            if due is not None:
+                seq += 1
+                queue.push(ScheduledCall(due, seq, None, (schedule,)))
+    cpu = time.perf_counter() - cpu
+    return {'fires': fires, 'seconds': cpu, 'fire_us': cpu / max(fires, 1) * 1e6,
+            'most_at_once': most_at_once}
+
+
+def manager_bytes(count: int) -> float:
+    manager = TimerManager()
+    manager.set_output_callback(lambda message: None, include_events=False)
+    schedules = make_schedules(count)
+    gc.collect()
+    tracemalloc.start()
+    for i, schedule in enumerate(schedules):
+        manager.create_recurring(f"timer-{i}", schedule)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    manager.scheduler.shutdown()
+    return used / count
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 10000
+    queue_name = argv[1] if len(argv) > 1 else 'heap'
+    print(f"{count} schedules, simulated day on the {queue_name} queue")
+    print(f"{'scenario':>22} {'fires':>9} {'cpu s':>7} {'us/fire':>8} {'max fires/wakeup':>17}")
+    for label, gap, catch_up in (('no gap', None, 1),
+                                 ('3h gap, catch_up=1', (8 * 3600, 3 * 3600), 1),
+                                 ('3h gap, catch_up=3', (8 * 3600, 3 * 3600), 3)):
+        result = simulate(count, queue_name, gap, catch_up)
+        print(f"{label:>22} {result['fires']:>9} {result['seconds']:>7.2f} "
+              f"{result['fire_us']:>8.2f} {result['most_at_once']:>17}")
+    print(f"memory per recurring timer in a TimerManager: {manager_bytes(count):.0f} bytes")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
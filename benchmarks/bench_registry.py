@@ -0,0 +1,111 @@
+"""Multi-threaded stress test and throughput of the lock-striped TimerRegistry.
+
+Worker threads run random create/pause/resume/stop/start/delete commands
+on a shared pool of names, while another thread keeps listing and
+occasionally clearing. Afterwards the registry, the timer store and the
+scheduler must agree. The run is repeated with 1, 2, 4 and 8 workers to
+show throughput by thread count.
+
+Usage: python benchmarks/bench_registry.py [seconds] [names]
+"""
+import random
+import sys
+import threading
+import time
+
+import _common
+from alert_manager import NullSink
+from timer_manager import TimerManager
+
+COMMANDS = ('create', 'pause', 'resume', 'stop', 'start', 'delete')
+
+
+def worker(manager: TimerManager, names, stop: threading.Event, counts, index: int, errors):
+    rng = random.Random(index)
+    done = 0
+    while not stop.is_set():
+        name = rng.choice(names)
+        command = rng.choice(COMMANDS)
+        try:
+            if command == 'create':
+                manager.create_timer(name, rng.randint(60, 3600))
+            else:
+                manager.execute_command({'type': command, 'name': name})
+        except ValueError:
+            pass  # timer already exists or was deleted by another thread
+        except Exception as e:
+            errors.append(f"{command} {name}: {e!r}")
+        done += 1
+    counts[index] = done
+
+
+def lister(manager: TimerManager, stop: threading.Event, errors):
+    rounds = 0
+    while not stop.is_set():
+        try:
+            snapshot = manager.timers.items()
+            if len({name for name, _ in snapshot}) != len(snapshot):
+                errors.append("duplicate name in snapshot")
+            manager.list_timers()
+            rounds += 1
+            if rounds % 50 == 0:
+                manager.clear_all_timers()
+        except Exception as e:
+            errors.append(f"list/clear: {e!r}")
+        time.sleep(0.001)
+
+
+def check(manager: TimerManager, errors) -> None:
+    """The registry, the store and the scheduler must agree."""
+    timers = manager.timers.items()
+    if len(manager.store) != len(timers):
+        errors.append(f"store has {len(manager.store)} live slots, registry {len(timers)} timers")
+    for name, timer in timers:
+        if timer.name != name:
+            errors.append(f"timer {timer.name!r} registered as {name!r}")
+        counting = timer.running and not timer.paused and not timer.alerting
+        if counting and (timer.handle is None or timer.handle.cancelled):
+            errors.append(f"{name} is counting down without a pending tick")
+        if timer.paused and timer.deadline is not None:
+            errors.append(f"{name} is paused but has a deadline")
+
+
+def run(threads: int, seconds: float, pool: int) -> dict:
+    manager = TimerManager()
+    manager.set_output_callback(lambda message: None, include_events=False)
+    manager.alert_manager.sink = NullSink()
+    names = [f"timer-{i}" for i in range(pool)]
+    stop = threading.Event()
+    counts = [0] * threads
+    errors = []
+    workers = [threading.Thread(target=worker, args=(manager, names, stop, counts, i, errors))
+               for i in range(threads)]
+    workers.append(threading.Thread(target=lister, args=(manager, stop, errors)))
+    for thread in workers:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    check(manager, errors)
+    manager.scheduler.shutdown()
+    return {'threads': threads, 'commands_per_sec': sum(counts) / seconds,
+            'timers': len(manager.timers), 'errors': errors}
+
+
+def main(argv):
+    seconds = float(argv[0]) if argv else 3.0
+    pool = int(argv[1]) if len(argv) > 1 else 2000
+    failed = False
+    print(f"{'threads':>8} {'commands/s':>12} {'timers':>8} {'errors':>7}")
+    for threads in (1, 2, 4, 8):
+        result = run(threads, seconds, pool)
+        print(f"{threads:>8} {result['commands_per_sec']:>12.0f} {result['timers']:>8} {len(result['errors']):>7}")
+        for error in result['errors'][:5]:
+            print(f"    {error}")
+        failed = failed or bool(result['errors'])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,44 @@
+"""Thread count, RSS and CPU of TimerManager with many concurrent timers.
+
+Usage: python benchmarks/bench_scheduler.py [count ...]
+"""
+import sys
+import time
+
+import _common
+from timer_manager import TimerManager
+
+
+def run(count: int, window: float = 5.0) -> dict:
+    manager = TimerManager()
+    manager.set_output_callback(lambda message: None, include_events=False)
+
+    rss_before = _common.rss_mb()
+    start = time.perf_counter()
+    for i in range(count):
+        manager.create_timer(f"timer-{i}", 2 * 3600)
+    create_seconds = time.perf_counter() - start
+
+    cpu_percent = _common.measure_window(window)
+    result = {
+        'timers': count,
+        'threads': _common.thread_count(),
+        'rss_mb': round(_common.rss_mb() - rss_before, 1),
+        'create_per_sec': round(count / create_seconds),
+        'cpu_percent': round(cpu_percent, 1),
+    }
+    manager.scheduler.shutdown()
+    return result
+
+
+def main(argv):
+    counts = [int(arg) for arg in argv] or [10_000, 100_000]
+    print(f"{'timers':>8} {'threads':>8} {'rss MiB':>8} {'create/s':>10} {'cpu %':>7}")
+    for count in counts:
+        r = run(count)
+        print(f"{r['timers']:>8} {r['threads']:>8} {r['rss_mb']:>8} "
+              f"{r['create_per_sec']:>10} {r['cpu_percent']:>7}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,83 @@
+"""Command throughput of ShardedTimerManager from 1 to N shards.
+
+Runs the same workload (create `count` tagged timers, then pause, resume
+and delete each of them by name) through an in-process TimerManager and
+through ShardedTimerManager with 1, 2, ... `max_shards` worker processes,
+sending commands in pipelined chunks of `chunk`. Every event the shards
+publish is forwarded to the front-end. Shards only run in parallel with
+as many cores as shards; on fewer cores the extra processes just add
+overhead, so the CPU count is printed with the results, along with the
+CPU time of the front-end and of the shards: the front-end's share bounds
+the speedup more cores can give.
+
+Usage: python benchmarks/bench_shards.py [count] [max_shards] [chunk]
+"""
+import os
+import resource
+import sys
+import time
+
+import _common
+from alert_manager import NullSink
+from sharded_timer_manager import ShardedTimerManager
+from timer_manager import TimerManager
+
+
+def workload(count: int) -> list:
+    names = [f"timer-{i}" for i in range(count)]
+    commands = [{"type": "create", "name": name, "duration": 3599, "tags": ("work",) if i % 2 else ()}
+                for i, name in enumerate(names)]
+    for command_type in ("pause", "resume", "delete"):
+        commands += [{"type": command_type, "name": name} for name in names]
+    return commands
+
+
+def run_local(commands: list) -> float:
+    manager = TimerManager()
+    manager.alert_manager.sink = NullSink()
+    manager.set_output_callback(lambda message: None, include_events=False)
+    start = time.perf_counter()
+    for command in commands:
+        manager.execute_command(command)
+    elapsed = time.perf_counter() - start
+    manager.scheduler.shutdown()
+    return elapsed
+
+
+def run_sharded(commands: list, shards: int, chunk: int) -> tuple:
+    manager = ShardedTimerManager(shards)
+    manager.set_output_callback(lambda message: None, include_events=False)
+    events = []
+    manager.events.subscribe(events.append)
+    # Shards have started; their CPU is counted once they exit and are reaped
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    front = _common.cpu_seconds()
+    start = time.perf_counter()
+    for offset in range(0, len(commands), chunk):
+        manager.execute_commands(commands[offset:offset + chunk])
+    elapsed = time.perf_counter() - start
+    front = _common.cpu_seconds() - front
+    manager.shutdown()
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    shard_cpu = usage.ru_utime + usage.ru_stime - children.ru_utime - children.ru_stime
+    return elapsed, len(events), front, shard_cpu
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 20000
+    max_shards = int(argv[1]) if len(argv) > 1 else (os.cpu_count() or 1)
+    chunk = int(argv[2]) if len(argv) > 2 else 1000
+    commands = workload(count)
+    print(f"{len(commands)} commands on {count} timers, chunks of {chunk}, {os.cpu_count()} CPU(s)")
+    local = run_local(commands)
+    print(f"{'manager':>12} {'seconds':>8} {'commands/s':>11} {'speedup':>8} {'events':>8} "
+          f"{'front cpu s':>12} {'shard cpu s':>12}")
+    print(f"{'in-process':>12} {local:>8.2f} {len(commands) / local:>11.0f} {1.0:>8.2f} {'-':>8}")
+    for shards in range(1, max_shards + 1):
+        elapsed, events, front, shard_cpu = run_sharded(commands, shards, chunk)
+        print(f"{f'{shards} shard(s)':>12} {elapsed:>8.2f} {len(commands) / elapsed:>11.0f} "
+              f"{local / elapsed:>8.2f} {events:>8} {front:>12.2f} {shard_cpu:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
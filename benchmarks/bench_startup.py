@@ -0,0 +1,91 @@
+"""Time-to-first-paint of the Tk app, from source or a frozen build.
+
+Launches the app `runs` times with --profile-startup --exit-after-startup
+and reads its phase report. Time to first paint is measured from just
+before the process is spawned, so it includes interpreter start-up (or the
+PyInstaller bootloader unpacking a onefile build) as well as the app's own
+imports and window setup. Also reports the time of the remaining startup
+phases, and how long `import timer_app` takes on its own, which works
+without a display.
+
+Usage: python benchmarks/bench_startup.py [runs] [frozen_executable]
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+import _common
+
+PHASE = re.compile(r'^\s*([\d.]+) ms\s+\+[\d.]+ ms\s+(.+)$')
+STARTED = re.compile(r'^profile started at ([\d.]+)')
+
+
+def launch(command):
+    """Run the app once; return (seconds to first paint, {phase: ms}) or None."""
+    spawned = time.time()
+    result = subprocess.run(command + ['--profile-startup', '--exit-after-startup'],
+                            cwd=_common.REPO_ROOT, capture_output=True, text=True, timeout=60)
+    started = None
+    phases = {}
+    for line in result.stderr.splitlines():
+        match = STARTED.match(line)
+        if match:
+            started = float(match.group(1))
+        match = PHASE.match(line)
+        if match:
+            phases[match.group(2)] = float(match.group(1))
+    if result.returncode != 0 or started is None or 'first paint' not in phases:
+        print(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else
+              f"exit status {result.returncode}", file=sys.stderr)
+        return None
+    return started + phases['first paint'] / 1000 - spawned, phases
+
+
+def import_time(runs):
+    """Median seconds for a fresh interpreter to run `import timer_app`."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'import timer_app'], cwd=_common.REPO_ROOT, check=True)
+        times.append(time.perf_counter() - start)
+    baseline = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        baseline.append(time.perf_counter() - start)
+    return statistics.median(times), statistics.median(baseline)
+
+
+def main(argv):
+    runs = int(argv[0]) if argv else 10
+    if len(argv) > 1:
+        command, label = [os.path.abspath(argv[1])], 'frozen'
+    else:
+        command, label = [sys.executable, os.path.join(_common.REPO_ROOT, 'timer_app.py')], 'source'
+
+    imported, bare = import_time(runs)
+    print(f"python -c 'import timer_app': {imported * 1000:.1f} ms "
+          f"({(imported - bare) * 1000:.1f} ms over an empty interpreter)")
+
+    samples = []
+    for _ in range(runs):
+        sample = launch(command)
+        if sample is None:
+            print(f"{label} build did not start; a display is needed to measure first paint")
+            return
+        samples.append(sample)
+
+    paints = sorted(paint for paint, _ in samples)
+    print(f"{label} time to first paint over {runs} runs: median {statistics.median(paints) * 1000:.1f} ms, "
+          f"min {paints[0] * 1000:.1f} ms, max {paints[-1] * 1000:.1f} ms")
+    print("median phase end, ms since the app started importing:")
+    for phase in samples[0][1]:
+        values = [phases[phase] for _, phases in samples if phase in phases]
+        print(f"{statistics.median(values):9.1f}  {phase}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,114 @@
+"""Memory and bulk-query cost of the struct-of-arrays timer store.
+
+Reports RSS per timer for the old dict-backed Timer layout and for Timer
+views over a TimerStore, then creates `count` timers through TimerManager
+(which adds scheduler entries) and compares bulk queries against
+per-object loops.
+
+Usage: python benchmarks/bench_store.py [count]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import _common
+from timer_manager import Timer, TimerManager, TimerStore
+
+
+class DictTimer:
+    """The previous Timer layout: one __dict__ per timer."""
+
+    def __init__(self, name: str, duration: int):
+        self.name = name
+        self.duration = duration
+        self.deadline = time.monotonic() + duration
+        self.banked = float(duration)
+        self.lateness = None
+        self.running = True
+        self.paused = False
+        self.start_time = datetime.now()
+        self.callback = self.format_time
+        self.alerting = False
+        self.handle = None
+        self.generation = 1
+        self.last_output = f"{duration // 60}m"
+
+    def format_time(self, seconds):
+        return seconds
+
+
+def store_timer(name: str, duration: int, store: TimerStore) -> Timer:
+    timer = Timer(name, duration, store)
+    timer.running = True
+    timer.start_time = datetime.now()
+    timer.start_countdown()
+    timer.report()
+    return timer
+
+
+def bytes_per_timer(make, count: int) -> float:
+    """Python allocations per timer, including names and the name index."""
+    gc.collect()
+    tracemalloc.start()
+    timers = {f"timer-{i}": make(f"timer-{i}", 3600 + i % 3600) for i in range(count)}
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del timers
+    return used / count
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run(count: int) -> dict:
+    dict_bytes = bytes_per_timer(DictTimer, count)
+    store = TimerStore()
+    view_bytes = bytes_per_timer(lambda name, duration: store_timer(name, duration, store), count)
+    del store
+
+    manager = TimerManager()
+    manager.set_output_callback(lambda message: None, include_events=False)
+    gc.collect()
+    before = _common.rss_mb()
+    for i in range(count):
+        manager.create_timer(f"timer-{i}", 3600 + i % 3600)
+        if i % 3 == 0:
+            manager.pause_timer(f"timer-{i}")
+    manager_bytes = (_common.rss_mb() - before) * 1024 * 1024 / count
+
+    timers = list(manager.timers.values())
+    counts, counts_ms = timed(manager.timer_counts)
+    _, counts_loop_ms = timed(lambda: sum(1 for t in timers if t.running and not t.paused))
+    expiring, expiring_ms = timed(lambda: manager.expiring_within(3600 + 600))
+    _, expiring_loop_ms = timed(
+        lambda: [t.name for t in timers if t.deadline is not None and t.remaining <= 3600 + 600])
+    manager.scheduler.shutdown()
+
+    return {
+        'timers': count,
+        'dict_timer_bytes': round(dict_bytes),
+        'store_timer_bytes': round(view_bytes),
+        'manager_timer_bytes': round(manager_bytes),
+        'running': counts['running'],
+        'paused': counts['paused'],
+        'counts_ms': round(counts_ms, 2),
+        'counts_loop_ms': round(counts_loop_ms, 2),
+        'expiring': len(expiring),
+        'expiring_ms': round(expiring_ms, 2),
+        'expiring_loop_ms': round(expiring_loop_ms, 2),
+    }
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 1_000_000
+    for key, value in run(count).items():
+        print(f"{key:>19}: {value}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,104 @@
+"""Frame time of the Active Timers panel at 100, 1k and 10k timers.
+
+Fills a TimerPanel with timers, then applies frames in which a slice of
+the timers tick and a few pause or resume, the way UIUpdateQueue.drain
+hands them over. With a display (or under xvfb-run) the panel drives a
+real ttk.Treeview and each frame includes Tk's redraw; without one it
+drives a stub tree that counts the Tk calls a frame would make.
+
+Usage: python benchmarks/bench_timer_panel.py [frames] [count ...]
+"""
+import sys
+import time
+from collections import Counter
+
+import _common
+from timer_app import TimerPanel
+from timer_manager import format_time
+
+
+class CountingTree:
+    """Stands in for ttk.Treeview without a display, counting calls."""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.calls['insert'] += 1
+
+    def item(self, iid, **options):
+        self.calls['item'] += 1
+
+    def delete(self, *iids):
+        self.calls['delete'] += 1
+
+    def set_children(self, item, *children):
+        self.calls['set_children'] += 1
+
+
+def make_panel():
+    """A panel on a real Treeview when Tk can open a display, else on a stub."""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return TimerPanel(CountingTree()), None
+    root.geometry("300x500")
+    return TimerPanel.create(root), root
+
+
+def run(count: int, frames: int) -> dict:
+    panel, root = make_panel()
+    redraw = root.update if root is not None else (lambda: None)
+    names = [f"timer-{i}" for i in range(count)]
+
+    start = time.perf_counter()
+    panel.apply({name: (format_time(60 + i), "running", 60.0 + i) for i, name in enumerate(names)})
+    redraw()
+    fill_ms = (time.perf_counter() - start) * 1000
+
+    # Timers under a minute change every second: at 20 frames/s about 1/20 of them per frame
+    per_frame = max(1, count // 20)
+    frame_times = []
+    for frame in range(frames):
+        updates = {}
+        for i in range(per_frame):
+            index = (frame * per_frame + i) % count
+            left = 59 - frame % 59
+            updates[names[index]] = (format_time(left), "running", float(left))
+        updates[names[frame % count]] = ("59s", "paused", 59.0)
+        start = time.perf_counter()
+        panel.apply(updates)
+        redraw()
+        frame_times.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    panel.sort_by("remaining")
+    redraw()
+    sort_ms = (time.perf_counter() - start) * 1000
+
+    if root is not None:
+        root.destroy()
+    frame_times.sort()
+    return {
+        'timers': count,
+        'tk': 'real' if root is not None else 'stub',
+        'fill_ms': fill_ms,
+        'mean_frame_ms': sum(frame_times) / len(frame_times),
+        'p99_frame_ms': frame_times[min(len(frame_times) - 1, int(len(frame_times) * 0.99))],
+        'sort_ms': sort_ms,
+    }
+
+
+def main(argv):
+    frames = int(argv[0]) if argv else 200
+    counts = [int(arg) for arg in argv[1:]] or [100, 1000, 10000]
+    print(f"{'timers':>8} {'tk':>5} {'fill ms':>9} {'frame ms':>9} {'p99 ms':>8} {'sort ms':>8}")
+    for count in counts:
+        r = run(count, frames)
+        print(f"{r['timers']:>8} {r['tk']:>5} {r['fill_ms']:>9.1f} {r['mean_frame_ms']:>9.2f} "
+              f"{r['p99_frame_ms']:>8.2f} {r['sort_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,65 @@
+"""Frame time and event throughput of the TimerApp UI update queue.
+
+Producer threads push timer events the way the scheduler thread does while
+the main thread drains the queue once per frame. Runs headless: the widget
+updates are replaced by a dict write per coalesced timer update.
+
+Usage: python benchmarks/bench_ui_queue.py [timers] [seconds]
+"""
+import sys
+import threading
+import time
+
+import _common
+from timer_app import TimerApp, UIUpdateQueue
+from timer_manager import TimerTick
+
+
+def produce(ui_queue: UIUpdateQueue, names, stop: threading.Event):
+    push = ui_queue.push
+    tick = 0
+    while not stop.is_set():
+        tick += 1
+        for name in names:
+            push(TimerTick(name, tick % 60, f"{tick % 60}s"))
+        time.sleep(0)
+
+
+def run(timers: int, seconds: float, producers: int = 4) -> dict:
+    ui_queue = UIUpdateQueue()
+    names = [f"timer-{i}" for i in range(timers)]
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=produce, args=(ui_queue, names[i::producers], stop), daemon=True)
+        for i in range(producers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    labels = {}
+    frame = TimerApp.FRAME_INTERVAL_MS / 1000
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        time.sleep(frame)
+        start = time.perf_counter()
+        updates, lines = ui_queue.drain()
+        labels.update(updates)
+        ui_queue.record_frame(time.perf_counter() - start)
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    stats = ui_queue.stats()
+    stats['timers_shown'] = len(labels)
+    return stats
+
+
+def main(argv):
+    timers = int(argv[0]) if argv else 500
+    seconds = float(argv[1]) if len(argv) > 1 else 5.0
+    for key, value in run(timers, seconds).items():
+        print(f"{key:>16}: {value:.2f}" if isinstance(value, float) else f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
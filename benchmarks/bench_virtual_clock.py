@@ -0,0 +1,87 @@
+"""Simulated timer workloads on a VirtualClock.
+
+Creates `count` timers with durations spread over up to `hours` hours,
+pauses and resumes a tenth of them part way, then runs the clock until
+every timer has finished. Reports the simulated timer-hours per second of
+real time and every event the run published, and runs it twice to check
+that the event sequence is identical. With the wheel queue, `resolution`
+sets its tick (the fine default exercises ticks whose times don't convert
+back exactly). With --no-ticks the manager publishes no per-minute display
+ticks, so the clock only stops at deadlines; e.g. "100000 20 --no-ticks"
+simulates a million timer-hours.
+
+Usage: python benchmarks/bench_virtual_clock.py [count] [hours] [queue: heap|wheel] [resolution] [--no-ticks]
+"""
+import hashlib
+import random
+import sys
+import time
+
+import _common
+from alert_manager import NullSink
+from clock import VirtualClock
+from timer_manager import TimerManager
+
+# A fixed wall-clock start, so runs don't depend on today's date
+EPOCH = 1700000000.0
+
+
+def simulate(count: int, hours: float, engine: str, resolution: float, ticks: bool) -> dict:
+    rng = random.Random(42)
+    clock = VirtualClock(wall=EPOCH)
+    manager = TimerManager(engine, resolution, clock=clock, ticks=ticks)
+    manager.alert_manager.sink = NullSink()
+    manager.set_output_callback(lambda message: None, include_events=False)
+    digest = hashlib.blake2b(digest_size=16)
+    events = 0
+
+    def record(event):
+        nonlocal events
+        events += 1
+        digest.update(repr(event).encode())
+
+    manager.events.subscribe(record)
+    durations = [rng.randint(60, int(hours * 3600)) for _ in range(count)]
+    start = time.perf_counter()
+    for i, duration in enumerate(durations):
+        manager.create_timer(f"timer-{i}", duration)
+    clock.advance(30 * 60)
+    paused = [f"timer-{i}" for i in range(0, count, 10)
+              if manager.timers[f"timer-{i}"].deadline is not None]
+    for name in paused:
+        manager.pause_timer(name)
+    clock.advance(15 * 60)
+    for name in paused:
+        manager.resume_timer(name)
+    simulated = clock.run() + 45 * 60
+    elapsed = time.perf_counter() - start
+    counts = manager.timer_counts()
+    manager.alert_manager.stop_all_alerts()
+    return {
+        'elapsed': elapsed,
+        'simulated_hours': simulated / 3600,
+        'timer_hours': sum(durations) / 3600,
+        'events': events,
+        'alerting': counts['alerting'],
+        'digest': digest.hexdigest(),
+    }
+
+
+def main(argv):
+    ticks = '--no-ticks' not in argv
+    argv = [arg for arg in argv if arg != '--no-ticks']
+    count = int(argv[0]) if argv else 10000
+    hours = float(argv[1]) if len(argv) > 1 else 2.0
+    engine = argv[2] if len(argv) > 2 else 'heap'
+    resolution = float(argv[3]) if len(argv) > 3 else 0.01
+    print(f"{count} timers of up to {hours:g}h on the {engine} queue{'' if ticks else ', no ticks'}")
+    runs = [simulate(count, hours, engine, resolution, ticks) for _ in range(2)]
+    for run in runs:
+        print(f"{run['timer_hours']:.0f} timer-hours ({run['simulated_hours']:.2f}h of clock time) "
+              f"in {run['elapsed']:.2f}s real: {run['timer_hours'] / run['elapsed']:.0f} timer-hours/s, "
+              f"{run['events']} events, {run['alerting']} finished")
+    print("event sequences identical:", runs[0]['digest'] == runs[1]['digest'])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
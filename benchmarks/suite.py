@@ -0,0 +1,251 @@
+"""Headless microbenchmark suite with JSON results and regression checks.
+
+Runs each case, prints its metrics and optionally writes them as JSON.
+Every metric is a cost (microseconds per operation or bytes per timer), so
+lower is better. Given a baseline JSON file from an earlier run, metrics
+that got worse by more than --threshold are reported and the exit code is 1.
+
+Usage: python benchmarks/suite.py [--output FILE] [--baseline FILE]
+                                  [--threshold 0.15] [--quick] [case ...]
+
+Cases: manager, interpreter, parser, alerts, ui, metrics, memory.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+import _common
+from alert_manager import AlertManager, NullSink
+from bench_interpreter import build_corpus, time_calls
+from command_interpreter import CommandInterpreter
+from command_parser import CommandParser
+from timer_manager import TimerManager, TimerTick
+
+STRICT_CORPUS = [
+    f"{verb} {name}{suffix}"
+    for name in ('pomodoro', 'break', 'tea', 'laundry', 'meeting', 'eggs', 'nap', 'run')
+    for verb, suffix in (('create', ' 25m'), ('create', ' 30s'), ('create', ' 2h'), ('create', ' 90'),
+                         ('start', ''), ('pause', ''), ('resume', ''), ('stop', ''), ('delete', ''))
+] + ['list']
+
+
+def quiet_manager() -> TimerManager:
+    manager = TimerManager()
+    manager.set_output_callback(lambda message: None, include_events=False)
+    manager.alert_manager.sink = NullSink()
+    return manager
+
+
+def per_call_us(function: Callable[[], None], count: int) -> float:
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def bench_manager(size: int) -> Dict[str, float]:
+    """TimerManager command throughput, as microseconds per command."""
+    manager = quiet_manager()
+    names = [f"timer-{i}" for i in range(size)]
+    results = {}
+    for label, method in (('create', lambda name: manager.create_timer(name, 600)),
+                          ('pause', manager.pause_timer), ('resume', manager.resume_timer),
+                          ('stop', manager.stop_timer), ('start', manager.start_timer),
+                          ('delete', manager.delete_timer)):
+        results[f"{label}_us"] = per_call_us(lambda: [method(name) for name in names], size)
+    manager.scheduler.shutdown()
+    return results
+
+
+def bench_interpreter(size: int) -> Dict[str, float]:
+    corpus = build_corpus()
+    fresh = CommandInterpreter()
+    uncached = time_calls(lambda text: fresh._interpret(' '.join(text.lower().split())), corpus)
+    warm = CommandInterpreter()
+    for text in corpus:
+        warm.interpret(text)
+    cached = time_calls(warm.interpret, corpus)
+    return {
+        'uncached_mean_us': uncached['mean_us'],
+        'uncached_p99_us': uncached['p99_us'],
+        'cached_mean_us': cached['mean_us'],
+    }
+
+
+def bench_parser(size: int) -> Dict[str, float]:
+    stats = time_calls(CommandParser().parse_command, STRICT_CORPUS * 20)
+    return {'mean_us': stats['mean_us'], 'p99_us': stats['p99_us']}
+
+
+def bench_alerts(size: int) -> Dict[str, float]:
+    """AlertManager start/stop cost with the engine thread playing into a NullSink."""
+    manager = AlertManager(NullSink())
+    names = [f"timer-{i}" for i in range(size)]
+    start_us = per_call_us(lambda: [manager.start_alert(name) for name in names], size)
+    stop_us = per_call_us(lambda: [manager.stop_alert(name) for name in names], size)
+    return {'start_us': start_us, 'stop_us': stop_us}
+
+
+class StubWidget:
+    """Accepts the widget calls TimerApp makes and does nothing."""
+
+    def config(self, **options):
+        pass
+
+    def insert(self, *args, **options):
+        pass
+
+    def item(self, iid, **options):
+        pass
+
+    def delete(self, *iids):
+        pass
+
+    def set_children(self, item, *children):
+        pass
+
+    def see(self, index):
+        pass
+
+    def destroy(self):
+        pass
+
+    def after(self, delay, callback):
+        pass
+
+
+def bench_ui(size: int) -> Dict[str, float]:
+    """TimerApp.print_output and frame handling against stubbed Tk widgets.
+
+    The app is built without Tk and its timer panel drives a stub tree, so
+    drain_ui_queue runs its real code path without a display.
+    """
+    try:
+        from timer_app import OutputLog, TimerApp, TimerPanel, UIUpdateQueue
+    except ImportError:
+        return {}
+
+    app = TimerApp.__new__(TimerApp)
+    app.root = app.output_text = StubWidget()
+    app.output_log = OutputLog(app.output_text)
+    app.ui_queue = UIUpdateQueue()
+    app.timer_panel = TimerPanel(StubWidget())
+    names = [f"timer-{i % 500}" for i in range(size)]
+
+    print_us = per_call_us(lambda: [app.print_output(f"Executed: {name}") for name in names], size)
+    drain_lines_us = per_call_us(app.drain_ui_queue, size)
+
+    push = app.ui_queue.push
+    start = time.perf_counter()
+    for tick, name in enumerate(names):
+        push(TimerTick(name, tick % 60, f"{tick % 60}s"))
+    app.drain_ui_queue()
+    event_us = (time.perf_counter() - start) / size * 1e6
+    return {'print_output_us': print_us, 'drain_line_us': drain_lines_us, 'tick_event_us': event_us}
+
+
+def bench_metrics(size: int) -> Dict[str, float]:
+    """execute_command cost with metrics disabled and enabled."""
+    results = {}
+    for label in ('disabled', 'enabled'):
+        manager = quiet_manager()
+        if label == 'enabled':
+            manager.enable_metrics()
+        names = [f"timer-{i}" for i in range(size)]
+        execute = manager.execute_command
+        results[f"{label}_us"] = per_call_us(
+            lambda: [(execute({'type': 'create', 'name': name, 'duration': 600}),
+                      execute({'type': 'delete', 'name': name})) for name in names], 2 * size)
+        manager.scheduler.shutdown()
+    return results
+
+
+def bench_memory(size: int) -> Dict[str, float]:
+    """Python allocations per running timer, scheduler entries included."""
+    manager = quiet_manager()
+    gc.collect()
+    tracemalloc.start()
+    for i in range(size):
+        manager.create_timer(f"timer-{i}", 3600)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    manager.scheduler.shutdown()
+    return {'timer_bytes': used / size}
+
+
+CASES = {
+    'manager': (bench_manager, 20000),
+    'interpreter': (bench_interpreter, 0),
+    'parser': (bench_parser, 0),
+    'alerts': (bench_alerts, 20000),
+    'ui': (bench_ui, 100000),
+    'metrics': (bench_metrics, 20000),
+    'memory': (bench_memory, 100000),
+}
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> list:
+    """Return (case, metric, old, new) for every metric that regressed."""
+    regressions = []
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            old = baseline.get(case, {}).get(metric)
+            if old and value > old * (1 + threshold):
+                regressions.append((case, metric, old, value))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument('cases', nargs='*', help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="allowed slowdown before a metric counts as a regression (default 0.15)")
+    parser.add_argument('--quick', action='store_true', help="run with a tenth of the usual sizes")
+    args = parser.parse_args(argv)
+
+    unknown = [case for case in args.cases if case not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    results = {}
+    for case in args.cases or CASES:
+        function, size = CASES[case]
+        if args.quick:
+            size //= 10
+        metrics = function(size)
+        results[case] = {metric: round(value, 3) for metric, value in metrics.items()}
+        for metric, value in results[case].items():
+            print(f"{case + '.' + metric:>30}: {value}")
+        if not metrics:
+            print(f"{case:>30}: skipped")
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for case, metric, old, new in regressions:
+            print(f"REGRESSION {case}.{metric}: {old} -> {new} (+{100 * (new / old - 1):.0f}%)")
+        if regressions:
+            return 1
+        print(f"no regressions beyond {100 * args.threshold:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
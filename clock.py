@@ -0,0 +1,144 @@
+"""Clocks for TimerManager and AlertManager.
+
+Everything that reads the time or waits for it goes through a Clock, so a
+workload can run on simulated time:
+
+    clock = VirtualClock(wall=datetime(2024, 1, 1).timestamp())
+    manager = TimerManager(clock=clock)
+    manager.create_timer("tea", 2 * 3600)
+    clock.advance(3600)     # an hour passes at once; ticks fire in order
+    clock.run()             # run until nothing is scheduled
+
+A VirtualClock only moves when told to. It runs the scheduled calls of
+every Scheduler attached to it on the thread that advances it, earliest
+deadline first (ties in scheduling order), with the clock set to each
+call's deadline, so a simulation is deterministic and as fast as the
+callbacks.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+class Clock:
+    """The real clocks: time.monotonic() for deadlines, time.time() for wall time."""
+
+    virtual = False
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def time(self) -> float:
+        return time.time()
+
+    def now(self) -> datetime:
+        """Local wall-clock time as a datetime."""
+        return datetime.fromtimestamp(self.time())
+
+    def wait(self, condition: threading.Condition, timeout: Optional[float] = None) -> bool:
+        """Wait on a held `condition` for a notify or up to `timeout` seconds."""
+        return condition.wait(timeout)
+
+    def attach(self, scheduler) -> bool:
+        """Called by a new Scheduler. Returns True if the clock runs the
+        scheduler's calls itself, so the scheduler needs no worker thread."""
+        return False
+
+SYSTEM_CLOCK = Clock()
+
+class VirtualClock(Clock):
+    """Simulated time that moves only when advanced.
+
+    `start` is the initial monotonic reading and `wall` the wall-clock time
+    at that moment (the real time by default).
+    """
+
+    virtual = True
+
+    def __init__(self, start: float = 0.0, wall: Optional[float] = None):
+        self._now = float(start)
+        self._wall_offset = (time.time() if wall is None else wall) - start
+        self._schedulers: List[object] = []
+        # Conditions that threads are waiting on with a timeout
+        self._waiters: List[threading.Condition] = []
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        return self._now
+
+    def time(self) -> float:
+        return self._now + self._wall_offset
+
+    def wait(self, condition: threading.Condition, timeout: Optional[float] = None) -> bool:
+        # Virtual time can't pass while we wait in real time, so wait for a
+        # notify; every change of the time notifies the waiting conditions
+        if timeout is None:
+            return condition.wait()
+        with self._lock:
+            self._waiters.append(condition)
+        try:
+            return condition.wait()
+        finally:
+            with self._lock:
+                self._waiters.remove(condition)
+
+    def attach(self, scheduler) -> bool:
+        with self._lock:
+            self._schedulers.append(scheduler)
+        return True
+
+    def _set(self, now: float) -> None:
+        if now <= self._now:
+            return
+        self._now = now
+        with self._lock:
+            waiters = list(self._waiters)
+        for condition in waiters:
+            with condition:
+                condition.notify_all()
+
+    def next_deadline(self) -> Optional[float]:
+        """The earliest deadline of any attached scheduler, None if idle."""
+        deadlines = [deadline for deadline in (s.next_deadline() for s in self._schedulers)
+                     if deadline is not None]
+        return min(deadlines) if deadlines else None
+
+    def step(self) -> bool:
+        """Jump to the next deadline and run the calls due then.
+
+        Returns False, without moving, if nothing is scheduled.
+        """
+        deadline = self.next_deadline()
+        if deadline is None:
+            return False
+        self._set(deadline)
+        for scheduler in self._schedulers:
+            scheduler.run_due(self._now)
+        return True
+
+    def run_until(self, when: float) -> None:
+        """Run everything due up to monotonic time `when`, then stop there."""
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > when:
+                break
+            self.step()
+        self._set(when)
+
+    def advance(self, seconds: float) -> None:
+        """Let `seconds` pass, running what falls due meanwhile."""
+        self.run_until(self._now + seconds)
+
+    def run(self, limit: Optional[float] = None) -> float:
+        """Run until nothing is scheduled, or until `limit` seconds have
+        passed. Returns the simulated seconds that passed.
+
+        Recurring timers never run out, so give a limit when there are any.
+        """
+        start = self._now
+        while self.next_deadline() is not None:
+            if limit is not None and self.next_deadline() > start + limit:
+                self._set(start + limit)
+                break
+            self.step()
+        return self._now - start
@@ -1,177 +1,378 @@
 import re
-from typing import Optional, Dict
-from word2number import w2n
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
+
+# Number words and their values; scales multiply the number before them
+NUMBER_WORDS = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
+    'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12,
+    'thirteen': 13, 'fourteen': 14, 'fifteen': 15, 'sixteen': 16, 'seventeen': 17,
+    'eighteen': 18, 'nineteen': 19, 'twenty': 20, 'thirty': 30, 'forty': 40,
+    'fifty': 50, 'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+}
+SCALE_WORDS = {'hundred': 100, 'thousand': 1000, 'million': 1000000}
+
+# Unit spellings longest first, so "mins" wins over "min" and "m"
+UNIT_SECONDS = {
+    'hours': 3600, 'hour': 3600, 'hrs': 3600, 'hr': 3600, 'h': 3600,
+    'minutes': 60, 'minute': 60, 'mins': 60, 'min': 60, 'm': 60,
+    'seconds': 1, 'second': 1, 'secs': 1, 'sec': 1, 's': 1,
+}
+
+_NUMBER_WORD = '|'.join(sorted(list(NUMBER_WORDS) + list(SCALE_WORDS), key=len, reverse=True))
+_UNIT = '|'.join(sorted(UNIT_SECONDS, key=len, reverse=True))
+
+# One scan finds every "<number> <unit>" phrase, e.g. "5 min", "1h30m",
+# "twenty-five minutes" or "one hundred and five seconds"
+DURATION_PATTERN = re.compile(
+    rf'(?:(?P<digits>\d+(?:\.\d+)?)|\b(?P<words>(?:{_NUMBER_WORD})(?:(?:\s+|-)(?:and\s+)?(?:{_NUMBER_WORD}))*))'
+    rf'\s*(?P<unit>{_UNIT})(?![a-z])'
+)
+STANDALONE_NUMBER_PATTERN = re.compile(r'\b(\d+)\b')
+
+# "pause all work timers", "stop every timer tagged work", "resume all timers matching tea*"
+BULK_PATTERN = re.compile(
+    r'^(?P<verb>[a-z]+)\s+(?:everything|(?:all|every)(?:\s+(?:of\s+)?(?:the|my))?'
+    r'(?:\s+(?P<tag>[\w-]+))??(?:\s+timers?)?)'
+    r'(?:\s+(?:tagged|with\s+tag)\s+(?P<tagged>[\w-]+)|\s+(?:matching|like)\s+(?P<pattern>\S+))?$'
+)
+# Recurring timers: "every 30 minutes remind me to stretch", "every hour", "every day at 9am",
+# "every weekday at 9:30", "daily at 18:00"
+EVERY_PATTERN = re.compile(
+    r'\b(?:(?:every\s+(?P<days>day|weekday)|daily|(?P<weekdays>weekdays))\s+at\s+'
+    r'(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<half>am|pm)?'
+    r'|every\s+(?P<unit>hour|minute|second)\b'
+    r'|every\s+(?=\S))'
+)
+COUNT_PATTERN = re.compile(r'\b(?:(?P<count>\d+)\s+times|(?P<once>once|twice))\b')
+# Text that is a recurring timer even with a control word in it ("every hour stop for water")
+RECURRING_START_PATTERN = re.compile(r'^(?:every|daily|weekdays|cron|remind\s+me)\b')
+REMINDER_PATTERN = re.compile(r'\bremind\s+me\s+(?:to\s+)?(?P<name>.+)$')
+CRON_PATTERN = re.compile(r'^cron\s+(?P<expression>@\w+|(?:\S+\s+){4}\S+)\s+(?:for\s+)?(?P<name>.+)$')
+# Tags given when creating a timer: "tagged work" or "#work"
+TAG_PATTERN = re.compile(r'(?:\btagged\s+|#)([\w-]+)')
+GLOB_CHARS = re.compile(r'[*?\[]')
+WORD_SPLIT_PATTERN = re.compile(r'[\s-]+')
+# Indicators match whole words only, so "ago" isn't "go" and "shower" isn't "show"
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+LEADING_ARTICLE_PATTERN = re.compile(r'^(?:the|a|an)\s+')
+TIMER_WORD_PATTERN = re.compile(r'\btimers?\b')
+NAME_MARKER_PATTERN = re.compile(r' (?:for|called|named|label)(?= )')
+# One of these is in every recurring command (see EVERY_PATTERN, CRON_PATTERN)
+RECURRING_WORDS = frozenset({'every', 'daily', 'weekdays', 'cron'})
+# The second word of every bulk command
+BULK_WORDS = frozenset({'all', 'every', 'everything'})
+# Words that make "delete"/"clear" mean every timer
+ALL_WORDS = frozenset({'all', 'everything', 'timers'})
+
+# The intent of an indicator that is in several sets, e.g. "stop" is a stop
+# word before it is a pause word. Between different indicators in one
+# command, the first one in the text wins, except that a create indicator
+# before it ("set a 10 min timer to check the show") makes a command with a
+# duration a create.
+INTENT_PRECEDENCE = ('delete', 'stop', 'pause', 'resume', 'snooze', 'list', 'create')
+# Key marking the end of an indicator phrase in the trie; never a token
+PHRASE_END = ''
+
+def words_to_number(phrase: str) -> Optional[int]:
+    """Convert a phrase of number words ("twenty-five") to an int."""
+    total = 0
+    current = 0
+    found = False
+    for word in WORD_SPLIT_PATTERN.split(phrase):
+        if word in NUMBER_WORDS:
+            current += NUMBER_WORDS[word]
+            found = True
+        elif word in SCALE_WORDS:
+            scale = SCALE_WORDS[word]
+            current = max(current, 1) * scale
+            if scale >= 1000:
+                total += current
+                current = 0
+            found = True
+        elif word != 'and':
+            return None
+    return total + current if found else None
+
+def clean_name(text: str) -> str:
+    """Strip a leading article and the words "timer"/"timers" from a name."""
+    name = LEADING_ARTICLE_PATTERN.sub('', text.strip())
+    return ' '.join(TIMER_WORD_PATTERN.sub(' ', name).split())
 
 class CommandInterpreter:
     def __init__(self):
-        # Common time-related words and their multipliers (in seconds)
-        self.time_multipliers = {
-            'second': 1, 'seconds': 1, 'sec': 1, 'secs': 1, 's': 1,
-            'minute': 60, 'minutes': 60, 'min': 60, 'mins': 60, 'm': 60,
-            'hour': 3600, 'hours': 3600, 'hr': 3600, 'hrs': 3600, 'h': 3600
-        }
-
         # Command type indicators with more variations
         self.create_indicators = {'set', 'create', 'make', 'start', 'begin', 'add', 'new', 'timer'}
         self.pause_indicators = {'pause', 'hold', 'wait', 'suspend', 'freeze', 'stop'}
-        self.resume_indicators = {'resume', 'continue', 'unpause', 'restart', 'unfreeze', 'go'}
-        self.stop_indicators = {'stop', 'end', 'cancel', 'kill', 'terminate', 'abort'}
-        self.delete_indicators = {'delete', 'remove', 'clear', 'destroy'}
-        self.list_indicators = {'list', 'show', 'display', 'view', 'what', 'status', 'timers'}
-
-    def _extract_duration(self, text: str) -> Optional[int]:
-        """Extract duration from text in various formats."""
-        text = text.lower().strip()
-        total_seconds = 0
-        found_time = False
-
-        # Handle combined formats first (e.g., "1 hour and 30 minutes", "1h30m")
-        time_parts = re.findall(r'(\d+)\s*([hms]|hour|minute|second|hr|min|sec)s?\b', text)
-        if time_parts:
-            for value, unit in time_parts:
-                unit = unit.lower()
-                try:
-                    number = int(value)
-                    if unit in ['h', 'hour', 'hr']:
-                        total_seconds += number * 3600
-                    elif unit in ['m', 'minute', 'min']:
-                        total_seconds += number * 60
-                    elif unit in ['s', 'second', 'sec']:
-                        total_seconds += number
-                    found_time = True
-                except ValueError:
+        self.resume_indicators = {'resume', 'continue', 'unpause', 'restart', 'unfreeze', 'go', 'carry on'}
+        self.stop_indicators = {'stop', 'end', 'cancel', 'kill', 'terminate', 'abort', 'turn off'}
+        self.delete_indicators = {'delete', 'remove', 'clear', 'destroy', 'get rid of'}
+        self.snooze_indicators = {'snooze'}
+        self.list_indicators = {'list', 'show', 'display', 'view', 'what', 'status', 'timers',
+                                'how long', 'time left'}
+
+        # Indicator phrases as a trie over whole words, so one pass over a
+        # command finds them all
+        self._indicator_trie: Dict = {}
+        for intent in reversed(INTENT_PRECEDENCE):
+            for phrase in getattr(self, f"{intent}_indicators"):
+                node = self._indicator_trie
+                for word in phrase.split():
+                    node = node.setdefault(word, {})
+                # Sets earlier in INTENT_PRECEDENCE overwrite later ones
+                node[PHRASE_END] = intent
+
+        # Words that are never part of a timer name
+        self._name_excluded_words = (set(UNIT_SECONDS) |
+                                     self.create_indicators |
+                                     self.pause_indicators |
+                                     self.resume_indicators |
+                                     self.stop_indicators |
+                                     self.snooze_indicators |
+                                     self.list_indicators |
+                                     {'a', 'an', 'the', 'timer', 'for', 'called', 'named', 'set'})
+
+        self._interpret_cached = lru_cache(maxsize=4096)(self._interpret)
+
+    def _scan_duration(self, text: str) -> Tuple[Optional[int], List[Tuple[int, int]]]:
+        """Find every duration phrase in one pass.
+
+        Returns the total in seconds (None if there is none) and the spans of
+        the matched phrases. A bare number with no unit counts as minutes.
+        """
+        total_seconds = 0.0
+        spans = []
+        for match in DURATION_PATTERN.finditer(text):
+            digits = match.group('digits')
+            if digits is not None:
+                number = float(digits)
+            else:
+                number = words_to_number(match.group('words'))
+                if number is None:
                     continue
+            total_seconds += number * UNIT_SECONDS[match.group('unit')]
+            spans.append(match.span())
+
+        if not spans:
+            # Try standalone numbers (assume minutes if no unit specified)
+            match = STANDALONE_NUMBER_PATTERN.search(text)
+            if not match:
+                return None, []
+            return int(match.group(1)) * 60, [match.span()]
+
+        return int(total_seconds), spans
 
-        # Try numeric followed by time unit format (e.g., "5 minutes", "5min")
-        if not found_time:
-            for unit, multiplier in self.time_multipliers.items():
-                pattern = rf'(\d+)\s*{unit}'
-                matches = re.finditer(pattern, text)
-                for match in matches:
-                    try:
-                        total_seconds += int(match.group(1)) * multiplier
-                        found_time = True
-                    except ValueError:
-                        continue
-
-        # Try word numbers (e.g., "five minutes")
-        if not found_time:
-            for unit, multiplier in self.time_multipliers.items():
-                pattern = rf'([a-zA-Z-]+)\s*{unit}'
-                matches = re.finditer(pattern, text)
-                for match in matches:
-                    try:
-                        from word2number import w2n
-                        number = w2n.word_to_num(match.group(1))
-                        total_seconds += number * multiplier
-                        found_time = True
-                    except (ValueError, ImportError):
-                        continue
-
-        # Try standalone numbers (assume minutes if no unit specified)
-        if not found_time and re.search(r'\b\d+\b', text):
-            match = re.search(r'\b(\d+)\b', text)
-            if match:
-                try:
-                    total_seconds = int(match.group(1)) * 60  # Assume minutes
-                    found_time = True
-                except ValueError:
-                    pass
-
-        return int(total_seconds) if found_time else None
-
-    def _extract_timer_name(self, text: str, duration_text: str) -> str:
-        """Extract timer name from the command."""
-        # Remove duration part from text
-        text = text.replace(duration_text, '').strip()
-
-        # Look for words after "for" or "called" or "named"
-        for prefix in ['for', 'called', 'named', 'label']:
-            if f" {prefix} " in text:
-                name = text.split(f" {prefix} ")[-1].strip()
-                # Remove articles and timer word
-                name = re.sub(r'^(the|a|an)\s+', '', name)
-                name = name.replace('timer', '').strip()
-                if name:
-                    return name
+    def _extract_timer_name(self, text: str) -> str:
+        """Extract timer name from a command with its duration already removed."""
+        text = text.strip()
+
+        # Look for words after the last "for", "called", "named" or "label"
+        for marker in reversed(list(NAME_MARKER_PATTERN.finditer(text))):
+            name = clean_name(text[marker.end():])
+            if name:
+                return name
 
         # Look for words that could be a name (excluding command words and time units)
         words = text.lower().split()
-        exclude_words = (set(self.time_multipliers.keys()) | 
-                        self.create_indicators | 
-                        self.pause_indicators | 
-                        self.resume_indicators | 
-                        self.stop_indicators |
-                        self.list_indicators |
-                        {'a', 'an', 'the', 'timer', 'for', 'called', 'named', 'set'})
-
-        potential_names = [w for w in words if w not in exclude_words]
+        potential_names = [w for w in words if w not in self._name_excluded_words]
         if potential_names:
             return " ".join(potential_names)
 
         # Default to "timer" if no name found
         return "timer"
 
+    def _classify(self, tokens: List[re.Match], words: List[str]) -> Tuple[Optional[str], int, bool, bool]:
+        """Find the command word in one pass over a command's words.
+
+        `tokens` are the TOKEN_PATTERN matches of the command and `words`
+        their text. Returns the intent of the first indicator that isn't a
+        create one (None if there is none) and the offset where its phrase
+        ends, whether a create indicator came before it, and whether the
+        text mentions all timers. Indicator phrases match whole words,
+        longest first, and the scan stops at the first one that decides the
+        command.
+        """
+        everything = not ALL_WORDS.isdisjoint(words)
+        create_first = False
+        position = 0
+        count = len(words)
+        while position < count:
+            node = self._indicator_trie.get(words[position])
+            if node is None:
+                position += 1
+                continue
+            match = None
+            last = position
+            while node is not None:
+                if PHRASE_END in node:
+                    match = (node[PHRASE_END], last)
+                last += 1
+                if last == count:
+                    break
+                node = node.get(words[last])
+            if match is None:
+                position += 1
+                continue
+            intent, last = match
+            if intent != "create":
+                # Offset just past the phrase's last word
+                return intent, tokens[last].end(), create_first, everything
+            create_first = True
+            position = last + 1
+
+        return None, 0, False, everything
+
+    def _bulk_command(self, text: str) -> Optional[Dict]:
+        """A command on many timers at once, or None if `text` isn't one."""
+        match = BULK_PATTERN.match(text)
+        if not match:
+            return None
+        verb = match.group('verb')
+        # "stop" is also a pause word, but "stop all ..." means stop
+        for command_type, indicators in [("delete", self.delete_indicators),
+                                         ("stop", self.stop_indicators),
+                                         ("pause", self.pause_indicators),
+                                         ("resume", self.resume_indicators)]:
+            if verb in indicators:
+                break
+        else:
+            return None
+
+        command = {"type": command_type}
+        tag = match.group('tagged') or match.group('tag')
+        if tag:
+            command["tag"] = tag
+        if match.group('pattern'):
+            command["pattern"] = match.group('pattern')
+        if command_type == "delete" and len(command) == 1:
+            return {"type": "clear"}
+        return command
+
+    def _recurring_command(self, text: str) -> Optional[Dict]:
+        """A recurring timer, or None if `text` doesn't describe one."""
+        match = CRON_PATTERN.match(text)
+        if match:
+            return {"type": "recurring", "name": match.group('name'), "cron": match.group('expression')}
+
+        match = EVERY_PATTERN.search(text)
+        if not match:
+            return None
+        command = {"type": "recurring"}
+        end = match.end()
+        if match.group('hour') is not None:
+            hour, minute = int(match.group('hour')), int(match.group('minute') or 0)
+            if match.group('half') == 'pm' and hour < 12:
+                hour += 12
+            elif match.group('half') == 'am' and hour == 12:
+                hour = 0
+            if hour > 23 or minute > 59:
+                return None
+            weekdays = match.group('days') == 'weekday' or match.group('weekdays')
+            command["cron"] = f"{minute} {hour} * * {'1-5' if weekdays else '*'}"
+        elif match.group('unit'):
+            command["every"] = UNIT_SECONDS[match.group('unit')]
+        else:
+            # "every <duration>", e.g. "every 30 minutes" or "every 1h 30m"
+            seconds = 0
+            position = end
+            while True:
+                duration = DURATION_PATTERN.match(text, position)
+                if not duration:
+                    break
+                seconds += self._scan_duration(duration.group())[0] or 0
+                end = duration.end()
+                position = end + len(text[end:]) - len(text[end:].lstrip())
+            if not seconds:
+                return None
+            command["every"] = seconds
+        rest = text[:match.start()] + ' ' + text[end:]
+
+        count = COUNT_PATTERN.search(rest)
+        if count:
+            command["count"] = int(count.group('count') or (1 if count.group('once') == 'once' else 2))
+            rest = rest[:count.start()] + rest[count.end():]
+
+        reminder = REMINDER_PATTERN.search(rest)
+        if reminder:
+            command["name"] = reminder.group('name').strip()
+        else:
+            command["name"] = self._extract_timer_name(rest)
+        return command
+
+    def _target(self, command_type: str, name: str) -> Dict:
+        """A single-timer command, or a pattern command if the name has wildcards."""
+        if GLOB_CHARS.search(name):
+            return {"type": command_type, "pattern": name}
+        return {"type": command_type, "name": name}
+
+    def _snooze_command(self, rest: str) -> Dict:
+        """Snooze the timer named in `rest`, for a duration if it gives one."""
+        seconds, spans = self._scan_duration(rest)
+        for begin, end in reversed(spans):
+            rest = rest[:begin] + ' ' + rest[end:]
+        name = clean_name(rest)
+        # "snooze tea for 5 minutes" leaves "tea for"
+        if name.endswith(' for'):
+            name = name[:-4]
+        command = {"type": "snooze", "name": name or "timer"}
+        if seconds:
+            command["seconds"] = seconds
+        return command
+
     def interpret(self, text: str) -> Optional[Dict]:
         """Interpret the natural language command and return a structured command."""
-        text = text.lower().strip()
-
-        # Check for list command
-        if any(indicator in text for indicator in self.list_indicators):
-            return {"type": "list"}
-        
-        # Check for clear all timers command
-        if any(word in text for word in ['clear', 'delete', 'remove']) and any(word in text for word in ['all', 'everything', 'timers']):
-            return {"type": "clear"}
+        # Commands repeat a lot, so parses are cached on the normalized text
+        result = self._interpret_cached(' '.join(text.lower().split()))
+        return dict(result) if result else None
+
+    def _interpret(self, text: str) -> Optional[Dict]:
+        tokens = list(TOKEN_PATTERN.finditer(text))
+        words = [token[0] for token in tokens]
+
+        # Check for commands on groups of timers ("pause all ...")
+        if len(words) > 1 and words[1] in BULK_WORDS:
+            command = self._bulk_command(text)
+            if command:
+                return command
 
-        # Check for delete commands first (more specific)
-        if any(indicator in text for indicator in self.delete_indicators):
-            for indicator in self.delete_indicators:
-                if indicator in text:
-                    parts = text.split(indicator, 1)
-                    if len(parts) > 1:
-                        name = parts[1].strip()
-                        name = re.sub(r'^(the|a|an)\s+', '', name)
-                        name = name.replace('timer', '').strip()
-                        if name:
-                            return {"type": "delete", "name": name}
-                    return {"type": "delete", "name": "timer"}
-
-        # Check for pause/resume/stop commands
-        for command_type, indicators in [
-            ("pause", self.pause_indicators),
-            ("resume", self.resume_indicators),
-            ("stop", self.stop_indicators)
-        ]:
-            if any(indicator in text for indicator in indicators):
-                # Extract timer name (everything after the command word)
-                for indicator in indicators:
-                    if indicator in text:
-                        parts = text.split(indicator, 1)
-                        if len(parts) > 1:
-                            name = parts[1].strip()
-                            name = re.sub(r'^(the|a|an)\s+', '', name)
-                            name = name.replace('timer', '').strip()
-                            if name:
-                                return {"type": command_type, "name": name}
-                        return {"type": command_type, "name": "timer"}
+        intent, end, create_first, everything = self._classify(tokens, words)
+        # "every ..." in a control command names an existing timer
+        # ("cancel the every 30 minutes reminder"), so only creates recur
+        if (not RECURRING_WORDS.isdisjoint(words) and
+                (intent is None or create_first or RECURRING_START_PATTERN.match(text))):
+            command = self._recurring_command(text)
+            if command:
+                return command
+        scanned = self._scan_duration(text) if create_first else None
+        if intent is not None and not (scanned and scanned[0]):
+            if intent == "list":
+                return {"type": "list"}
+            if intent == "delete" and everything:
+                return {"type": "clear"}
+            if intent == "snooze":
+                return self._snooze_command(text[end:])
+            # The timer name is whatever follows the command word
+            name = clean_name(text[end:])
+            return self._target(intent, name or "timer")
 
         # Handle create/start command
-        duration = self._extract_duration(text)
+        tags = tuple(TAG_PATTERN.findall(text)) if '#' in text or 'tagged' in words else ()
+        if tags:
+            text = TAG_PATTERN.sub(' ', text)
+            scanned = None
+        duration, spans = scanned or self._scan_duration(text)
         if duration:
-            # Find the text that contains the duration
-            duration_text = text  # Default to full text if we can't isolate duration part
-
-            # Try to find the exact duration text that matched
-            for unit in self.time_multipliers.keys():
-                if unit in text:
-                    # Find the number (word or digit) before the unit
-                    match = re.search(rf'(\d+|\w+)\s*{unit}', text)
-                    if match:
-                        duration_text = match.group(0)
-                        break
-
-            name = self._extract_timer_name(text, duration_text)
-            return {"type": "create", "name": name, "duration": duration}
+            # Cut the duration phrases out, leaving the rest for the name
+            pieces = []
+            position = 0
+            for begin, end in spans:
+                pieces.append(text[position:begin])
+                position = end
+            pieces.append(text[position:])
+            name = self._extract_timer_name(' '.join(pieces))
+            command = {"type": "create", "name": name, "duration": duration}
+            if tags:
+                command["tags"] = tags
+            return command
 
         return None
\ No newline at end of file
@@ -11,6 +11,7 @@ start <name>           - Start a timer
 pause <name>          - Pause a running timer
 resume <name>         - Resume a paused timer
 stop <name>           - Stop a timer
+snooze <name> [time]  - Silence a finished timer's alert for a while (default 5m)
 delete <name>         - Delete a timer
 list                  - List all timers
 help                  - Show this help message
@@ -77,5 +78,17 @@ list                  - Shows all timers and their status
         elif command in ["start", "pause", "resume", "stop", "delete"]:
             return {"type": command, "name": name}
 
+        elif command == "snooze":
+            if len(parts) > 3:
+                print("Error: Snooze command takes a name and an optional duration (e.g., snooze tea 5m)")
+                return None
+            if len(parts) == 2:
+                return {"type": "snooze", "name": name}
+
+            duration = self._parse_duration(parts[2])
+            if duration is None:
+                return None
+            return {"type": "snooze", "name": name, "seconds": duration}
+
         print(f"Unknown command: {command}")
         return None
\ No newline at end of file
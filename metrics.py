@@ -0,0 +1,242 @@
+"""Runtime metrics with Prometheus text export.
+
+Metrics are off unless TimerManager.enable_metrics() is called; until then
+each instrumentation point costs a single `is None` check. Gauges that
+describe current state (timers by state, threads) are computed when the
+metrics are scraped rather than maintained on every change.
+
+    metrics = manager.enable_metrics()
+    server = MetricsServer(metrics.registry, port=9464)
+    server.start()   # http://127.0.0.1:9464/metrics
+"""
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Bucket upper bounds in seconds, from sub-millisecond callbacks to late timers
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def escape_label_value(value) -> str:
+    """Escape backslashes, quotes and newlines as the text format requires."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """(suffix, label text, value) for each exported series."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {format_value(value)}")
+        return '\n'.join(lines)
+
+class Counter(Metric):
+    """Monotonically increasing count, optionally split by label values."""
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [('', format_labels(self.labels, key), value) for key, value in values]
+
+class Gauge(Metric):
+    """Current value, either set directly or read from a function at scrape time.
+
+    A function may return a number, or a dict of {label value tuple: number}
+    for a labelled gauge.
+    """
+    kind = 'gauge'
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (),
+                 function: Optional[Callable[[], object]] = None):
+        super().__init__(name, help, labels)
+        self.function = function
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        if self.function is not None:
+            values = self.function()
+            if not isinstance(values, dict):
+                values = {(): values}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [('', format_labels(self.labels, key), value) for key, value in sorted(values.items())]
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        samples = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            samples.append(('_bucket', format_labels((), (), f'le="{format_value(bound)}"'), cumulative))
+        samples.append(('_sum', '', total))
+        samples.append(('_count', '', count))
+        return samples
+
+class MetricsRegistry:
+    """A named collection of metrics that renders the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Iterable[str] = (),
+              function: Optional[Callable[[], object]] = None) -> Gauge:
+        return self.register(Gauge(name, help, labels, function))
+
+    def histogram(self, name: str, help: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, buckets))
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+class MetricsServer:
+    """Serve a registry at http://host:port/metrics from a background thread.
+
+    Scrapes run on the server's own threads and only take the metrics'
+    short locks, so timer work is never blocked on a slow client.
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = '127.0.0.1', port: int = 9464):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _handler(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        # Port 0 picks a free port
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+class TimerMetrics:
+    """The metrics a TimerManager and its AlertManager report."""
+
+    def __init__(self, manager, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        registry = self.registry
+        self.commands = registry.counter(
+            'timer_commands_total', "Commands run through execute_command, by type", ('type',))
+        self.command_seconds = registry.histogram(
+            'timer_execute_command_seconds', "execute_command latency")
+        self.lateness = registry.histogram(
+            'timer_firing_lateness_seconds', "How late timers completed after their deadline")
+        self.callback_seconds = registry.histogram(
+            'timer_event_callback_seconds', "Time spent in each event subscriber callback")
+        self.beeps = registry.counter('timer_alert_beeps_total', "Alert beeps played")
+        registry.gauge('timer_timers', "Timers by state", ('state',),
+                       lambda: {(state,): count for state, count in manager.timer_counts().items()})
+        alerts = manager.alert_manager
+        registry.gauge('timer_alerts_active', "Timers currently alerting",
+                       function=lambda: len(alerts.active_alerts))
+        registry.gauge('timer_alert_threads', "Alert audio engine threads alive",
+                       function=alerts.thread_count)
+        registry.gauge('timer_threads', "Threads alive in the process",
+                       function=threading.active_count)
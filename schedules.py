@@ -0,0 +1,206 @@
+"""Recurrence rules for repeating timers.
+
+A schedule only computes wall-clock fire times. TimerManager keeps one
+timer per schedule and, each time it fires, counts down to the next time
+the schedule gives, so repetitions cost no new timer or thread.
+
+    Every(30 * 60)                # every 30 minutes, forever
+    Every(60, count=5)            # every minute, five times
+    Cron("30 9 * * 1-5")          # 9:30 on weekdays, local time
+
+Cron expressions have the usual five fields (minute, hour, day of month,
+month, day of week with 0 or 7 for Sunday) and accept *, lists, ranges and
+/steps, plus @hourly, @daily, @weekly and @monthly.
+
+When several occurrences are missed (the machine slept, or the process was
+busy), at most `catch_up` of them fire late and the rest are skipped.
+"""
+import math
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from timer_manager import format_time
+
+class Schedule:
+    """Base class: when a recurring timer fires, and how many times."""
+
+    def __init__(self, count: Optional[int] = None, catch_up: int = 1):
+        if count is not None and count < 1:
+            raise ValueError("count must be at least 1")
+        if catch_up < 1:
+            raise ValueError("catch_up must be at least 1")
+        self.count = count
+        self.catch_up = catch_up
+        self.fired = 0
+        # Wall-clock time of the next occurrence, None when finished
+        self.due: Optional[float] = None
+
+    def next_after(self, when: float) -> Optional[float]:
+        """The first occurrence strictly after wall-clock time `when`."""
+        raise NotImplementedError
+
+    @property
+    def finished(self) -> bool:
+        return self.count is not None and self.fired >= self.count
+
+    def start(self, now: float) -> Optional[float]:
+        """Begin (or restart) the schedule at `now` and return the first due time."""
+        self.fired = 0
+        self.due = self.next_after(now)
+        return self.due
+
+    def advance(self, now: float) -> Tuple[List[float], Optional[float]]:
+        """Consume the occurrences due by `now`.
+
+        Returns the due times that should fire, at most `catch_up` of them,
+        and the next due time (None once `count` fires have happened).
+        Occurrences beyond the catch-up limit are skipped.
+        """
+        fires = []
+        due = self.due
+        while due is not None and due <= now:
+            if len(fires) == self.catch_up:
+                due = self.next_after(now)
+                break
+            fires.append(due)
+            self.fired += 1
+            due = None if self.finished else self.next_after(due)
+        self.due = due
+        return fires, due
+
+    def spec(self) -> Dict[str, object]:
+        """The schedule and its progress as plain data, for from_spec()."""
+        return {'count': self.count, 'catch_up': self.catch_up, 'fired': self.fired, 'due': self.due}
+
+class Every(Schedule):
+    """Fire every `interval` seconds, counted from when the schedule starts."""
+
+    def __init__(self, interval: float, count: Optional[int] = None, catch_up: int = 1):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        super().__init__(count, catch_up)
+        self.interval = interval
+        self.anchor = 0.0
+
+    def start(self, now: float) -> Optional[float]:
+        self.anchor = now
+        return super().start(now)
+
+    def next_after(self, when: float) -> Optional[float]:
+        steps = math.floor((when - self.anchor) / self.interval) + 1
+        return self.anchor + max(steps, 1) * self.interval
+
+    def spec(self) -> Dict[str, object]:
+        return dict(super().spec(), every=self.interval, anchor=self.anchor)
+
+    def __str__(self) -> str:
+        return f"every {format_time(self.interval)}"
+
+CRON_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+
+# (name, lowest, highest) of each cron field
+CRON_FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day of month', 1, 31),
+               ('month', 1, 12), ('day of week', 0, 7))
+
+# Give up looking for a match after this many days, e.g. for "0 0 30 2 *"
+CRON_SEARCH_DAYS = 366 * 8
+
+def parse_cron_field(text: str, name: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(','):
+        span, _, step_text = part.partition('/')
+        try:
+            step = int(step_text) if step_text else 1
+            if span == '*':
+                start, end = low, high
+            elif '-' in span:
+                first, last = span.split('-', 1)
+                start, end = int(first), int(last)
+            else:
+                start = int(span)
+                end = high if step_text else start
+        except ValueError:
+            raise ValueError(f"Invalid cron {name} field: '{text}'") from None
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Invalid cron {name} field: '{text}'")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+class Cron(Schedule):
+    """Fire at the local times matching a five-field cron expression."""
+
+    def __init__(self, expression: str, count: Optional[int] = None, catch_up: int = 1):
+        super().__init__(count, catch_up)
+        self.expression = expression.strip()
+        fields = CRON_ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+        minutes, hours, days, months, weekdays = (
+            parse_cron_field(text, *spec) for text, spec in zip(fields, CRON_FIELDS))
+        self.minutes = sorted(minutes)
+        self.hours = hours
+        self.days = days
+        self.months = months
+        # Python counts weekdays from Monday=0, cron from Sunday=0 (or 7)
+        self.weekdays = frozenset((day - 1) % 7 for day in weekdays)
+        # With both day fields restricted, either may match (as in cron)
+        self.any_day = fields[2] != '*' and fields[4] != '*'
+        self.all_days = fields[2] == '*' and fields[4] == '*'
+
+    def _day_matches(self, moment: datetime) -> bool:
+        if self.all_days:
+            return True
+        in_month = moment.day in self.days
+        in_week = moment.weekday() in self.weekdays
+        if self.any_day:
+            return in_month or in_week
+        return in_month and in_week
+
+    def next_after(self, when: float) -> Optional[float]:
+        moment = datetime.fromtimestamp(when).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=CRON_SEARCH_DAYS)
+        while moment < limit:
+            if moment.month not in self.months:
+                year, month = divmod(moment.year * 12 + moment.month, 12)
+                moment = datetime(year, month + 1, 1)
+                continue
+            if not self._day_matches(moment):
+                moment = datetime(moment.year, moment.month, moment.day) + timedelta(days=1)
+                continue
+            if moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+                continue
+            minute = next((m for m in self.minutes if m >= moment.minute), None)
+            if minute is None:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+                continue
+            moment = moment.replace(minute=minute)
+            fire = moment.timestamp()
+            # A repeated hour when clocks go back can map to an earlier time
+            if fire > when:
+                return fire
+            moment += timedelta(minutes=1)
+        return None
+
+    def spec(self) -> Dict[str, object]:
+        return dict(super().spec(), cron=self.expression)
+
+    def __str__(self) -> str:
+        return f"cron {self.expression}"
+
+def from_spec(spec: Dict[str, object]) -> Schedule:
+    """Rebuild a schedule, with its progress, from Schedule.spec()."""
+    if 'cron' in spec:
+        schedule = Cron(spec['cron'], spec['count'], spec['catch_up'])
+    else:
+        schedule = Every(spec['every'], spec['count'], spec['catch_up'])
+        schedule.anchor = spec['anchor']
+    schedule.fired = spec['fired']
+    schedule.due = spec['due']
+    return schedule
@@ -0,0 +1,445 @@
+"""TimerManager spread over worker processes, for workloads that need more than one core.
+
+A TimerManager runs its commands, event callbacks and alerts under one
+interpreter lock. ShardedTimerManager starts one worker process per shard,
+each owning a TimerManager for the timers whose names hash to it, and acts
+as the front-end:
+
+    manager = ShardedTimerManager(shards=4)
+    manager.execute_command({"type": "create", "name": "tea", "duration": 300})
+    manager.execute_commands(commands)    # pipelined, shards work in parallel
+    manager.shutdown()
+
+Commands naming a timer go to its shard. Bulk commands, "list" and
+"clear" go to every shard and their results are merged. Events from the
+shards are forwarded in batches over each shard's pipe and republished on
+the front-end's EventBus, in order for each shard; a shard sends the
+events a command caused before its reply, so they have been published by
+the time the call returns. A bulk command publishes one TimersUpdated per
+shard it changed timers in, while "clear" publishes a single TimersCleared
+for all shards. Event callbacks run on the front-end's
+receiver thread and must not call the manager, which would wait for that
+thread.
+
+Names are assigned to shards by consistent hashing, so a timer always
+lives on the same shard.
+"""
+import bisect
+import collections
+import hashlib
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+from typing import Callable, Dict, Iterable, List, Optional
+
+from timer_manager import (BULK_VERBS, EventBus, OutputAdapter, Subscription, TimerEvent,
+                           TimerManager, TimersCleared)
+
+# Points per shard on the hash ring; more spreads names more evenly
+RING_REPLICAS = 64
+
+def ring_hash(key: str) -> int:
+    """A hash that is the same in every process (unlike hash())."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+
+class HashRing:
+    """Consistent hashing of timer names onto shards."""
+
+    def __init__(self, shards: Iterable[int], replicas: int = RING_REPLICAS):
+        points = sorted((ring_hash(f"{shard}:{replica}"), shard)
+                        for shard in shards for replica in range(replicas))
+        self._hashes = [point for point, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, name: str) -> int:
+        index = bisect.bisect(self._hashes, ring_hash(name))
+        return self._shards[index % len(self._shards)]
+
+class ShardWorker:
+    """Runs in a shard process: executes the front-end's calls on its
+    TimerManager and forwards events and messages back."""
+
+    def __init__(self, conn, engine: str, resolution: float):
+        self.conn = conn
+        self.manager = TimerManager(engine, resolution)
+        # Events and plain messages waiting to be sent, oldest first
+        self.pending = collections.deque()
+        self._send_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closing = False
+        # Set while a call runs; its events go out with the reply
+        self._busy = False
+        self.manager.set_output_callback(self._forward, include_events=False)
+        self.manager.events.subscribe(self._forward)
+
+    def _forward(self, item) -> None:
+        if isinstance(item, TimersCleared):
+            # op_clear returns the names and the front-end announces them
+            return
+        self.pending.append(item)
+        if not self._busy and not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def _flush(self) -> None:
+        """Send everything pending in one message. Call with _send_lock held."""
+        items = []
+        pending = self.pending
+        while pending:
+            items.append(pending.popleft())
+        if items:
+            self.conn.send(('events', items))
+
+    def _run_flusher(self) -> None:
+        # Events from the scheduler thread; the main thread flushes its own
+        # before each reply
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._closing:
+                return
+            with self._send_lock:
+                self._flush()
+
+    def serve(self) -> None:
+        threading.Thread(target=self._run_flusher, daemon=True, name="shard-events").start()
+        try:
+            while True:
+                try:
+                    call_id, op, args = self.conn.recv()
+                except EOFError:
+                    break
+                if op == 'shutdown':
+                    break
+                self._busy = True
+                try:
+                    result, error = getattr(self, f"op_{op}")(*args), None
+                except Exception as e:
+                    result, error = None, e
+                with self._send_lock:
+                    self._flush()
+                    self.conn.send(('reply', call_id, result, error))
+                self._busy = False
+                # An event from the scheduler thread may have arrived since the flush
+                if self.pending:
+                    self._wakeup.set()
+        finally:
+            self._closing = True
+            self._wakeup.set()
+            self.manager.shutdown()
+
+    def op_ping(self) -> str:
+        return 'pong'
+
+    def op_execute(self, command: dict):
+        return self.manager.execute_command(command)
+
+    def op_batch(self, commands: List[dict]) -> list:
+        results = []
+        for command in commands:
+            try:
+                results.append(self.manager.execute_command(command))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def op_bulk(self, action: str, tag: Optional[str], pattern: Optional[str]) -> List[str]:
+        # The front-end prints one "No timers to ..." for all shards
+        return getattr(self.manager, f"{action}_timers")(tag, pattern, quiet=True)
+
+    def op_list(self) -> int:
+        if self.manager.timers:
+            self.manager.list_timers()
+        return len(self.manager.timers)
+
+    def op_clear(self) -> List[str]:
+        names = self.manager.timers.keys()
+        if names:
+            self.manager.clear_all_timers()
+        return names
+
+    def op_create_recurring(self, name: str, schedule, tags) -> None:
+        self.manager.create_recurring(name, schedule, tags)
+
+    def op_select(self, tag: Optional[str], pattern: Optional[str]) -> List[str]:
+        return self.manager.select(tag, pattern)
+
+    def op_timer_counts(self) -> Dict[str, int]:
+        return self.manager.timer_counts()
+
+    def op_expiring_within(self, seconds: float) -> List[str]:
+        return self.manager.expiring_within(seconds)
+
+    def op_snapshot(self) -> List[Dict[str, object]]:
+        return [timer.to_dict() for timer in self.manager.timers.values()]
+
+def run_shard(conn, engine: str, resolution: float) -> None:
+    """Entry point of a shard process."""
+    ShardWorker(conn, engine, resolution).serve()
+
+class ShardedTimerManager:
+    def __init__(self, shards: Optional[int] = None, engine: str = "heap", resolution: float = 0.01):
+        """Start `shards` worker processes (default: one per CPU), each with
+        a TimerManager using `engine` and `resolution`."""
+        shards = shards or os.cpu_count() or 1
+        self.ring = HashRing(range(shards))
+        self.output_callback = None
+        self.events = EventBus()
+        self._publish = self.events.publish
+        self.output_adapter: Optional[Subscription] = self.events.subscribe(OutputAdapter(self._print))
+
+        # Spawn rather than fork: the front-end may already be running threads
+        context = multiprocessing.get_context('spawn')
+        self._conns = []
+        self._processes = []
+        for index in range(shards):
+            conn, child = context.Pipe()
+            process = context.Process(target=run_shard, args=(child, engine, resolution),
+                                      daemon=True, name=f"timer-shard-{index}")
+            process.start()
+            child.close()
+            self._conns.append(conn)
+            self._processes.append(process)
+        self._send_locks = [threading.Lock() for _ in range(shards)]
+        self._call_ids = itertools.count()
+        # Calls awaiting a reply: call id -> (shard, future), and the shards
+        # that have exited; both guarded by _replies_lock
+        self._replies: Dict[int, tuple] = {}
+        self._dead_shards = set()
+        self._replies_lock = threading.Lock()
+        self._closed = False
+        self._receiver = threading.Thread(target=self._receive, daemon=True, name="shard-receiver")
+        self._receiver.start()
+        # Return once every shard is up, so the first command isn't slow
+        self._call_all('ping')
+
+    @property
+    def shards(self) -> int:
+        return len(self._conns)
+
+    def shard_for(self, name: str) -> int:
+        return self.ring.shard_for(name)
+
+    def set_output_callback(self, callback: Callable[[str], None], include_events: bool = True):
+        """Set callback for timer output, as TimerManager.set_output_callback."""
+        self.output_callback = callback
+        if include_events and self.output_adapter is None:
+            self.output_adapter = self.events.subscribe(OutputAdapter(self._print))
+        elif not include_events:
+            self.events.unsubscribe(self.output_adapter)
+            self.output_adapter = None
+
+    def _print(self, message: str):
+        if self.output_callback:
+            self.output_callback(message)
+        else:
+            print(message)
+
+    def _receive(self) -> None:
+        """Publish forwarded events and complete replies, for every shard."""
+        conns = list(self._conns)
+        while conns:
+            for conn in wait(conns):
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    conns.remove(conn)
+                    self._fail_calls(conn)
+                    continue
+                if message[0] == 'events':
+                    for item in message[1]:
+                        if isinstance(item, TimerEvent):
+                            self._publish(item)
+                        else:
+                            self._print(item)
+                else:
+                    _, call_id, result, error = message
+                    with self._replies_lock:
+                        _, future = self._replies.pop(call_id)
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(result)
+
+    def _fail_calls(self, conn) -> None:
+        shard = self._conns.index(conn)
+        with self._replies_lock:
+            self._dead_shards.add(shard)
+            failed = [self._replies.pop(call_id)[1]
+                      for call_id, (call_shard, _) in list(self._replies.items()) if call_shard == shard]
+        for future in failed:
+            future.set_exception(ConnectionError(f"Timer shard {shard} exited"))
+
+    def _call(self, shard: int, op: str, *args) -> Future:
+        """Send one call to a shard; the future completes with its reply."""
+        if self._closed:
+            raise RuntimeError("ShardedTimerManager is shut down")
+        call_id = next(self._call_ids)
+        future = Future()
+        # Checked and registered together, so _fail_calls can't slip in between
+        with self._replies_lock:
+            if shard in self._dead_shards:
+                raise ConnectionError(f"Timer shard {shard} exited")
+            self._replies[call_id] = (shard, future)
+        try:
+            with self._send_locks[shard]:
+                self._conns[shard].send((call_id, op, args))
+        except OSError:
+            with self._replies_lock:
+                self._replies.pop(call_id, None)
+            raise
+        return future
+
+    def _call_all(self, op: str, *args) -> list:
+        """Send a call to every shard at once and wait for all the results."""
+        futures = [self._call(shard, op, *args) for shard in range(self.shards)]
+        return [future.result() for future in futures]
+
+    def execute_command(self, command: dict) -> Optional[List[str]]:
+        """Run a command dict, as TimerManager.execute_command."""
+        cmd_type = command["type"]
+        if "name" in command:
+            return self._call(self.shard_for(command["name"]), 'execute', command).result()
+        if cmd_type in BULK_VERBS:
+            return self._bulk(cmd_type, command.get("tag"), command.get("pattern"))
+        if cmd_type == "list":
+            self.list_timers()
+        elif cmd_type == "clear":
+            self.clear_all_timers()
+        return None
+
+    def execute_commands(self, commands: Iterable[dict]) -> list:
+        """Run many commands, sending each shard its share in one message.
+
+        Commands on the same shard run in order, and a command for every
+        shard waits for those before it. Returns the results in order; a
+        command that failed has its exception in place of its result.
+        """
+        results = []
+        # Per shard, the commands to send and their positions in results
+        batches: Dict[int, List[dict]] = {}
+        slots: Dict[int, List[int]] = {}
+
+        def send_batches():
+            futures = [(self._call(shard, 'batch', batch), shard) for shard, batch in batches.items()]
+            positions = {shard: iter(slots[shard]) for shard in batches}
+            for future, shard in futures:
+                for position, result in zip(positions[shard], future.result()):
+                    results[position] = result
+            batches.clear()
+            slots.clear()
+
+        for command in commands:
+            if "name" in command:
+                shard = self.shard_for(command["name"])
+                batches.setdefault(shard, []).append(command)
+                slots.setdefault(shard, []).append(len(results))
+                results.append(None)
+                continue
+            send_batches()
+            try:
+                results.append(self.execute_command(command))
+            except Exception as e:
+                results.append(e)
+        send_batches()
+        return results
+
+    def create_timer(self, name: str, duration: int, tags: Iterable[str] = ()) -> None:
+        self.execute_command({"type": "create", "name": name, "duration": duration, "tags": tuple(tags)})
+
+    def create_recurring(self, name: str, schedule, tags: Iterable[str] = ()) -> None:
+        self._call(self.shard_for(name), 'create_recurring', name, schedule, tuple(tags)).result()
+
+    def start_timer(self, name: str) -> None:
+        self.execute_command({"type": "start", "name": name})
+
+    def pause_timer(self, name: str) -> None:
+        self.execute_command({"type": "pause", "name": name})
+
+    def resume_timer(self, name: str) -> None:
+        self.execute_command({"type": "resume", "name": name})
+
+    def stop_timer(self, name: str) -> None:
+        self.execute_command({"type": "stop", "name": name})
+
+    def snooze_timer(self, name: str, seconds: Optional[float] = None) -> None:
+        self.execute_command({"type": "snooze", "name": name, "seconds": seconds})
+
+    def delete_timer(self, name: str) -> None:
+        self.execute_command({"type": "delete", "name": name})
+
+    def _bulk(self, action: str, tag: Optional[str], pattern: Optional[str]) -> List[str]:
+        changed = sorted(itertools.chain.from_iterable(self._call_all('bulk', action, tag, pattern)))
+        if not changed:
+            self._print(f"No timers to {action}")
+        return changed
+
+    def pause_timers(self, tag: Optional[str] = None, pattern: Optional[str] = None) -> List[str]:
+        return self._bulk('pause', tag, pattern)
+
+    def resume_timers(self, tag: Optional[str] = None, pattern: Optional[str] = None) -> List[str]:
+        return self._bulk('resume', tag, pattern)
+
+    def stop_timers(self, tag: Optional[str] = None, pattern: Optional[str] = None) -> List[str]:
+        return self._bulk('stop', tag, pattern)
+
+    def delete_timers(self, tag: Optional[str] = None, pattern: Optional[str] = None) -> List[str]:
+        return self._bulk('delete', tag, pattern)
+
+    def stop_all_timers(self) -> None:
+        self.stop_timers()
+
+    def list_timers(self) -> None:
+        if not sum(self._call_all('list')):
+            self._print("No active timers")
+
+    def clear_all_timers(self) -> None:
+        names = list(itertools.chain.from_iterable(self._call_all('clear')))
+        if names:
+            self._publish(TimersCleared(names))
+        else:
+            self._print("No timers to clear")
+
+    def select(self, tag: Optional[str] = None, pattern: Optional[str] = None) -> List[str]:
+        """Sorted names of the selected timers on every shard (see TimerManager.select)."""
+        return sorted(itertools.chain.from_iterable(self._call_all('select', tag, pattern)))
+
+    def timer_counts(self) -> Dict[str, int]:
+        totals = collections.Counter()
+        for counts in self._call_all('timer_counts'):
+            totals.update(counts)
+        return dict(totals)
+
+    def expiring_within(self, seconds: float) -> List[str]:
+        return list(itertools.chain.from_iterable(self._call_all('expiring_within', seconds)))
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        """Every timer's to_dict(), from all shards."""
+        return list(itertools.chain.from_iterable(self._call_all('snapshot')))
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the shard processes; their timers are discarded."""
+        if self._closed:
+            return
+        self._closed = True
+        for shard, conn in enumerate(self._conns):
+            try:
+                with self._send_locks[shard]:
+                    conn.send((None, 'shutdown', ()))
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._receiver.join(timeout)
+        for conn in self._conns:
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
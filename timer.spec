@@ -15,7 +15,7 @@ a = Analysis(
         ('C:/Program Files (x86)/sox-14.4.2/libgomp-1.dll', '.'),
     ],
     datas=[],
-    hiddenimports=['tkinter', 'word2number'],
+    hiddenimports=['tkinter'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -1,11 +1,291 @@
+from startup_profile import profile
+import argparse
 import tkinter as tk
 from tkinter import ttk
-import re
-from timer_manager import TimerManager
-from command_interpreter import CommandInterpreter
+import itertools
+import os
+import queue
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from timer_manager import (TimerManager, TimerEvent, TimerCreated, TimerTick, TimerPaused,
+                           TimerResumed, TimerCompleted, TimerSnoozed, TimerStopped, TimerDeleted,
+                           TimersCleared, TimersUpdated, format_event, format_time)
+
+class UIUpdateQueue:
+    """Thread-safe hand-off of timer events and messages to the Tk main loop.
+
+    Any thread may push. The main loop drains once per frame, keeping log
+    lines in order but only the newest display state for each timer.
+    """
+
+    def __init__(self, max_events_per_frame: int = 20000):
+        self._queue = queue.SimpleQueue()
+        self.max_events_per_frame = max_events_per_frame
+        self.started = time.perf_counter()
+        self.events = 0
+        self.frames = 0
+        self.frame_time = 0.0
+        self.max_frame_time = 0.0
+
+    def push(self, item) -> None:
+        """Queue a TimerEvent or a plain message string."""
+        self._queue.put(item)
+
+    def drain(self) -> Tuple[Dict[str, Optional[Tuple[str, str, float]]], List[str]]:
+        """Return ({timer name: (time text, status, seconds left) or None to remove}, [log lines])."""
+        updates: Dict[str, Optional[Tuple[str, str, float]]] = {}
+        lines: List[str] = []
+        get = self._queue.get_nowait
+        count = 0
+        while count < self.max_events_per_frame:
+            try:
+                item = get()
+            except queue.Empty:
+                break
+            count += 1
+            if not isinstance(item, TimerEvent):
+                lines.append(item)
+                continue
+
+            event_type = type(item)
+            name = item.name
+            if event_type is TimerTick:
+                updates[name] = (item.display, "paused" if item.paused else "running", item.remaining)
+            elif event_type is TimerPaused:
+                updates[name] = (format_time(item.remaining), "paused", item.remaining)
+            elif event_type is TimerResumed:
+                updates[name] = (format_time(item.remaining), "running", item.remaining)
+            elif event_type is TimerCompleted:
+                updates[name] = ("Done!", "complete", 0.0)
+                lines.append(f"Timer '{name}' completed!")
+            elif event_type is TimerStopped:
+                updates[name] = ("Done!", "complete", 0.0)
+                if not item.bulk:
+                    lines.append(f"Stopped timer '{name}'")
+            elif event_type is TimerCreated:
+                updates[name] = (format_time(item.duration), "running", float(item.duration))
+                verb = "Refreshed" if item.refreshed else "Created"
+                lines.append(f"{verb} timer '{name}' ({format_time(item.duration)})")
+            elif event_type is TimerDeleted:
+                updates[name] = None
+                if not item.bulk:
+                    lines.append(f"Deleted timer '{name}'")
+            elif event_type is TimersCleared:
+                for cleared in item.names:
+                    updates[cleared] = None
+                lines.append(f"Cleared {len(item.names)} timer(s): {', '.join(item.names)}")
+            elif event_type is TimerSnoozed or event_type is TimersUpdated:
+                lines.extend(format_event(item))
+        self.events += count
+        return updates, lines
+
+    def record_frame(self, seconds: float) -> None:
+        self.frames += 1
+        self.frame_time += seconds
+        self.max_frame_time = max(self.max_frame_time, seconds)
+
+    def stats(self) -> Dict[str, float]:
+        """Frame time and throughput since the queue was created."""
+        elapsed = time.perf_counter() - self.started
+        return {
+            'frames': self.frames,
+            'events': self.events,
+            'events_per_sec': self.events / elapsed if elapsed > 0 else 0.0,
+            'mean_frame_ms': 1000 * self.frame_time / self.frames if self.frames else 0.0,
+            'max_frame_ms': 1000 * self.max_frame_time,
+        }
+
+class TimerPanel:
+    """The Active Timers list, one ttk.Treeview row per timer.
+
+    Tk only draws the rows that are scrolled into view, rows are created
+    once per timer, and each frame only reconfigures rows whose text
+    changed. Clicking a column heading sorts by name or by time left;
+    reordering moves the existing rows with a single set_children call.
+    """
+
+    ICONS = {"paused": "⏸️", "running": "⏱️"}
+    # While sorted by time left, running and paused rows drift relative to
+    # each other, so the order is refreshed this often even without changes
+    RESORT_INTERVAL = 1.0
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.rows: Dict[str, Tuple[str, str]] = {}  # name -> (time text, status) shown
+        self.sort_key = "name"
+        self.reverse = False
+        self._iids: Dict[str, str] = {}
+        # Deadline (monotonic) of running timers, or seconds left otherwise
+        self._remaining: Dict[str, Tuple[float, bool]] = {}
+        self._order: List[str] = []
+        self._order_dirty = False
+        self._next_resort = 0.0
+        self._ids = itertools.count()
+
+    @classmethod
+    def create(cls, parent) -> 'TimerPanel':
+        """Build a scrollable Treeview in `parent` and wrap it."""
+        frame = ttk.Frame(parent)
+        frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        tree = ttk.Treeview(frame, columns=("name", "time"), show="headings", selectmode="browse")
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        tree.column("name", anchor="w", stretch=True)
+        tree.column("time", anchor="e", width=70, stretch=False)
+        panel = cls(tree)
+        tree.heading("name", text="Timer", command=lambda: panel.sort_by("name"))
+        tree.heading("time", text="Left", command=lambda: panel.sort_by("remaining"))
+        return panel
+
+    def _key(self, now: float):
+        if self.sort_key == "name":
+            return None
+        remaining = self._remaining
+
+        def seconds_left(name):
+            value, counting = remaining[name]
+            return value - now if counting else value
+        return seconds_left
+
+    def sort_by(self, key: str) -> None:
+        """Sort by "name" or "remaining"; choosing the same key again reverses."""
+        if key == self.sort_key:
+            self.reverse = not self.reverse
+        else:
+            self.sort_key, self.reverse = key, False
+        self._resort(time.monotonic())
+
+    def _resort(self, now: float) -> None:
+        order = sorted(self.rows, key=self._key(now), reverse=self.reverse)
+        if order != self._order:
+            iids = self._iids
+            self.tree.set_children("", *[iids[name] for name in order])
+            self._order = order
+        self._order_dirty = False
+        self._next_resort = now + self.RESORT_INTERVAL
+
+    def apply(self, updates: Dict[str, Optional[Tuple[str, str, float]]]) -> None:
+        """Apply one frame of UIUpdateQueue.drain() updates."""
+        now = time.monotonic()
+        tree = self.tree
+        for name, state in updates.items():
+            if state is None:
+                iid = self._iids.pop(name, None)
+                if iid is not None:
+                    tree.delete(iid)
+                    del self.rows[name]
+                    del self._remaining[name]
+                    self._order_dirty = True
+                continue
+
+            time_str, status, remaining = state
+            counting = status == "running"
+            self._remaining[name] = (now + remaining if counting else remaining, counting)
+            shown = (time_str, status)
+            previous = self.rows.get(name)
+            if previous == shown:
+                continue
+            values = (f"{self.ICONS.get(status, '⚠️')} {name}", time_str)
+            if previous is None:
+                iid = self._iids[name] = f"timer{next(self._ids)}"
+                tree.insert("", "end", iid=iid, values=values)
+                self._order.append(name)
+                self._order_dirty = True
+            else:
+                tree.item(self._iids[name], values=values)
+                if previous[1] != status:
+                    self._order_dirty = True
+            self.rows[name] = shown
+
+        if self._order_dirty or (self.sort_key == "remaining" and now >= self._next_resort):
+            self._order = [name for name in self._order if name in self.rows]
+            self._resort(now)
+
+class RotatingSpill:
+    """Append-only text file that rotates to path.1 ... path.N past max_bytes."""
+
+    def __init__(self, path: str, max_bytes: int = 1024 * 1024, backups: int = 3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = open(path, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        if self._size and self._size + len(text) > self.max_bytes:
+            self._rotate()
+        self._file.write(text)
+        self._file.flush()
+        self._size += len(text)
+
+    def close(self) -> None:
+        self._file.close()
+
+class OutputLog:
+    """The output Text widget, bounded to the last `max_lines` lines.
+
+    Lines arrive once per frame and go in with a single insert. The widget
+    is trimmed from the top in chunks of `trim_chunk` lines, so trimming
+    is rare and insert cost stays flat however long the app runs. `lines`
+    holds the same window as a ring buffer. With a spill, every line is
+    also appended to a rotating file on disk.
+    """
+
+    def __init__(self, widget, max_lines: int = 5000, trim_chunk: int = 500,
+                 spill: Optional[RotatingSpill] = None):
+        self.widget = widget
+        self.max_lines = max_lines
+        self.trim_chunk = trim_chunk
+        self.spill = spill
+        self.lines: Deque[str] = deque(maxlen=max_lines)
+        self._widget_lines = 0
+
+    def append(self, lines: List[str]) -> None:
+        text = "\n".join(lines) + "\n"
+        self.lines.extend(lines)
+        self.widget.insert('end', text)
+        self.widget.see('end')
+        self._widget_lines += text.count("\n")
+        if self._widget_lines >= self.max_lines + self.trim_chunk:
+            excess = self._widget_lines - self.max_lines
+            self.widget.delete('1.0', f"{excess + 1}.0")
+            self._widget_lines -= excess
+        if self.spill is not None:
+            self.spill.write(text)
+
+    def show(self, text: str) -> None:
+        """Replace the widget's contents, e.g. with the help text."""
+        self.widget.delete('1.0', 'end')
+        self.widget.insert('1.0', text)
+        self._widget_lines = text.count("\n")
+
+    def close(self) -> None:
+        if self.spill is not None:
+            self.spill.close()
 
 class TimerApp:
-    def __init__(self):
+    # How often queued timer output is applied to the widgets
+    FRAME_INTERVAL_MS = 50
+    # Lines kept in the output log, and an optional file for the full history
+    LOG_MAX_LINES = 5000
+    LOG_SPILL_PATH: Optional[str] = None
+
+    def __init__(self, exit_after_startup: bool = False):
+        self.exit_after_startup = exit_after_startup
         self.root = tk.Tk()
         self.root.title("Timer Assistant")
         self.root.geometry("800x500")
@@ -13,9 +293,13 @@ class TimerApp:
         # Set theme for better appearance
         style = ttk.Style()
         style.theme_use('clam')
+        profile.mark("tk root")
 
+        # The interpreter, journal and alert backend are loaded after first paint
+        self._command_interpreter = None
+        self.journal = None
         self.timer_manager = TimerManager()
-        self.command_interpreter = CommandInterpreter()
+        profile.mark("timer manager")
 
         # Create main container with left and right panes
         self.paned_window = ttk.PanedWindow(self.root, orient=tk.HORIZONTAL)
@@ -35,14 +319,56 @@ class TimerApp:
         # Set up right pane components
         self.setup_right_pane()
 
-        # Set up timer manager callback
-        self.timer_manager.set_output_callback(self.print_output)
-
-        # Initial help message
-        self.show_help()
+        # Timer events arrive from the scheduler thread and are applied per frame
+        self.ui_queue = UIUpdateQueue()
+        self.timer_manager.set_output_callback(self.print_output, include_events=False)
+        self.timer_manager.events.subscribe(self.ui_queue.push)
+        self.root.after(self.FRAME_INTERVAL_MS, self.drain_ui_queue)
 
         # Set focus to entry
         self.command_entry.focus_set()
+        profile.mark("widgets")
+
+        self._first_paint = self.root.bind('<Map>', self._on_first_map, add='+')
+
+    def _on_first_map(self, event):
+        if event.widget is not self.root:
+            return
+        self.root.unbind('<Map>', self._first_paint)
+        # Idle callbacks run once pending redraws are done, so the window has painted
+        self.root.after_idle(self._finish_startup)
+
+    def _finish_startup(self):
+        """Work deferred until the window is on screen."""
+        profile.mark("first paint")
+        self.show_help()
+
+        # Restore timers from the last session and keep them on disk
+        from timer_journal import Journal, default_journal_dir
+        try:
+            self.journal = Journal(default_journal_dir())
+            self.journal.attach(self.timer_manager)
+        except (OSError, ValueError) as e:
+            self.print_output(f"Could not restore timers: {str(e)}")
+        profile.mark("journal")
+
+        # Load these now rather than on the first command or alert
+        self.command_interpreter
+        profile.mark("interpreter")
+        self.timer_manager.alert_manager.sink
+        profile.mark("alert backend")
+
+        if profile.enabled:
+            profile.report()
+        if self.exit_after_startup:
+            self.root.quit()
+
+    @property
+    def command_interpreter(self):
+        if self._command_interpreter is None:
+            from command_interpreter import CommandInterpreter
+            self._command_interpreter = CommandInterpreter()
+        return self._command_interpreter
 
     def setup_left_pane(self):
         # Input frame
@@ -81,6 +407,8 @@ class TimerApp:
         )
         self.output_text.pack(fill=tk.BOTH, expand=True)
         self.scrollbar.config(command=self.output_text.yview)
+        spill = RotatingSpill(self.LOG_SPILL_PATH) if self.LOG_SPILL_PATH else None
+        self.output_log = OutputLog(self.output_text, self.LOG_MAX_LINES, spill=spill)
         
         # Button frame at bottom of left pane
         button_frame = ttk.Frame(self.left_pane)
@@ -103,12 +431,8 @@ class TimerApp:
         )
         self.timer_label.pack(pady=5)
 
-        # Frame for active timers
-        self.active_timers_frame = ttk.Frame(self.right_pane)
-        self.active_timers_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-
-        # Dictionary to keep track of timer labels
-        self.timer_labels = {}
+        # Scrollable list of active timers
+        self.timer_panel = TimerPanel.create(self.right_pane)
 
     def show_help(self):
         help_text = """Welcome to Timer Assistant!
@@ -121,11 +445,13 @@ Examples:
 - "pause the coffee timer"
 - "show all timers"
 - "stop meeting timer"
+- "create 25 min pomodoro timer tagged work"
+- "pause all work timers"
+- "every 30 minutes remind me to stretch"
 
 The assistant will understand your intent and execute the command.
 """
-        self.output_text.delete('1.0', tk.END)
-        self.output_text.insert('1.0', help_text)
+        self.output_log.show(help_text)
     
     def show_audio_settings(self):
         """Show audio settings window"""
@@ -204,85 +530,36 @@ The assistant will understand your intent and execute the command.
                 interval=int_var.get()
             )
             self.timer_manager.alert_manager.alert_timeout = timeout_var.get()
-            
-            # If there are any active alerts, restart them with new settings
-            active_alerts = list(self.timer_manager.alert_manager.active_alerts.keys())
-            for timer_name in active_alerts:
-                if timer_name in self.timer_manager.alert_manager.active_alerts:
-                    # Stop and restart alert with new settings
-                    self.timer_manager.alert_manager.stop_alert(timer_name)
-                    self.timer_manager.alert_manager.start_alert(timer_name)
+            # Active alerts pick up the new tone on their next beep
             
             self.print_output(f"Audio settings updated! Frequency: {freq_var.get()}Hz, Duration: {dur_var.get()}ms, Interval: {int_var.get():.1f}s, Max Duration: {timeout_var.get()}s")
             settings_window.destroy()
         
         def test_beep():
-            try:
-                if hasattr(self.timer_manager.alert_manager, 'WINSOUND_AVAILABLE') and self.timer_manager.alert_manager.WINSOUND_AVAILABLE:
-                    import winsound
-                    winsound.Beep(freq_var.get(), dur_var.get())
-                else:
-                    print("\a")  # Fallback beep
-            except:
-                print("\a")  # Fallback beep
+            self.timer_manager.alert_manager.play_tone(freq_var.get(), dur_var.get())
         
         ttk.Button(button_frame, text="Test Beep", command=test_beep).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Apply", command=apply_settings).pack(side=tk.RIGHT, padx=5)
         ttk.Button(button_frame, text="Cancel", command=settings_window.destroy).pack(side=tk.RIGHT)
 
-    def update_timer_display(self, name: str, time_str: str, status: str):
-        """Update or create a timer display in the right pane"""
-        if name not in self.timer_labels:
-            # Create new timer frame
-            timer_frame = ttk.Frame(self.active_timers_frame)
-            timer_frame.pack(fill=tk.X, pady=2)
-
-            # Timer name and remaining time
-            label = ttk.Label(
-                timer_frame,
-                font=('Arial', 10),
-                anchor='w'
-            )
-            label.pack(side=tk.LEFT, padx=5)
+    def print_output(self, text):
+        """Queue a message for the output log. Safe to call from any thread."""
+        self.ui_queue.push(text)
 
-            self.timer_labels[name] = {
-                'frame': timer_frame,
-                'label': label
-            }
+    def drain_ui_queue(self):
+        """Apply queued events to the widgets, one configure per timer per frame."""
+        start = time.perf_counter()
+        updates, lines = self.ui_queue.drain()
 
-        # Update label text with status icon
-        status_icon = "⏸️" if status == "paused" else "⏱️" if status == "running" else "⚠️"
-        self.timer_labels[name]['label'].config(
-            text=f"{status_icon} {name}: {time_str}"
-        )
+        if updates:
+            self.timer_panel.apply(updates)
 
-    def remove_timer_display(self, name: str):
-        """Remove a timer display from the right pane"""
-        if name in self.timer_labels:
-            self.timer_labels[name]['frame'].destroy()
-            del self.timer_labels[name]
+        if lines:
+            self.output_log.append(lines)
 
-    def print_output(self, text):
-        """Handle output from timer manager"""
-        # Check if this is a timer update message
-        timer_update = re.match(r'\[(.*?)\]:\s*(.*)', text)
-        if timer_update:
-            name, info = timer_update.groups()
-            if "Complete" in info:
-                status = "complete"
-                self.update_timer_display(name, "Done!", status)
-                self.output_text.insert('end', f"Timer '{name}' completed!\n")
-            else:
-                status = "running"
-                if name in self.timer_labels:
-                    # Check if timer is paused
-                    timer = self.timer_manager.timers.get(name)
-                    if timer and timer.paused:
-                        status = "paused"
-                self.update_timer_display(name, info, status)
-        else:
-            self.output_text.insert('end', f"{text}\n")
-        self.output_text.see('end')
+        if updates or lines:
+            self.ui_queue.record_frame(time.perf_counter() - start)
+        self.root.after(self.FRAME_INTERVAL_MS, self.drain_ui_queue)
 
     def process_command(self, event=None):
         command_text = self.command_var.get().strip()
@@ -315,8 +592,25 @@ The assistant will understand your intent and execute the command.
         self.root.lift()
         self.root.attributes('-topmost', True)
         self.root.attributes('-topmost', False)
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.timer_manager.shutdown()
+            if self.journal is not None:
+                self.journal.close()
+            self.output_log.close()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run Timer Assistant.")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="print import and startup phase timings to stderr")
+    parser.add_argument('--exit-after-startup', action='store_true',
+                        help="quit once startup has finished, for benchmarking")
+    args = parser.parse_args(argv)
+    profile.mark("imports")
+    app = TimerApp(exit_after_startup=args.exit_after_startup)
+    app.run()
+    return 0
 
 if __name__ == "__main__":
-    app = TimerApp()
-    app.run()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""Headless batch mode: stream timer commands from a file or stdin.
+
+Usage: python timer_batch.py [--strict] [--quiet] [--wait] [--shards N] [script | -]
+
+Each non-blank line that doesn't start with '#' is parsed by
+CommandInterpreter (or CommandParser with --strict) and run through
+TimerManager.execute_command. Lines are read lazily, so scripts of any
+length run in constant memory. Errors are reported per line on stderr
+without stopping the run, and a summary is printed at the end. With
+--shards the timers are spread over N worker processes
+(ShardedTimerManager).
+"""
+import argparse
+import math
+import sys
+import threading
+import time
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from timer_manager import (TimerManager, TimerCompleted, TimerPaused, TimerStopped, TimerDeleted,
+                           TimersCleared)
+
+# Events after which a countdown may have ended
+COUNTDOWN_ENDED = (TimerCompleted, TimerPaused, TimerStopped, TimerDeleted, TimersCleared)
+
+def read_lines(stream: TextIO) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, command text), skipping blanks and comments."""
+    for number, line in enumerate(stream, 1):
+        text = line.strip()
+        if text and not text.startswith('#'):
+            yield number, text
+
+def make_parser(strict: bool) -> Callable[[str], Optional[Dict]]:
+    if strict:
+        from command_parser import CommandParser
+        return CommandParser().parse_command
+    from command_interpreter import CommandInterpreter
+    return CommandInterpreter().interpret
+
+def execute(lines: Iterable[Tuple[int, str]], parse: Callable[[str], Optional[Dict]],
+            manager: TimerManager) -> Iterator[Tuple[int, str, Optional[str], float]]:
+    """Parse and run each line, yielding (line number, text, error, seconds)."""
+    clock = time.perf_counter
+    for number, text in lines:
+        start = clock()
+        error = None
+        try:
+            command = parse(text)
+            if command:
+                manager.execute_command(command)
+            else:
+                error = "could not parse command"
+        except Exception as e:
+            error = str(e)
+        yield number, text, error, clock() - start
+
+def percentile(ordered, fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run(stream: TextIO, manager: TimerManager, strict: bool = False,
+        errors: TextIO = sys.stderr) -> Dict[str, float]:
+    """Run a script and return summary statistics."""
+    latencies = array('d')
+    failed = 0
+    start = time.perf_counter()
+    for number, text, error, seconds in execute(read_lines(stream), make_parser(strict), manager):
+        latencies.append(seconds)
+        if error:
+            failed += 1
+            print(f"line {number}: {error}: {text}", file=errors)
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    return {
+        'commands': len(ordered),
+        'failed': failed,
+        'seconds': elapsed,
+        'commands_per_sec': len(ordered) / elapsed if elapsed > 0 else 0.0,
+        'p50_us': percentile(ordered, 0.50) * 1e6,
+        'p95_us': percentile(ordered, 0.95) * 1e6,
+        'p99_us': percentile(ordered, 0.99) * 1e6,
+        'max_us': (ordered[-1] if ordered else 0.0) * 1e6,
+    }
+
+def wait_for_timers(manager: TimerManager) -> None:
+    """Block until no timer is counting down.
+
+    Checks again on every event that can end a countdown instead of polling.
+    The check runs on this thread, not in the event callback, since a
+    ShardedTimerManager can't be called from its own event callbacks.
+    """
+    changed = threading.Event()
+    subscription = manager.events.subscribe(lambda event: changed.set(), COUNTDOWN_ENDED)
+    try:
+        while manager.expiring_within(math.inf):
+            changed.wait()
+            changed.clear()
+    finally:
+        manager.events.unsubscribe(subscription)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run timer commands from a script file or stdin.")
+    parser.add_argument('script', nargs='?', default='-', help="script file, or - for stdin")
+    parser.add_argument('--strict', action='store_true',
+                        help="use the strict 'create name 5m' command syntax")
+    parser.add_argument('--quiet', action='store_true', help="don't print timer output")
+    parser.add_argument('--wait', action='store_true',
+                        help="keep running until all timers have finished")
+    parser.add_argument('--shards', type=int, metavar='N',
+                        help="spread timers over N worker processes")
+    args = parser.parse_args(argv)
+
+    if args.shards:
+        from sharded_timer_manager import ShardedTimerManager
+        manager = ShardedTimerManager(args.shards)
+    else:
+        manager = TimerManager()
+    if args.quiet:
+        manager.set_output_callback(lambda message: None, include_events=False)
+
+    if args.script == '-':
+        summary = run(sys.stdin, manager, args.strict)
+    else:
+        with open(args.script, encoding='utf-8') as stream:
+            summary = run(stream, manager, args.strict)
+
+    print(f"{summary['commands']} commands, {summary['failed']} failed, "
+          f"{summary['seconds']:.2f}s ({summary['commands_per_sec']:.0f}/s)", file=sys.stderr)
+    print(f"latency us: p50={summary['p50_us']:.1f} p95={summary['p95_us']:.1f} "
+          f"p99={summary['p99_us']:.1f} max={summary['max_us']:.1f}", file=sys.stderr)
+
+    if args.wait:
+        wait_for_timers(manager)
+    manager.shutdown()
+    return 1 if summary['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""Client library for timer_daemon.
+
+TimerClient keeps one connection open and reuses it for every request,
+reconnecting if the daemon restarted. Read-only requests are retried on the
+new connection; anything else raises the ConnectionError, since it may
+already have run, and the next request reconnects:
+
+    client = TimerClient()
+    client.create("tea", 300)
+    print(client.list())
+
+AsyncTimerClient is the asyncio equivalent and supports many requests in
+flight on one connection.
+"""
+import asyncio
+import json
+import socket
+import threading
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from timer_daemon import default_socket_path, encode
+
+# Requests that are safe to send twice
+IDEMPOTENT_OPS = frozenset({'get', 'list', 'ping'})
+
+class TimerDaemonError(Exception):
+    """The daemon answered a request with an error."""
+
+def _result(response: Dict):
+    if not response.get('ok'):
+        raise TimerDaemonError(response.get('error', 'unknown error'))
+    return response.get('result')
+
+class TimerClient:
+    def __init__(self, path: Optional[str] = None, timeout: Optional[float] = 10.0):
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+        # Events that arrived while waiting for a response
+        self.pending_events = deque()
+
+    def _connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.path)
+        self._sock = sock
+        self._reader = sock.makefile('rb')
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+            self._sock = None
+            self._reader = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_response(self) -> Dict:
+        while True:
+            line = self._reader.readline()
+            if not line:
+                raise ConnectionError("Timer daemon closed the connection")
+            message = json.loads(line)
+            if 'event' in message:
+                self.pending_events.append(message)
+            else:
+                return message
+
+    def pipeline(self, requests: Iterable[Dict]) -> List[Dict]:
+        """Send several requests in one write and return their raw responses.
+
+        Requests without an "id" are given one, and every response must
+        carry its request's id.
+        """
+        requests = list(requests)
+        with self._lock:
+            for index, request in enumerate(requests):
+                if 'id' not in request:
+                    self._next_id += 1
+                    requests[index] = dict(request, id=self._next_id)
+            for attempt in (0, 1):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.sendall(b''.join(encode(request) for request in requests))
+                    responses = [self._read_response() for _ in requests]
+                except OSError:
+                    # Stale or timed-out connection, e.g. the daemon restarted;
+                    # retry once unless a request could have run before the failure
+                    self._disconnect()
+                    if attempt or any(request['op'] not in IDEMPOTENT_OPS for request in requests):
+                        raise
+                    continue
+                for request, response in zip(requests, responses):
+                    if response.get('id') != request['id']:
+                        self._disconnect()
+                        raise TimerDaemonError(f"Response id {response.get('id')!r} "
+                                               f"does not match request id {request['id']!r}")
+                return responses
+
+    def request(self, op: str, **params):
+        return _result(self.pipeline([dict(params, op=op)])[0])
+
+    def create(self, name: str, duration: int, tags: Iterable[str] = ()):
+        return self.request('create', name=name, duration=duration, tags=list(tags))
+
+    def pause(self, name: str):
+        return self.request('pause', name=name)
+
+    def resume(self, name: str):
+        return self.request('resume', name=name)
+
+    def stop(self, name: str):
+        return self.request('stop', name=name)
+
+    def snooze(self, name: str, seconds: Optional[float] = None):
+        return self.request('snooze', name=name, seconds=seconds)
+
+    def delete(self, name: str):
+        return self.request('delete', name=name)
+
+    def bulk(self, op: str, tag: Optional[str] = None, pattern: Optional[str] = None) -> List[str]:
+        """Pause, resume, stop or delete every timer with `tag` matching the glob
+        `pattern` (all timers if neither is given). Returns the names changed."""
+        return self.request(op, tag=tag, pattern=pattern)
+
+    def get(self, name: str) -> Dict:
+        return self.request('get', name=name)
+
+    def list(self) -> List[Dict]:
+        return self.request('list')
+
+    def command(self, text: str) -> Dict:
+        return self.request('command', text=text)
+
+    def events(self, types: Optional[List[str]] = None,
+               names: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Subscribe and yield events forever. Uses its own connection."""
+        client = TimerClient(self.path, timeout=None)
+        try:
+            client.request('subscribe', types=types, names=names)
+            while True:
+                while client.pending_events:
+                    yield client.pending_events.popleft()
+                line = client._reader.readline()
+                if not line:
+                    return
+                client.pending_events.append(json.loads(line))
+        finally:
+            client.close()
+
+class AsyncTimerClient:
+    """asyncio client; concurrent requests share one pipelined connection."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_socket_path()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._waiters = {}
+        self._next_id = 0
+        self._read_task = None
+        self.events: asyncio.Queue = asyncio.Queue()
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._read_task = asyncio.ensure_future(self._read_loop())
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._read_task.cancel()
+            self._writer = None
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if 'event' in message:
+                    self.events.put_nowait(message)
+                else:
+                    future = self._waiters.pop(message.get('id'), None)
+                    if future is not None and not future.done():
+                        future.set_result(message)
+        finally:
+            for future in self._waiters.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Timer daemon closed the connection"))
+            self._waiters.clear()
+
+    async def request(self, op: str, **params):
+        if self._writer is None:
+            await self.connect()
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[self._next_id] = future
+        self._writer.write(encode(dict(params, op=op, id=self._next_id)))
+        return _result(await future)
@@ -0,0 +1,276 @@
+"""Headless timer daemon serving a line-delimited JSON protocol on a Unix socket.
+
+Usage: python timer_daemon.py [--socket PATH] [--alerts] [--journal DIR] [--metrics-port PORT]
+
+Every request is one JSON object per line with an "op" and an optional "id"
+that is echoed back:
+
+    {"id": 1, "op": "create", "name": "tea", "duration": 300}
+    {"id": 1, "ok": true, "result": null}
+
+Requests may be pipelined; responses come back in request order. Ops:
+create, start, pause, resume, stop, snooze, delete, clear, list, get,
+command (natural language text), subscribe, unsubscribe and ping.
+
+create takes optional "tags", and makes a recurring timer when given
+"every" (seconds) or "cron" (an expression) instead of "duration", with an
+optional "count" and "catch_up" (how many missed occurrences fire late,
+default 1). pause, resume, stop and delete given a "tag" and/or a
+glob "pattern" instead of a "name" apply to every matching timer at once.
+snooze takes optional "seconds". After "subscribe" the connection also
+receives events such as {"event": "TimerTick", "name": "tea", ...}
+interleaved with responses.
+
+With --journal, timers are persisted to DIR and restored on the next start.
+With --metrics-port, Prometheus metrics are served at
+http://127.0.0.1:PORT/metrics.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+from typing import Dict, Optional
+
+from async_timer_manager import AsyncTimerManager
+from timer_manager import EVENT_TYPES, TimerEvent
+
+EVENT_TYPES_BY_NAME = {event_type.__name__: event_type for event_type in EVENT_TYPES}
+
+# A client whose unread output grows past this is too slow and is dropped
+MAX_WRITE_BUFFER = 1024 * 1024
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'timer-assistant.sock')
+    return f"/tmp/timer-assistant-{os.getuid()}.sock"
+
+def encode(message: Dict) -> bytes:
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+class ClientConnection:
+    """One connected client and its event subscriptions."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.subscriptions = {}
+        self.closed = False
+
+    def send(self, message: Dict) -> None:
+        if self.closed:
+            return
+        transport = self.writer.transport
+        if transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.closed = True
+            transport.abort()
+            return
+        self.writer.write(encode(message))
+
+    def send_event(self, event: TimerEvent) -> None:
+        self.send(event.to_dict())
+
+class TimerDaemon:
+    def __init__(self, manager: AsyncTimerManager):
+        self.manager = manager
+        self.connections = set()
+        self._interpreter = None
+        self._next_subscription = 0
+
+    def _timer(self, name: str):
+        if name not in self.manager.timers:
+            raise ValueError(f"Timer '{name}' does not exist")
+        return self.manager.timers[name]
+
+    def _interpret(self, text: str) -> Dict:
+        if self._interpreter is None:
+            from command_interpreter import CommandInterpreter
+            self._interpreter = CommandInterpreter()
+        command = self._interpreter.interpret(text)
+        if not command:
+            raise ValueError("I didn't understand that command")
+        self.manager.execute_command(command)
+        return command
+
+    def _subscribe(self, connection: ClientConnection, request: Dict) -> int:
+        types = request.get('types')
+        if types is not None:
+            unknown = [t for t in types if t not in EVENT_TYPES_BY_NAME]
+            if unknown:
+                raise ValueError(f"Unknown event type(s): {', '.join(unknown)}")
+            types = [EVENT_TYPES_BY_NAME[t] for t in types]
+        self._next_subscription += 1
+        connection.subscriptions[self._next_subscription] = self.manager.events.subscribe(
+            connection.send_event, types, request.get('names'))
+        return self._next_subscription
+
+    def dispatch(self, connection: ClientConnection, request: Dict):
+        """Run one request and return its result. Failures raise."""
+        op = request.get('op')
+        manager = self.manager
+        if op == 'create':
+            if 'every' in request or 'cron' in request:
+                manager.execute_command(dict(
+                    {key: request[key] for key in ('every', 'cron', 'count', 'catch_up') if key in request},
+                    type='recurring', name=request['name'], tags=request.get('tags') or ()))
+            else:
+                manager.create_timer(request['name'], int(request['duration']), request.get('tags') or ())
+        elif op in ('start', 'pause', 'resume', 'stop', 'delete'):
+            if op == 'start' or 'name' in request:
+                manager.execute_command({'type': op, 'name': request['name']})
+            else:
+                # Bulk: returns the names of the timers changed
+                return manager.execute_command(
+                    {'type': op, 'tag': request.get('tag'), 'pattern': request.get('pattern')})
+        elif op == 'snooze':
+            manager.snooze_timer(request['name'], request.get('seconds'))
+        elif op == 'clear':
+            manager.clear_all_timers()
+        elif op == 'list':
+            return [timer.to_dict() for timer in manager.timers.values()]
+        elif op == 'get':
+            return self._timer(request['name']).to_dict()
+        elif op == 'command':
+            return self._interpret(request['text'])
+        elif op == 'subscribe':
+            return self._subscribe(connection, request)
+        elif op == 'unsubscribe':
+            manager.events.unsubscribe(connection.subscriptions.pop(request['subscription'], None))
+        elif op == 'ping':
+            return 'pong'
+        else:
+            raise ValueError(f"Unknown op: {op}")
+        return None
+
+    def handle_line(self, connection: ClientConnection, line: bytes) -> None:
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            request_id = request.get('id')
+            result = self.dispatch(connection, request)
+            response = {'ok': True, 'result': result}
+        except KeyError as e:
+            response = {'ok': False, 'error': f"Missing field: {e.args[0]}"}
+        except Exception as e:
+            response = {'ok': False, 'error': str(e)}
+        if request_id is not None:
+            response['id'] = request_id
+        connection.send(response)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = ClientConnection(writer)
+        self.connections.add(connection)
+        try:
+            while not connection.closed:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    connection.send({'ok': False, 'error': "Request line too long"})
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    self.handle_line(connection, line)
+                # Pipelined requests are answered together; only wait on a backed-up client
+                if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER // 2:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            connection.closed = True
+            for subscription in connection.subscriptions.values():
+                self.manager.events.unsubscribe(subscription)
+            self.connections.discard(connection)
+            writer.close()
+
+    async def serve(self, path: str, ready: Optional[asyncio.Event] = None) -> None:
+        remove_stale_socket(path)
+        # Bind with a private umask so the socket is never reachable by others
+        umask = os.umask(0o077)
+        try:
+            server = await asyncio.start_unix_server(self.handle_client, path, backlog=4096)
+        finally:
+            os.umask(umask)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+class DaemonRunningError(RuntimeError):
+    """Another daemon is already serving the socket path."""
+
+def remove_stale_socket(path: str) -> None:
+    """Unlink a socket left at `path` by a daemon that is gone. Raises
+    DaemonRunningError if a daemon is still accepting connections on it."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise DaemonRunningError(f"A timer daemon is already listening on {path}")
+
+async def run_daemon(path: str, alerts: bool = False, journal_dir: Optional[str] = None,
+                     metrics_port: Optional[int] = None) -> None:
+    # Before touching the journal, which a running daemon owns
+    remove_stale_socket(path)
+    manager = AsyncTimerManager(alerts=alerts)
+    manager.set_output_callback(lambda message: None, include_events=False)
+    metrics_server = None
+    if metrics_port is not None:
+        from metrics import MetricsServer
+        metrics_server = MetricsServer(manager.enable_metrics().registry, port=metrics_port)
+        metrics_server.start()
+        print(f"Serving metrics on http://127.0.0.1:{metrics_server.port}/metrics", file=sys.stderr)
+    journal = None
+    if journal_dir:
+        from timer_journal import Journal
+        journal = Journal(journal_dir)
+        restored = journal.attach(manager)
+        print(f"Restored {restored} timer(s) from {journal_dir}", file=sys.stderr)
+    try:
+        await TimerDaemon(manager).serve(path)
+    finally:
+        manager.shutdown()
+        if journal is not None:
+            journal.close()
+        if metrics_server is not None:
+            metrics_server.stop()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the timer daemon.")
+    parser.add_argument('--socket', default=default_socket_path(), help="Unix socket path")
+    parser.add_argument('--alerts', action='store_true', help="play alerts when timers finish")
+    parser.add_argument('--journal', metavar='DIR', help="persist timers to this directory")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="serve Prometheus metrics on this local port")
+    args = parser.parse_args(argv)
+    print(f"Timer daemon listening on {args.socket}", file=sys.stderr)
+    try:
+        asyncio.run(run_daemon(args.socket, args.alerts, args.journal, args.metrics_port))
+    except DaemonRunningError as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
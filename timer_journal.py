@@ -0,0 +1,415 @@
+"""Crash-safe persistence for a TimerManager: append-only journal plus snapshots.
+
+A Journal subscribes to a manager's EventBus and appends one fixed-size
+binary record per state transition. Records are packed into a memory buffer
+on the publishing thread and written with a batched fsync by a background
+flusher, so commands never wait on the disk. The flusher sleeps until
+there is something to write, so an idle journal causes no wakeups.
+
+Files in the journal directory, all tagged with a snapshot generation N:
+
+    snapshot.json   state of every timer when generation N began
+    journal-N.bin   records since then: op, name id, wall time, remaining, duration
+    names-N.txt     timer names, one per line; a name's id is its line number
+    meta-N.jsonl    tags and schedules: [name id, record index, meta] lines
+
+Each record carries the timer's full state, so recovery only needs the last
+record per timer. What doesn't fit a fixed-size record (a timer's tags, and
+a recurring timer's schedule and progress) is written to meta-N.jsonl when
+the timer is created, and again each time a recurring timer starts
+counting down to its next occurrence. Plain timers cost nothing extra.
+Recovery maps journal-N.bin and unpacks it with struct.iter_unpack, keeps
+the last record per id and recomputes remaining time from the wall clock.
+Once enough records pile up, the flusher writes a new snapshot from the
+journal's own state table and starts generation N+1, which bounds both the
+journal size and recovery time.
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from schedules import from_spec
+from timer_manager import (TimerManager, TimerEvent, TimerCreated, TimerStarted, TimerPaused,
+                           TimerResumed, TimerCompleted, TimerStopped, TimerDeleted,
+                           TimersCleared, Subscription)
+
+RECORD = struct.Struct('<BIddd')
+
+# Record ops
+CREATED = 1
+STARTED = 2
+PAUSED = 3
+RESUMED = 4
+COMPLETED = 5
+STOPPED = 6
+DELETED = 7
+CLEARED = 8
+
+# Name id used by CLEARED records, which apply to every timer
+ALL_TIMERS = 0xFFFFFFFF
+
+EVENT_OPS = {
+    TimerCreated: CREATED,
+    TimerStarted: STARTED,
+    TimerPaused: PAUSED,
+    TimerResumed: RESUMED,
+    TimerCompleted: COMPLETED,
+    TimerStopped: STOPPED,
+    TimerDeleted: DELETED,
+    TimersCleared: CLEARED,
+}
+
+SNAPSHOT_FILE = 'snapshot.json'
+
+# (op, wall time, remaining, duration, meta) of a timer's latest
+# transition; meta is the timer_meta() dict, or None
+State = Tuple[int, float, float, float, Optional[Dict]]
+
+def default_journal_dir() -> str:
+    base = os.environ.get('APPDATA') or os.environ.get('XDG_STATE_HOME')
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(base, 'timer-assistant')
+
+def journal_path(directory: str, generation: int) -> str:
+    return os.path.join(directory, f"journal-{generation}.bin")
+
+def names_path(directory: str, generation: int) -> str:
+    return os.path.join(directory, f"names-{generation}.txt")
+
+def meta_path(directory: str, generation: int) -> str:
+    return os.path.join(directory, f"meta-{generation}.jsonl")
+
+def timer_meta(timer) -> Optional[Dict]:
+    """What a timer needs restored beyond its record, None if nothing."""
+    meta = {}
+    if timer.tags:
+        meta['tags'] = sorted(timer.tags)
+    if timer.schedule is not None:
+        meta['schedule'] = timer.schedule.spec()
+    return meta or None
+
+def read_snapshot(directory: str) -> Tuple[int, Dict[str, State]]:
+    """Return (generation, {timer name: state}) from the latest snapshot."""
+    try:
+        with open(os.path.join(directory, SNAPSHOT_FILE), encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return 0, {}
+    # Snapshots from before meta was journaled have four fields
+    return data['generation'], {name: (tuple(state) + (None,))[:5]
+                                for name, state in data['timers'].items()}
+
+def read_names(directory: str, generation: int) -> List[str]:
+    try:
+        with open(names_path(directory, generation), encoding='utf-8') as f:
+            return f.read().split('\n')
+    except FileNotFoundError:
+        return []
+
+def read_meta(directory: str, generation: int) -> Dict[int, Tuple[int, Optional[Dict]]]:
+    """{name id: (record index, meta)} of the last meta line per name id."""
+    metas = {}
+    try:
+        with open(meta_path(directory, generation), encoding='utf-8') as f:
+            for line in f:
+                try:
+                    name_id, index, meta = json.loads(line)
+                except ValueError:
+                    break  # torn last line
+                metas[name_id] = (index, meta)
+    except FileNotFoundError:
+        pass
+    return metas
+
+def replay(directory: str, generation: int, state: Dict[str, State]) -> int:
+    """Apply journal-N.bin to `state` in place and return the record count.
+
+    A torn record at the end of the file, left by a crash mid-write, is ignored.
+    """
+    try:
+        f = open(journal_path(directory, generation), 'rb')
+    except FileNotFoundError:
+        return 0
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        size -= size % RECORD.size
+        if size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                # The last record per name id wins; the index orders it against clears
+                last = {record[1]: (index, record)
+                        for index, record in enumerate(RECORD.iter_unpack(view[:size]))}
+
+    names = read_names(directory, generation)
+    metas = read_meta(directory, generation)
+    cleared = last.pop(ALL_TIMERS, (-1, None))[0]
+    if cleared >= 0:
+        state.clear()
+    for name_id, (index, (op, _, wall, remaining, duration)) in last.items():
+        if name_id >= len(names) or index < cleared:
+            continue
+        name = names[name_id]
+        if op == DELETED:
+            state.pop(name, None)
+            continue
+        meta_index, meta = metas.get(name_id, (-1, None))
+        if meta_index < 0 or meta_index < cleared:
+            # No meta line this generation: keep the snapshot's
+            previous = state.get(name)
+            meta = previous[4] if previous is not None else None
+        state[name] = (op, wall, remaining, duration, meta)
+    return size // RECORD.size
+
+def load_state(directory: str) -> Dict[str, State]:
+    """The latest snapshot with its journal replayed on top."""
+    generation, state = read_snapshot(directory)
+    replay(directory, generation, state)
+    return state
+
+def recover(directory: str, now: Optional[float] = None) -> Dict[str, Dict[str, object]]:
+    """Rebuild timer state from disk, keyed by name.
+
+    Each value holds restore_timer's arguments. `remaining` is recomputed
+    from the wall clock for timers that were counting down, and is negative
+    for timers whose deadline passed while nothing was running.
+    """
+    if now is None:
+        now = time.time()
+    timers = {}
+    for name, (op, wall, remaining, duration, meta) in load_state(directory).items():
+        counting = op in (CREATED, STARTED, RESUMED)
+        timers[name] = {
+            'duration': duration,
+            'remaining': remaining - (now - wall) if counting else remaining,
+            'running': op != STOPPED,
+            'paused': op == PAUSED,
+            'alerting': op == COMPLETED,
+            'tags': tuple(meta.get('tags', ())) if meta else (),
+            'schedule': from_spec(meta['schedule']) if meta and 'schedule' in meta else None,
+        }
+    return timers
+
+class Journal:
+    """Persist a TimerManager's timers to `directory`.
+
+    Call attach() once, before any timers are created, to restore the
+    previous session's timers and start journaling. close() flushes
+    everything still buffered.
+    """
+
+    def __init__(self, directory: str, flush_interval: float = 0.05, snapshot_every: int = 100000):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._buffer = bytearray()
+        self._names_buffer: List[str] = []
+        self._meta_buffer: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        # Names whose latest meta is not None, so recreating them without
+        # meta must write a line clearing it
+        self._has_meta = set()
+        self._state: Dict[str, State] = {}
+        self._records = 0
+        self._snapshot_requested = False
+        self._generation, _ = read_snapshot(directory)
+        self._flush_lock = threading.Lock()
+        self._journal_file = None
+        self._names_file = None
+        self._meta_file = None
+        self._manager: Optional[TimerManager] = None
+        self._subscription: Optional[Subscription] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closing = threading.Event()
+
+    def attach(self, manager: TimerManager) -> int:
+        """Restore saved timers into `manager`, then journal its events.
+
+        Returns the number of timers restored.
+        """
+        restored = recover(self.directory)
+        for name, saved in restored.items():
+            manager.restore_timer(name, **saved)
+
+        # Start a fresh generation from the manager's state after recovery
+        wall = time.time()
+        state = {}
+        for name, timer in manager.timers.items():
+            if timer.alerting:
+                op = COMPLETED
+            elif not timer.running:
+                op = STOPPED
+            elif timer.paused:
+                op = PAUSED
+            else:
+                op = RESUMED
+            state[name] = (op, wall, timer.remaining, float(timer.duration), timer_meta(timer))
+        with self._lock:
+            self._state = state
+            self._has_meta = {name for name, saved in state.items() if saved[4] is not None}
+            self._snapshot_requested = True
+        self._manager = manager
+        self._subscription = manager.events.subscribe(self.record, EVENT_OPS)
+        self._thread = threading.Thread(target=self._run, name="TimerJournal")
+        self._thread.daemon = True
+        self._thread.start()
+        self._wakeup.set()
+        return len(restored)
+
+    def record(self, event: TimerEvent) -> None:
+        """Append a record for an event. Called on the publishing thread."""
+        op = EVENT_OPS[type(event)]
+        wall = time.time()
+        with self._lock:
+            if op == CLEARED:
+                self._state.clear()
+                self._has_meta.clear()
+                self._buffer += RECORD.pack(op, ALL_TIMERS, wall, 0.0, 0.0)
+                self._snapshot_requested = True
+            else:
+                self._append(op, event, wall)
+            self._records += 1
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def _append(self, op: int, event: TimerEvent, wall: float) -> None:
+        """Pack one timer's record. Caller holds the lock."""
+        name = event.name
+        previous = self._state.get(name)
+        duration = previous[3] if previous is not None else 0.0
+        meta = previous[4] if previous is not None else None
+        if op == CREATED:
+            duration = remaining = float(event.duration)
+        elif op == COMPLETED:
+            remaining = 0.0
+        elif op == STOPPED or op == DELETED:
+            remaining = duration
+        else:
+            remaining = event.remaining
+
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self._name_ids)
+            self._names_buffer.append(name)
+        # A recurring timer's progress changes each time it starts again
+        if op == CREATED or (op == STARTED and meta is not None and 'schedule' in meta):
+            timer = self._manager.timers.get(name)
+            meta = timer_meta(timer) if timer is not None else None
+            if meta is not None or name in self._has_meta:
+                self._meta_buffer.append(json.dumps([name_id, self._records, meta],
+                                                    separators=(',', ':')) + '\n')
+                if meta is not None:
+                    self._has_meta.add(name)
+                else:
+                    self._has_meta.discard(name)
+        self._buffer += RECORD.pack(op, name_id, wall, remaining, duration)
+        if op == DELETED:
+            self._state.pop(name, None)
+        else:
+            self._state[name] = (op, wall, remaining, duration, meta)
+
+    def _open_generation(self, generation: int) -> None:
+        self._journal_file = open(journal_path(self.directory, generation), 'ab')
+        self._names_file = open(names_path(self.directory, generation), 'a', encoding='utf-8')
+        self._meta_file = open(meta_path(self.directory, generation), 'a', encoding='utf-8')
+
+    def _close_files(self) -> None:
+        for f in (self._journal_file, self._names_file, self._meta_file):
+            if f is not None:
+                f.close()
+        self._journal_file = self._names_file = self._meta_file = None
+
+    def _write_snapshot(self, generation: int, state: Dict[str, State]) -> None:
+        """Atomically replace snapshot.json."""
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        temporary = path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'generation': generation, 'wall': time.time(), 'timers': state},
+                      f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+        if hasattr(os, 'O_DIRECTORY'):
+            directory = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+    def flush(self) -> None:
+        """Write and fsync buffered records, taking a snapshot when one is due."""
+        with self._flush_lock:
+            with self._lock:
+                data, self._buffer = self._buffer, bytearray()
+                names, self._names_buffer = self._names_buffer, []
+                metas, self._meta_buffer = self._meta_buffer, []
+                generation = self._generation
+                snapshot = self._snapshot_requested or self._records >= self.snapshot_every
+                if snapshot:
+                    # Records from here on belong to the next generation
+                    state = dict(self._state)
+                    self._generation += 1
+                    self._name_ids = {}
+                    self._records = 0
+                    self._snapshot_requested = False
+
+            if data:
+                if self._journal_file is None:
+                    self._open_generation(generation)
+                # Names and meta first, so every id in the journal resolves
+                self._names_file.write(''.join(name + '\n' for name in names))
+                self._names_file.flush()
+                os.fsync(self._names_file.fileno())
+                if metas:
+                    self._meta_file.write(''.join(metas))
+                    self._meta_file.flush()
+                    os.fsync(self._meta_file.fileno())
+                self._journal_file.write(data)
+                self._journal_file.flush()
+                os.fsync(self._journal_file.fileno())
+
+            if snapshot:
+                self._write_snapshot(generation + 1, state)
+                self._close_files()
+                self._remove_old_generations(generation + 1)
+                self._open_generation(generation + 1)
+
+    def _remove_old_generations(self, current: int) -> None:
+        keep = {os.path.basename(journal_path(self.directory, current)),
+                os.path.basename(names_path(self.directory, current)),
+                os.path.basename(meta_path(self.directory, current))}
+        for filename in os.listdir(self.directory):
+            if filename.startswith(('journal-', 'names-', 'meta-')) and filename not in keep:
+                os.remove(os.path.join(self.directory, filename))
+
+    def _run(self) -> None:
+        while not self._closing.is_set():
+            self._wakeup.wait()
+            # Give more records flush_interval to arrive and share the fsync
+            self._closing.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Error writing timer journal: {str(e)}")
+
+    def close(self) -> None:
+        """Stop journaling and flush what is buffered."""
+        if self._manager is not None:
+            self._manager.events.unsubscribe(self._subscription)
+            self._subscription = None
+        self._closing.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        self._close_files()
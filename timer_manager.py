@@ -1,64 +1,1157 @@
+import bisect
+import fnmatch
+import functools
+import heapq
+import itertools
+import math
+import re
 import threading
 import time
+from array import array
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Callable
+from typing import Dict, Optional, Callable, Iterable, List
 from alert_manager import AlertManager
+from clock import SYSTEM_CLOCK, Clock
 
-class Timer:
-    def __init__(self, name: str, duration: int):
+class ScheduledCall:
+    """Handle for a callback queued on a Scheduler."""
+    __slots__ = ('when', 'seq', 'callback', 'args', 'cancelled', 'bucket')
+
+    def __init__(self, when: float, seq: int, callback: Callable, args: tuple):
+        self.when = when
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        # Container currently holding the call, None once it has been popped
+        self.bucket = None
+
+    def __lt__(self, other: 'ScheduledCall') -> bool:
+        return (self.when, self.seq) < (other.when, other.seq)
+
+class HeapQueue:
+    """Min-heap of scheduled calls.
+
+    Removing only marks the entry, and the heap is compacted once removed
+    entries make up half of it.
+    """
+
+    def __init__(self):
+        self._heap: List[ScheduledCall] = []
+        self._removed = 0
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._removed
+
+    def push(self, call: ScheduledCall) -> bool:
+        """Queue a call. Returns True if it is now the earliest one."""
+        call.bucket = self._heap
+        heapq.heappush(self._heap, call)
+        return self._heap[0] is call
+
+    def remove(self, call: ScheduledCall) -> None:
+        call.bucket = None
+        self._removed += 1
+        if self._removed * 2 > len(self._heap):
+            self._heap = [c for c in self._heap if c.bucket is not None]
+            heapq.heapify(self._heap)
+            for c in self._heap:
+                c.bucket = self._heap
+            self._removed = 0
+
+    def clear(self) -> None:
+        self._heap = []
+        self._removed = 0
+
+    def _discard_removed(self) -> None:
+        heap = self._heap
+        while heap and heap[0].bucket is None:
+            heapq.heappop(heap)
+            self._removed -= 1
+
+    def next_deadline(self) -> Optional[float]:
+        self._discard_removed()
+        return self._heap[0].when if self._heap else None
+
+    def pop_due(self, now: float) -> List[ScheduledCall]:
+        due = []
+        heap = self._heap
+        self._discard_removed()
+        while heap and heap[0].when <= now:
+            call = heapq.heappop(heap)
+            call.bucket = None
+            due.append(call)
+            self._discard_removed()
+        return due
+
+class TimingWheel:
+    """Hierarchical timing wheel with O(1) insert and cancel.
+
+    Time is quantized into ticks of `resolution` seconds. Level 0 holds calls
+    due within `slots` ticks, and each higher level covers `slots` times the
+    span of the one below; its slots are cascaded down as time reaches them.
+    Calls beyond the top level wait in an overflow set. Calls never fire
+    before their deadline, but may fire up to one tick after it.
+    """
+
+    def __init__(self, resolution: float = 0.01, slots: int = 64, levels: int = 4,
+                 origin: Optional[float] = None):
+        """`origin` is the monotonic time of tick 0, by default now."""
+        if resolution <= 0:
+            raise ValueError("Tick resolution must be positive")
+        if slots < 2 or slots & (slots - 1):
+            raise ValueError("Wheel slots must be a power of two")
+        self.resolution = resolution
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._levels = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._overflow = set()
+        self._ready = set()
+        self._origin = time.monotonic() if origin is None else origin
+        self._tick = 0
+        self._count = 0
+        # The tick of the last next_deadline(), which the worker waits for
+        self._armed: Optional[int] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _expiry_tick(self, when: float) -> int:
+        return math.ceil((when - self._origin) / self.resolution)
+
+    def _place(self, call: ScheduledCall, expiry: int) -> None:
+        delta = expiry - self._tick
+        if delta <= 0:
+            bucket = self._ready
+        else:
+            bucket = self._overflow
+            for level, wheel in enumerate(self._levels):
+                if delta < 1 << (self._bits * (level + 1)):
+                    bucket = wheel[(expiry >> (self._bits * level)) & self._mask]
+                    break
+        bucket.add(call)
+        call.bucket = bucket
+
+    def push(self, call: ScheduledCall) -> bool:
+        """Queue a call. Returns True if the worker may need to wake earlier."""
+        expiry = self._expiry_tick(call.when)
+        self._place(call, expiry)
+        self._count += 1
+        # The worker wakes at the armed tick anyway and looks again then
+        return self._armed is None or expiry < self._armed
+
+    def remove(self, call: ScheduledCall) -> None:
+        call.bucket.discard(call)
+        call.bucket = None
+        self._count -= 1
+
+    def clear(self) -> None:
+        for wheel in self._levels:
+            for bucket in wheel:
+                bucket.clear()
+        self._overflow.clear()
+        self._ready.clear()
+        self._count = 0
+        self._armed = None
+
+    def _cascade(self, bucket: set) -> None:
+        calls = list(bucket)
+        bucket.clear()
+        for call in calls:
+            self._place(call, self._expiry_tick(call.when))
+
+    def _next_tick(self) -> Optional[int]:
+        """The next tick that fires or cascades anything, if any."""
+        bits, mask = self._bits, self._mask
+        best = None
+        for level, wheel in enumerate(self._levels):
+            shift = bits * level
+            base = self._tick >> shift
+            for step in range(1, mask + 2):
+                if wheel[(base + step) & mask]:
+                    tick = (base + step) << shift
+                    if best is None or tick < best:
+                        best = tick
+                    break
+        if self._overflow:
+            span = bits * (len(self._levels) - 1)
+            tick = ((self._tick >> span) + 1) << span
+            if best is None or tick < best:
+                best = tick
+        return best
+
+    def _process_tick(self, tick: int) -> None:
+        bits, mask = self._bits, self._mask
+        top = len(self._levels)
+        if self._overflow and tick & ((1 << (bits * (top - 1))) - 1) == 0:
+            self._cascade(self._overflow)
+        for level in range(top - 1, 0, -1):
+            if tick & ((1 << (bits * level)) - 1) == 0:
+                bucket = self._levels[level][(tick >> (bits * level)) & mask]
+                if bucket:
+                    self._cascade(bucket)
+        bucket = self._levels[0][tick & mask]
+        if bucket:
+            for call in bucket:
+                call.bucket = self._ready
+            self._ready |= bucket
+            bucket.clear()
+
+    def _advance(self, target: int) -> None:
+        """Move the wheel forward to tick `target`, collecting due calls."""
+        while self._tick < target:
+            if self._count == len(self._ready):
+                # Nothing is waiting in the wheel, so skip straight ahead
+                self._tick = target
+                return
+            tick = self._tick + 1
+            if not self._levels[0][tick & self._mask]:
+                # Jump over empty ticks instead of visiting each one
+                tick = min(self._next_tick(), target)
+            self._tick = tick
+            self._process_tick(tick)
+
+    def next_deadline(self) -> Optional[float]:
+        """Time of the next tick that fires or cascades anything."""
+        if self._ready:
+            self._armed = self._tick
+        elif not self._count:
+            self._armed = None
+            return None
+        else:
+            self._armed = self._next_tick()
+        return self._origin + self._armed * self.resolution
+
+    def pop_due(self, now: float) -> List[ScheduledCall]:
+        tick = math.floor((now - self._origin) / self.resolution)
+        # Rounding can put the time next_deadline() gave for a tick just
+        # before it; that time must still reach the tick
+        if self._origin + (tick + 1) * self.resolution <= now:
+            tick += 1
+        self._advance(tick)
+        if not self._ready:
+            return []
+        due = sorted(self._ready)
+        self._ready.clear()
+        self._count -= len(due)
+        for call in due:
+            call.bucket = None
+        return due
+
+class Scheduler:
+    """Run callbacks at monotonic deadlines of `clock` from a single worker thread.
+
+    Pending calls are kept in a queue backend: a HeapQueue by default or a
+    TimingWheel for workloads dominated by create/cancel churn. With a
+    VirtualClock there is no worker thread; the clock runs due calls as it
+    is advanced.
+    """
+
+    def __init__(self, queue=None, clock: Clock = SYSTEM_CLOCK):
+        self._queue = queue if queue is not None else HeapQueue()
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.clock = clock
+        self._driven = clock.attach(self)
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._queue)
+
+    def call_at(self, when: float, callback: Callable, *args) -> ScheduledCall:
+        """Schedule callback(*args) at the monotonic time `when`."""
+        call = ScheduledCall(when, next(self._counter), callback, args)
+        with self._condition:
+            earliest = self._queue.push(call)
+            if not self._running:
+                self._start()
+            elif earliest:
+                # Possibly a new earliest deadline, wake the worker to re-check
+                self._condition.notify()
+        return call
+
+    def call_later(self, delay: float, callback: Callable, *args) -> ScheduledCall:
+        """Schedule callback(*args) to run after `delay` seconds."""
+        return self.call_at(self.clock.monotonic() + delay, callback, *args)
+
+    def cancel(self, call: Optional[ScheduledCall]) -> None:
+        """Cancel a scheduled call. Cancelling twice is harmless."""
+        if call is None:
+            return
+        with self._condition:
+            call.cancelled = True
+            if call.bucket is not None:
+                self._queue.remove(call)
+
+    def shutdown(self) -> None:
+        """Stop the worker thread and drop all pending calls."""
+        with self._condition:
+            self._running = False
+            self._queue.clear()
+            self._condition.notify()
+            thread = self._thread
+            self._thread = None
+        if thread and thread is not threading.current_thread():
+            thread.join()
+
+    def _start(self) -> None:
+        self._running = True
+        if self._driven:
+            return
+        self._thread = threading.Thread(target=self._run, name="TimerScheduler")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _wait_due(self) -> Optional[List[ScheduledCall]]:
+        """Wait for and return the next batch of due calls, or None on shutdown."""
+        with self._condition:
+            # A callback may restart the scheduler after shutdown; the old
+            # worker then exits instead of competing with the new one.
+            while self._running and self._thread is threading.current_thread():
+                due = self._queue.pop_due(self.clock.monotonic())
+                if due:
+                    return due
+                deadline = self._queue.next_deadline()
+                if deadline is None:
+                    self._condition.wait()
+                else:
+                    self.clock.wait(self._condition, max(deadline - self.clock.monotonic(), 0))
+            return None
+
+    def next_deadline(self) -> Optional[float]:
+        """When the next call may be due, None if nothing is scheduled."""
+        with self._condition:
+            return self._queue.next_deadline()
+
+    def run_due(self, now: float) -> None:
+        """Run the calls due by `now` on this thread. Used by clocks that
+        drive the scheduler instead of a worker thread."""
+        with self._condition:
+            due = self._queue.pop_due(now)
+        for call in due:
+            if not call.cancelled:
+                self._invoke(call)
+
+    @staticmethod
+    def _invoke(call: ScheduledCall) -> None:
+        try:
+            call.callback(*call.args)
+        except Exception as e:
+            print(f"Error in scheduled callback: {str(e)}")
+
+    def _run(self) -> None:
+        worker = threading.current_thread()
+        while True:
+            due = self._wait_due()
+            if due is None:
+                return
+            for call in due:
+                if self._thread is not worker:
+                    return  # shut down mid-batch
+                if not call.cancelled:
+                    self._invoke(call)
+
+def format_time(seconds: float) -> str:
+    """Format time in a concise way, focusing on minutes."""
+    seconds = math.ceil(seconds)
+    if seconds <= 0:
+        return "0m"
+
+    minutes = seconds // 60
+    if minutes > 0:
+        return f"{minutes}m"
+    else:
+        return f"{seconds}s"
+
+class TimerEvent:
+    """Base class for events published on a TimerManager's EventBus."""
+    __slots__ = ('name',)
+
+    def __init__(self, name: Optional[str]):
         self.name = name
+
+    def fields(self) -> Dict[str, object]:
+        """The event's attributes by name."""
+        return {slot: getattr(self, slot)
+                for cls in reversed(type(self).__mro__)
+                for slot in getattr(cls, '__slots__', ())}
+
+    def to_dict(self) -> Dict[str, object]:
+        """JSON-friendly form, tagged with the event type."""
+        data = {'event': type(self).__name__}
+        data.update(self.fields())
+        return data
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{key}={value!r}" for key, value in self.fields().items())
+        return f"{type(self).__name__}({fields})"
+
+class TimerCreated(TimerEvent):
+    """A timer was created, or an alerting timer was refreshed."""
+    __slots__ = ('duration', 'refreshed')
+
+    def __init__(self, name: str, duration: int, refreshed: bool = False):
+        super().__init__(name)
         self.duration = duration
-        self.remaining = duration
-        self.running = False
-        self.thread: Optional[threading.Thread] = None
-        self.paused = False
-        self.start_time: Optional[datetime] = None
-        self.callback: Optional[Callable[[str], None]] = None
-        self.alerting = False
-
-    def format_time(self, seconds: int) -> str:
-        """Format time in a concise way, focusing on minutes."""
-        if seconds <= 0:
-            return "0m"
-
-        minutes = seconds // 60
-        if minutes > 0:
-            return f"{minutes}m"
-        else:
-            return f"{seconds}s"
-
-    def run(self):
-        """Run the timer with minimal output."""
-        self.start_time = datetime.now()
-        last_output = ""
-
-        while self.remaining > 0 and self.running:
-            if not self.paused:
-                current_output = self.format_time(self.remaining)
-                # Only update output if it has changed
-                if current_output != last_output:
-                    if self.callback:
-                        self.callback(f"[{self.name}]: {current_output}")
-                    last_output = current_output
-                time.sleep(1)
-                self.remaining -= 1
+        self.refreshed = refreshed
+
+class TimerTick(TimerEvent):
+    """The displayed remaining time changed. list_timers also publishes one
+    per running timer as a snapshot."""
+    __slots__ = ('remaining', 'display', 'paused')
+
+    def __init__(self, name: str, remaining: float, display: str, paused: bool = False):
+        super().__init__(name)
+        self.remaining = remaining
+        self.display = display
+        self.paused = paused
+
+class TimerStarted(TimerEvent):
+    """A stopped timer was started again."""
+    __slots__ = ('remaining',)
+
+    def __init__(self, name: str, remaining: float):
+        super().__init__(name)
+        self.remaining = remaining
+
+class TimerPaused(TimerEvent):
+    """A timer was paused. `bulk` is set when part of a bulk operation,
+    which is announced once by a TimersUpdated event."""
+    __slots__ = ('remaining', 'bulk')
+
+    def __init__(self, name: str, remaining: float, bulk: bool = False):
+        super().__init__(name)
+        self.remaining = remaining
+        self.bulk = bulk
+
+class TimerResumed(TimerEvent):
+    __slots__ = ('remaining', 'bulk')
+
+    def __init__(self, name: str, remaining: float, bulk: bool = False):
+        super().__init__(name)
+        self.remaining = remaining
+        self.bulk = bulk
+
+class TimerCompleted(TimerEvent):
+    """A timer reached zero. `lateness` is how late it fired, in seconds."""
+    __slots__ = ('lateness',)
+
+    def __init__(self, name: str, lateness: Optional[float] = None):
+        super().__init__(name)
+        self.lateness = lateness
+
+class TimerSnoozed(TimerEvent):
+    """A finished timer's alert was silenced for `seconds`; it sounds again after."""
+    __slots__ = ('seconds',)
+
+    def __init__(self, name: str, seconds: float):
+        super().__init__(name)
+        self.seconds = seconds
+
+class TimerStopped(TimerEvent):
+    __slots__ = ('bulk',)
+
+    def __init__(self, name: str, bulk: bool = False):
+        super().__init__(name)
+        self.bulk = bulk
+
+class TimerDeleted(TimerEvent):
+    __slots__ = ('bulk',)
+
+    def __init__(self, name: str, bulk: bool = False):
+        super().__init__(name)
+        self.bulk = bulk
+
+class TimersCleared(TimerEvent):
+    """Every timer was removed at once. `name` is None, `names` lists them."""
+    __slots__ = ('names',)
+
+    def __init__(self, names: List[str]):
+        super().__init__(None)
+        self.names = names
+
+class TimersUpdated(TimerEvent):
+    """A bulk operation paused, resumed, stopped or deleted several timers.
+
+    `action` is "pause", "resume", "stop" or "delete" and `names` lists the
+    timers it changed. Each of them also gets its own event, with `bulk` set.
+    """
+    __slots__ = ('action', 'names')
+
+    def __init__(self, action: str, names: List[str]):
+        super().__init__(None)
+        self.action = action
+        self.names = names
+
+class Subscription:
+    """Handle returned by EventBus.subscribe."""
+    __slots__ = ('callback', 'types', 'names')
+
+    def __init__(self, callback: Callable[[TimerEvent], None], types: tuple, names: Optional[frozenset]):
+        self.callback = callback
+        self.types = types
+        self.names = names
+
+    def matches(self, event: TimerEvent) -> bool:
+        if self.names is None:
+            return True
+        if event.name is None:
+            return not self.names.isdisjoint(event.names)
+        return event.name in self.names
+
+EVENT_TYPES = (TimerCreated, TimerStarted, TimerTick, TimerPaused, TimerResumed,
+               TimerCompleted, TimerSnoozed, TimerStopped, TimerDeleted, TimersCleared, TimersUpdated)
+
+class EventBus:
+    """Publish/subscribe hub for timer events.
+
+    Subscriptions are indexed by event type in copy-on-write tuples, so
+    publishing takes no lock and only visits callbacks that want the event.
+    Callbacks run on the publishing thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_type: Dict[type, tuple] = {}
+        # Histogram of callback durations, set when metrics are enabled
+        self.callback_seconds = None
+
+    def subscribe(self, callback: Callable[[TimerEvent], None], types=None, names=None) -> Subscription:
+        """Call `callback` for events of the given types about the given timers.
+
+        `types` and `names` are iterables; None means all of them.
+        """
+        types = tuple(types) if types is not None else EVENT_TYPES
+        names = frozenset(names) if names is not None else None
+        subscription = Subscription(callback, types, names)
+        with self._lock:
+            for event_type in types:
+                self._by_type[event_type] = self._by_type.get(event_type, ()) + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Optional[Subscription]) -> None:
+        if subscription is None:
+            return
+        with self._lock:
+            for event_type in subscription.types:
+                self._by_type[event_type] = tuple(
+                    s for s in self._by_type.get(event_type, ()) if s is not subscription)
+
+    def publish(self, event: TimerEvent) -> None:
+        histogram = self.callback_seconds
+        for subscription in self._by_type.get(type(event), ()):
+            if subscription.names is None or subscription.matches(event):
+                try:
+                    if histogram is None:
+                        subscription.callback(event)
+                    else:
+                        start = time.perf_counter()
+                        subscription.callback(event)
+                        histogram.observe(time.perf_counter() - start)
+                except Exception as e:
+                    print(f"Error in event subscriber: {str(e)}")
+
+BULK_VERBS = {'pause': "Paused", 'resume': "Resumed", 'stop': "Stopped", 'delete': "Deleted"}
+
+def format_names(names: List[str], limit: int = 10) -> str:
+    """Comma-separated names, cut off after `limit` of them."""
+    if len(names) <= limit:
+        return ', '.join(names)
+    return f"{', '.join(names[:limit])} and {len(names) - limit} more"
+
+def format_event(event: TimerEvent) -> List[str]:
+    """Render an event as the legacy output_callback messages."""
+    name = event.name
+    if isinstance(event, TimerTick):
+        return [f"[{name}]: {event.display}"]
+    if isinstance(event, (TimerPaused, TimerResumed)):
+        # Bulk changes are reported once, by their TimersUpdated event
+        return [] if event.bulk else [f"[{name}]: {format_time(event.remaining)}"]
+    if isinstance(event, TimerCompleted):
+        return [f"[{name}]: Complete!"]
+    if isinstance(event, TimerSnoozed):
+        return [f"Snoozed timer '{name}' ({format_time(event.seconds)})"]
+    if isinstance(event, TimerCreated):
+        if event.refreshed:
+            return [f"Refreshed timer '{name}' ({format_time(event.duration)})"]
+        return [f"Created timer '{name}' ({format_time(event.duration)})",
+                f"[{name}]: {format_time(event.duration)}"]
+    if isinstance(event, TimerStopped):
+        return [] if event.bulk else [f"Stopped timer '{name}'", f"[{name}]: Complete!"]
+    if isinstance(event, TimerDeleted):
+        return [] if event.bulk else [f"Deleted timer '{name}'"]
+    if isinstance(event, TimersCleared):
+        return [f"Cleared {len(event.names)} timer(s): {', '.join(event.names)}"]
+    if isinstance(event, TimersUpdated):
+        return [f"{BULK_VERBS[event.action]} {len(event.names)} timer(s): {format_names(event.names)}"]
+    return []
+
+class OutputAdapter:
+    """Event subscriber that forwards formatted messages to a string callback."""
+
+    def __init__(self, output: Callable[[str], None]):
+        self.output = output
+
+    def __call__(self, event: TimerEvent) -> None:
+        for message in format_event(event):
+            self.output(message)
+
+# Timer flag bits, stored one byte per timer in TimerStore.flags
+LIVE = 1
+RUNNING = 2
+PAUSED = 4
+ALERTING = 8
+
+# Stands in for None in float columns
+NOT_SET = math.nan
+
+NO_TAGS = frozenset()
+
+def display_key(seconds: float) -> int:
+    """The remaining time rounded to what format_time shows, so that
+    format_time(display_key(s)) == format_time(s)."""
+    seconds = math.ceil(seconds)
+    if seconds <= 0:
+        return 0
+    if seconds >= 60:
+        return (seconds // 60) * 60
+    return seconds
+
+class TimerStore:
+    """Struct-of-arrays storage for timer state.
+
+    Every timer owns a slot, an index into parallel `array` columns. Timer
+    objects are thin views over their slot, so a timer costs its column
+    entries plus one small object, and bulk queries scan whole columns at C
+    speed instead of visiting each object. Released slots are reused.
+
+    While counting down only a timer's monotonic deadline is stored;
+    otherwise its remaining time is banked so pause/resume loses nothing.
+    Deadlines are readings of `clock`.
+    """
+
+    def __init__(self, clock: Clock = SYSTEM_CLOCK):
+        self.clock = clock
+        self.monotonic = clock.monotonic
+        self.names: List[Optional[str]] = []
+        self.durations = array('d')
+        self.deadlines = array('d')   # monotonic deadline, NaN unless counting down
+        self.banked = array('d')      # remaining seconds while not counting down
+        self.lateness = array('d')
+        self.start_times = array('d')  # wall clock, NaN if never started
+        self.flags = array('B')
+        self.generations = array('Q')
+        self.displays = array('q')    # display_key of the last reported time, -1 for none
+        self.tags: List[frozenset] = []
+        self.schedules: List[object] = []   # schedules.Schedule of recurring timers, else None
+        self.callbacks: List[Optional[Callable[[TimerEvent], None]]] = []
+        self.handles: List[Optional[ScheduledCall]] = []
+        self._free: List[int] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names) - len(self._free)
+
+    def allocate(self, name: str, duration: float) -> int:
+        """Claim a slot for a new, stopped timer."""
+        with self._lock:
+            if self._free:
+                slot = self._free.pop()
+                self.names[slot] = name
+                self.durations[slot] = duration
+                self.deadlines[slot] = NOT_SET
+                self.banked[slot] = duration
+                self.lateness[slot] = NOT_SET
+                self.start_times[slot] = NOT_SET
+                self.flags[slot] = LIVE
+                self.displays[slot] = -1
+                self.tags[slot] = NO_TAGS
+                self.schedules[slot] = None
+                return slot
+            self.names.append(name)
+            self.durations.append(duration)
+            self.deadlines.append(NOT_SET)
+            self.banked.append(duration)
+            self.lateness.append(NOT_SET)
+            self.start_times.append(NOT_SET)
+            self.flags.append(LIVE)
+            self.generations.append(0)
+            self.displays.append(-1)
+            self.tags.append(NO_TAGS)
+            self.schedules.append(None)
+            self.callbacks.append(None)
+            self.handles.append(None)
+            return len(self.names) - 1
+
+    def release(self, slot: int) -> None:
+        with self._lock:
+            self.names[slot] = None
+            self.deadlines[slot] = NOT_SET
+            self.flags[slot] = 0
+            self.callbacks[slot] = None
+            self.handles[slot] = None
+            self.schedules[slot] = None
+            self._free.append(slot)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of timers counting down, paused, alerting and stopped."""
+        with self._lock:
+            flags = self.flags.tobytes()
+        by_value = [flags.count(value) for value in range(16)]
+        counts = {'running': 0, 'paused': 0, 'alerting': 0, 'stopped': 0}
+        for value, count in enumerate(by_value):
+            if not value & LIVE or not count:
+                continue
+            if value & ALERTING:
+                counts['alerting'] += count
+            elif not value & RUNNING:
+                counts['stopped'] += count
+            elif value & PAUSED:
+                counts['paused'] += count
             else:
-                time.sleep(0.1)
+                counts['running'] += count
+        return counts
 
-        if self.remaining <= 0 and self.running:
-            if self.callback:
-                self.callback(f"[{self.name}]: Complete!")
-                self.alerting = True
+    def expiring_within(self, seconds: float, now: Optional[float] = None) -> List[str]:
+        """Names of timers counting down that reach zero within `seconds`."""
+        if now is None:
+            now = self.monotonic()
+        with self._lock:
+            # map/compress run in C; NaN deadlines compare false and drop out
+            return list(itertools.compress(self.names, map((now + seconds).__ge__, self.deadlines)))
+
+class Timer:
+    """A timer, viewed through its slot in a TimerStore.
+
+    Without a store the timer gets a private one, so Timer(name, duration)
+    still works on its own.
+    """
+    __slots__ = ('_store', '_slot')
+
+    def __init__(self, name: str, duration: int, store: Optional[TimerStore] = None):
+        self._store = store if store is not None else TimerStore()
+        self._slot = self._store.allocate(name, duration)
+
+    def detach(self) -> None:
+        """Move this timer's state into a private store and free its slot.
+
+        Used when a timer is removed from its manager, so the view stays
+        valid after the slot is reused.
+        """
+        store, slot = self._store, self._slot
+        private = TimerStore(store.clock)
+        private.allocate(store.names[slot], store.durations[slot])
+        for column in ('durations', 'deadlines', 'banked', 'lateness', 'start_times',
+                       'flags', 'generations', 'displays', 'tags', 'schedules',
+                       'callbacks', 'handles'):
+            getattr(private, column)[0] = getattr(store, column)[slot]
+        store.release(slot)
+        self._store, self._slot = private, 0
+
+    def _flag(bit: int):
+        def get(self) -> bool:
+            return bool(self._store.flags[self._slot] & bit)
+
+        def set(self, value: bool) -> None:
+            flags = self._store.flags
+            if value:
+                flags[self._slot] |= bit
+            else:
+                flags[self._slot] &= ~bit
+        return property(get, set)
+
+    def _optional(column: str):
+        def get(self) -> Optional[float]:
+            value = getattr(self._store, column)[self._slot]
+            return None if value != value else value
+
+        def set(self, value: Optional[float]) -> None:
+            getattr(self._store, column)[self._slot] = NOT_SET if value is None else value
+        return property(get, set)
+
+    def _column(column: str):
+        def get(self):
+            return getattr(self._store, column)[self._slot]
+
+        def set(self, value) -> None:
+            getattr(self._store, column)[self._slot] = value
+        return property(get, set)
+
+    running = _flag(RUNNING)
+    paused = _flag(PAUSED)
+    alerting = _flag(ALERTING)
+    deadline = _optional('deadlines')
+    lateness = _optional('lateness')
+    banked = _column('banked')
+    generation = _column('generations')
+    callback = _column('callbacks')
+    tags = _column('tags')
+    # Recurrence rule of a recurring timer, None for a one-shot countdown
+    schedule = _column('schedules')
+    # Pending tick on the scheduler; generation invalidates stale ticks
+    handle = _column('handles')
+    del _flag, _optional, _column
+
+    @property
+    def name(self) -> str:
+        return self._store.names[self._slot]
+
+    @property
+    def duration(self):
+        duration = self._store.durations[self._slot]
+        return int(duration) if duration.is_integer() else duration
+
+    @duration.setter
+    def duration(self, seconds) -> None:
+        self._store.durations[self._slot] = seconds
+
+    @property
+    def start_time(self) -> Optional[datetime]:
+        started = self._store.start_times[self._slot]
+        return None if started != started else datetime.fromtimestamp(started)
+
+    @start_time.setter
+    def start_time(self, value: Optional[datetime]) -> None:
+        self._store.start_times[self._slot] = NOT_SET if value is None else value.timestamp()
+
+    @property
+    def last_output(self) -> str:
+        key = self._store.displays[self._slot]
+        return "" if key < 0 else format_time(key)
+
+    @last_output.setter
+    def last_output(self, value: str) -> None:
+        # Only clearing is supported; report() records what it shows
+        self._store.displays[self._slot] = -1
+
+    @property
+    def remaining(self) -> float:
+        """Seconds left, computed from the deadline when counting down."""
+        store, slot = self._store, self._slot
+        deadline = store.deadlines[slot]
+        if deadline != deadline:
+            return store.banked[slot]
+        return max(0.0, deadline - store.monotonic())
+
+    @remaining.setter
+    def remaining(self, seconds: float) -> None:
+        store, slot = self._store, self._slot
+        store.banked[slot] = float(seconds)
+        if store.deadlines[slot] == store.deadlines[slot]:
+            store.deadlines[slot] = store.monotonic() + seconds
+
+    def start_countdown(self) -> None:
+        """Turn the banked time into a deadline."""
+        store, slot = self._store, self._slot
+        store.deadlines[slot] = store.monotonic() + store.banked[slot]
+
+    def freeze(self) -> None:
+        """Bank the time left and stop counting down."""
+        self._store.banked[self._slot] = self.remaining
+        self._store.deadlines[self._slot] = NOT_SET
+
+    def next_change(self) -> float:
+        """Monotonic time at which the formatted remaining time next changes."""
+        seconds = math.ceil(self.remaining)
+        if seconds >= 60:
+            boundary = (seconds // 60) * 60 - 1
+        else:
+            boundary = max(seconds - 1, 0)
+        return self.deadline - boundary
+
+    def format_time(self, seconds: float) -> str:
+        return format_time(seconds)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Snapshot of the timer's state."""
+        return {
+            'name': self.name,
+            'duration': self.duration,
+            'remaining': self.remaining,
+            'running': self.running,
+            'paused': self.paused,
+            'alerting': self.alerting,
+            'tags': sorted(self.tags),
+            'schedule': str(self.schedule) if self.schedule is not None else None,
+        }
+
+    def report(self):
+        """Publish a tick through the callback if the displayed time changed."""
+        remaining = self.remaining
+        key = display_key(remaining)
+        displays = self._store.displays
+        if key != displays[self._slot]:
+            displays[self._slot] = key
+            callback = self._store.callbacks[self._slot]
+            if callback:
+                callback(TimerTick(self.name, remaining, format_time(key)))
+
+class TimerRegistry:
+    """Timers by name, sharded into lock stripes by name hash.
+
+    Commands on timers in different stripes don't contend for a lock, while
+    commands on the same timer are serialized by its stripe's lock (see
+    lock()). Iteration works on a snapshot taken with every stripe locked,
+    so it is consistent and safe while other threads change the registry.
+    Snapshots list timers in creation order, like a dict.
+    """
+
+    def __init__(self, stripes: int = 16):
+        self._stripes: List[Dict[str, tuple]] = [{} for _ in range(stripes)]
+        self._locks = [threading.RLock() for _ in range(stripes)]
+        self._order = itertools.count()
+
+    def _index(self, name: str) -> int:
+        return hash(name) % len(self._stripes)
+
+    def lock(self, name: str) -> threading.RLock:
+        """The (reentrant) lock guarding `name`'s stripe."""
+        return self._locks[self._index(name)]
+
+    def lock_all(self) -> 'AllStripes':
+        """Context manager holding every stripe lock, for whole-registry changes."""
+        return AllStripes(self._locks)
+
+    def __getitem__(self, name: str) -> Timer:
+        return self._stripes[self._index(name)][name][1]
+
+    def get(self, name: str, default=None) -> Optional[Timer]:
+        entry = self._stripes[self._index(name)].get(name)
+        return entry[1] if entry is not None else default
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._stripes[self._index(name)]
+
+    def __setitem__(self, name: str, timer: Timer) -> None:
+        index = self._index(name)
+        with self._locks[index]:
+            stripe = self._stripes[index]
+            entry = stripe.get(name)
+            stripe[name] = (entry[0] if entry is not None else next(self._order), timer)
+
+    def add(self, name: str, timer: Timer) -> bool:
+        """Insert `timer` unless the name is taken. Returns whether it was added."""
+        index = self._index(name)
+        with self._locks[index]:
+            stripe = self._stripes[index]
+            if name in stripe:
+                return False
+            stripe[name] = (next(self._order), timer)
+            return True
+
+    def pop(self, name: str) -> Timer:
+        index = self._index(name)
+        with self._locks[index]:
+            return self._stripes[index].pop(name)[1]
+
+    def __len__(self) -> int:
+        return sum(len(stripe) for stripe in self._stripes)
+
+    def snapshot(self) -> List[tuple]:
+        """(name, timer) pairs in creation order, taken atomically."""
+        with self.lock_all():
+            entries = [(order, name, timer)
+                       for stripe in self._stripes
+                       for name, (order, timer) in stripe.items()]
+        entries.sort(key=lambda entry: entry[0])
+        return [(name, timer) for _, name, timer in entries]
+
+    def items(self) -> List[tuple]:
+        return self.snapshot()
+
+    def keys(self) -> List[str]:
+        return [name for name, _ in self.snapshot()]
+
+    def values(self) -> List[Timer]:
+        return [timer for _, timer in self.snapshot()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def clear(self) -> List[tuple]:
+        """Remove every timer, returning the removed (name, timer) pairs."""
+        with self.lock_all():
+            removed = self.snapshot()
+            for stripe in self._stripes:
+                stripe.clear()
+        return removed
+
+class AllStripes:
+    """Acquires a list of locks in order and releases them in reverse."""
+
+    def __init__(self, locks: List[threading.RLock]):
+        self._locks = locks
+
+    def __enter__(self):
+        for lock in self._locks:
+            lock.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        for lock in reversed(self._locks):
+            lock.release()
+
+# The part of a glob pattern before its first wildcard
+GLOB_LITERAL_PREFIX = re.compile(r'[^*?\[]*')
+
+class TimerIndex:
+    """Secondary indexes over timer names, for bulk operations.
+
+    Tags map to sets of names, and names are also kept in a sorted list so
+    a name prefix is a bisect away. A glob pattern is narrowed to the names
+    sharing its literal prefix before fnmatch is tried on each.
+    """
 
-class TimerManager:
     def __init__(self):
-        self.timers: Dict[str, Timer] = {}
+        self._lock = threading.Lock()
+        self._by_tag: Dict[str, set] = {}
+        self._names: List[str] = []
+        # One shared frozenset per distinct combination of tags
+        self._tag_sets: Dict[frozenset, frozenset] = {}
+
+    def add(self, name: str, tags: Iterable[str] = ()) -> frozenset:
+        """Index a timer. Returns its tags as a shared frozenset to store."""
+        tags = frozenset(tags)
+        with self._lock:
+            bisect.insort(self._names, name)
+            if not tags:
+                return NO_TAGS
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(name)
+            return self._tag_sets.setdefault(tags, tags)
+
+    def remove(self, name: str, tags: Iterable[str] = ()) -> None:
+        with self._lock:
+            names = self._names
+            index = bisect.bisect_left(names, name)
+            if index < len(names) and names[index] == name:
+                del names[index]
+            for tag in tags:
+                tagged = self._by_tag.get(tag)
+                if tagged is not None:
+                    tagged.discard(name)
+                    if not tagged:
+                        del self._by_tag[tag]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_tag.clear()
+            self._names.clear()
+            self._tag_sets.clear()
+
+    def tags(self) -> List[str]:
+        with self._lock:
+            return sorted(self._by_tag)
+
+    def with_tag(self, tag: str) -> List[str]:
+        with self._lock:
+            return sorted(self._by_tag.get(tag, ()))
+
+    def with_prefix(self, prefix: str) -> List[str]:
+        with self._lock:
+            names = self._names
+            start = bisect.bisect_left(names, prefix)
+            if not prefix:
+                return names[start:]
+            # The smallest string greater than every string starting with prefix
+            end = bisect.bisect_left(names, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)
+            return names[start:end]
+
+    def matching(self, pattern: str) -> List[str]:
+        """Names matching a glob pattern (*, ?, [...]), sorted."""
+        literal = GLOB_LITERAL_PREFIX.match(pattern).group()
+        candidates = self.with_prefix(literal)
+        if literal == pattern:
+            return [name for name in candidates if name == pattern]
+        match = re.compile(fnmatch.translate(pattern)).match
+        return [name for name in candidates if match(name)]
+
+    def select(self, tag: Optional[str] = None, pattern: Optional[str] = None) -> List[str]:
+        """Names with `tag` that match `pattern`, sorted. None matches everything."""
+        if pattern is not None:
+            names = self.matching(pattern)
+            if tag is not None:
+                tagged = set(self.with_tag(tag))
+                names = [name for name in names if name in tagged]
+            return names
+        if tag is not None:
+            return self.with_tag(tag)
+        return self.with_prefix('')
+
+def locked(method):
+    """Run a TimerManager command under the stripe lock of the timer it names."""
+    @functools.wraps(method)
+    def wrapper(self, name, *args, **kwargs):
+        with self.timers.lock(name):
+            return method(self, name, *args, **kwargs)
+    return wrapper
+
+class TimerManager:
+    def __init__(self, engine: str = "heap", resolution: float = 0.01, clock: Clock = SYSTEM_CLOCK,
+                 ticks: bool = True):
+        """Create a manager. `engine` picks the scheduler queue: "heap", or
+        "wheel" for a timing wheel ticking every `resolution` seconds.
+        `clock` is where time comes from; see clock.VirtualClock to
+        simulate it. With ticks=False, running timers publish no TimerTick
+        as their display changes and are only woken at their deadlines,
+        e.g. for simulations that only care when timers finish."""
+        self.clock = clock
+        self.ticks = ticks
+        self.timers = TimerRegistry()
+        self.index = TimerIndex()
+        self.store = TimerStore(clock)
         self.output_callback = None
-        self.alert_manager = AlertManager()
+        self.events = EventBus()
+        self._publish = self.events.publish
+        # Legacy string output, built from events for output_callback users
+        self.output_adapter: Optional[Subscription] = self.events.subscribe(OutputAdapter(self._print))
+        if engine == "heap":
+            self.scheduler = Scheduler(HeapQueue(), clock)
+        elif engine == "wheel":
+            self.scheduler = Scheduler(TimingWheel(resolution, origin=clock.monotonic()), clock)
+        else:
+            raise ValueError(f"Unknown timer engine '{engine}'")
+        # Alert timeouts, escalation and beeps are deadlines on the same scheduler
+        self.alert_manager = AlertManager(clock=clock, scheduler=self.scheduler)
+        # Recent firing lateness samples (actual minus intended fire time)
+        self.lateness_samples = deque(maxlen=10000)
+        # TimerMetrics once enable_metrics() is called
+        self.metrics = None
+
+    def shutdown(self) -> None:
+        """Stop the scheduler and the alert audio thread. Timers keep their
+        state but no longer count down."""
+        self.scheduler.shutdown()
+        self.alert_manager.close()
 
-    def set_output_callback(self, callback: Callable[[str], None]):
-        """Set callback for timer output"""
+    def enable_metrics(self, registry=None):
+        """Start collecting runtime metrics and return the TimerMetrics.
+
+        `registry` is a metrics.MetricsRegistry to add them to; by default
+        a new one is created.
+        """
+        if self.metrics is None:
+            from metrics import TimerMetrics
+            self.metrics = TimerMetrics(self, registry)
+            self.events.callback_seconds = self.metrics.callback_seconds
+            self.alert_manager.metrics = self.metrics
+        return self.metrics
+
+    def set_output_callback(self, callback: Callable[[str], None], include_events: bool = True):
+        """Set callback for timer output.
+
+        With include_events=False only plain messages are sent to it, for
+        consumers that subscribe to self.events directly.
+        """
         self.output_callback = callback
+        if include_events and self.output_adapter is None:
+            self.output_adapter = self.events.subscribe(OutputAdapter(self._print))
+        elif not include_events:
+            self.events.unsubscribe(self.output_adapter)
+            self.output_adapter = None
 
     def _print(self, message: str):
         """Print message using callback if available"""
@@ -67,7 +1160,8 @@ class TimerManager:
         else:
             print(message)
 
-    def create_timer(self, name: str, duration: int) -> None:
+    @locked
+    def create_timer(self, name: str, duration: int, tags: Iterable[str] = ()) -> None:
         if name in self.timers:
             # If timer exists and is alerting, stop the alert and refresh duration
             if self.timers[name].alerting:
@@ -75,24 +1169,29 @@ class TimerManager:
                 timer = self.timers[name]
                 timer.alerting = False
                 timer.duration = duration
-                timer.remaining = duration
+                timer.banked = float(duration)
                 timer.running = True
                 timer.paused = False
-                self._print(f"Refreshed timer '{name}' ({timer.format_time(duration)})")
+                timer.last_output = ""
+                timer.start_countdown()
+                self.events.publish(TimerCreated(name, duration, refreshed=True))
+                self._schedule_tick(timer)
                 return
             raise ValueError(f"Timer '{name}' already exists")
 
-        timer = Timer(name, duration)
-        timer.callback = self._print
+        timer = self._new_timer(name, duration)
+        timer.callback = self._publish
+        timer.tags = self.index.add(name, tags)
         self.timers[name] = timer
-        self._print(f"Created timer '{name}' ({timer.format_time(duration)})")
-
-        # Send initial timer state to display
-        self._print(f"[{name}]: {timer.format_time(duration)}")
+        self.events.publish(TimerCreated(name, duration))
 
         # Automatically start the timer
         self.start_timer(name)
 
+    def _new_timer(self, name: str, duration: int) -> Timer:
+        return Timer(name, duration, self.store)
+
+    @locked
     def start_timer(self, name: str) -> None:
         if name not in self.timers:
             raise ValueError(f"Timer '{name}' does not exist")
@@ -107,22 +1206,175 @@ class TimerManager:
             self.alert_manager.stop_alert(name)
             timer.alerting = False
 
+        if timer.schedule is not None:
+            # Restart the recurrence from now
+            now = self.clock.time()
+            due = timer.schedule.start(now)
+            if due is None:
+                raise ValueError(f"Timer '{name}' has no more occurrences")
+            timer.duration = timer.banked = due - now
+
         timer.running = True
         timer.paused = False
-        timer.thread = threading.Thread(target=timer.run)
-        timer.thread.daemon = True
-        timer.thread.start()
+        timer.start_time = self.clock.now()
+        timer.last_output = ""
+        timer.start_countdown()
+        if timer.callback:
+            timer.callback(TimerStarted(name, timer.remaining))
+        timer.report()
+        self._schedule_tick(timer)
 
-        # Start alert when timer completes
-        def check_and_alert():
-            timer.thread.join()
-            if timer.running and timer.remaining <= 0:
-                self.alert_manager.start_alert(name)
+    @locked
+    def create_recurring(self, name: str, schedule, tags: Iterable[str] = ()) -> None:
+        """Create a timer that fires on a schedules.Schedule and starts it.
 
-        alert_check_thread = threading.Thread(target=check_and_alert)
-        alert_check_thread.daemon = True
-        alert_check_thread.start()
+        The timer counts down to each occurrence in turn. Every occurrence
+        publishes TimerCompleted and starts an alert, and then the same timer
+        counts down to the next one; after the last, it alerts like a
+        finished one-shot timer.
+        """
+        if name in self.timers:
+            raise ValueError(f"Timer '{name}' already exists")
+        now = self.clock.time()
+        due = schedule.start(now)
+        if due is None:
+            raise ValueError(f"Schedule for '{name}' never fires")
+
+        timer = self._new_timer(name, due - now)
+        timer.callback = self._publish
+        timer.tags = self.index.add(name, tags)
+        timer.schedule = schedule
+        self.timers[name] = timer
+        self.events.publish(TimerCreated(name, timer.duration))
+        self._count_down_to(timer, due, now)
+
+    def _count_down_to(self, timer: Timer, due: float, now: float) -> None:
+        """Start counting down to the wall-clock time `due`."""
+        timer.duration = timer.banked = max(0.0, due - now)
+        timer.running = True
+        timer.paused = False
+        timer.start_time = datetime.fromtimestamp(now)
+        timer.last_output = ""
+        timer.start_countdown()
+        self.events.publish(TimerStarted(timer.name, timer.remaining))
+        timer.report()
+        self._schedule_tick(timer)
+
+    @locked
+    def restore_timer(self, name: str, duration: int, remaining: float, running: bool = True,
+                      paused: bool = False, alerting: bool = False, tags: Iterable[str] = (),
+                      schedule=None) -> None:
+        """Recreate a timer from persisted state without replaying its history.
+
+        A timer that was counting down and has no time left completes at once,
+        or, with a schedule (a schedules.Schedule restored with its progress),
+        fires its missed occurrences and counts down to the next one.
+        """
+        if name in self.timers:
+            raise ValueError(f"Timer '{name}' already exists")
+
+        timer = self._new_timer(name, duration)
+        timer.callback = self._publish
+        timer.banked = max(0.0, float(remaining))
+        timer.running = running
+        timer.paused = paused
+        timer.alerting = alerting
+        timer.tags = self.index.add(name, tags)
+        timer.schedule = schedule
+        self.timers[name] = timer
+        self.events.publish(TimerCreated(name, duration))
+
+        if not running:
+            self.events.publish(TimerStopped(name))
+        elif paused:
+            self.events.publish(TimerPaused(name, timer.banked))
+        elif alerting:
+            self.events.publish(TimerCompleted(name))
+        elif timer.banked > 0:
+            timer.start_countdown()
+            timer.report()
+            self._schedule_tick(timer)
+        elif schedule is not None and schedule.due is not None:
+            self._recur(timer)
+        else:
+            timer.lateness = -float(remaining)
+            self._complete(timer)
+
+    def _schedule_tick(self, timer: Timer) -> None:
+        """Replace the timer's pending tick with one at its next display change."""
+        self.scheduler.cancel(timer.handle)
+        timer.generation += 1
+        timer.handle = self.scheduler.call_at(self._next_wakeup(timer), self._tick, timer, timer.generation)
+
+    def _next_wakeup(self, timer: Timer) -> float:
+        """When the scheduler should next look at a running timer."""
+        return timer.next_change() if self.ticks else timer.deadline
 
+    def _cancel_tick(self, timer: Timer) -> None:
+        self.scheduler.cancel(timer.handle)
+        timer.generation += 1
+        timer.handle = None
+
+    def _tick(self, timer: Timer, generation: int) -> None:
+        """Report or complete a timer. Runs on the scheduler thread."""
+        if generation != timer.generation:
+            return
+        with self.timers.lock(timer.name):
+            # Check again under the lock, a command may have changed the timer
+            if generation != timer.generation or not timer.running or timer.paused:
+                return
+
+            now = self.clock.monotonic()
+            if now < timer.deadline:
+                timer.report()
+                timer.handle = self.scheduler.call_at(self._next_wakeup(timer), self._tick, timer, generation)
+                return
+
+            timer.handle = None
+            timer.lateness = now - timer.deadline
+            self.lateness_samples.append(timer.lateness)
+            if self.metrics is not None:
+                self.metrics.lateness.observe(timer.lateness)
+            timer.deadline = None
+            timer.banked = 0.0
+            if timer.schedule is not None:
+                self._recur(timer)
+            else:
+                self._complete(timer)
+
+    def _recur(self, timer: Timer) -> None:
+        """Fire a recurring timer and count down to its next occurrence.
+
+        Occurrences missed while the process was held up fire late, up to
+        the schedule's catch_up; older ones are skipped.
+        """
+        schedule = timer.schedule
+        # The deadline passed, so the occurrence is due even if the wall clock lags
+        now = max(self.clock.time(), schedule.due)
+        fires, due = schedule.advance(now)
+        if due is None:
+            # The last occurrence finishes the timer like a one-shot
+            for fired_at in fires[:-1]:
+                self.events.publish(TimerCompleted(timer.name, now - fired_at))
+            timer.lateness = now - fires[-1]
+            self._complete(timer)
+            return
+        for fired_at in fires:
+            self.events.publish(TimerCompleted(timer.name, now - fired_at))
+        self._start_alert(timer)
+        self._count_down_to(timer, due, now)
+
+    def _start_alert(self, timer: Timer) -> None:
+        """Alert for a recurring timer's occurrence; the timer keeps counting."""
+        self.alert_manager.start_alert(timer.name)
+
+    def _complete(self, timer: Timer) -> None:
+        """Announce a finished timer and start its alert."""
+        self.events.publish(TimerCompleted(timer.name, timer.lateness))
+        timer.alerting = True
+        self.alert_manager.start_alert(timer.name)
+
+    @locked
     def pause_timer(self, name: str) -> None:
         if name not in self.timers:
             raise ValueError(f"Timer '{name}' does not exist")
@@ -131,15 +1383,22 @@ class TimerManager:
         if not timer.running:
             self._print(f"Timer '{name}' is not running")
             return
+        self._pause(timer)
 
-        timer.paused = True
-        self._print(f"[{name}]: {timer.format_time(timer.remaining)}")
+    def _pause(self, timer: Timer, bulk: bool = False) -> None:
+        name = timer.name
+        if not timer.paused:
+            timer.paused = True
+            timer.freeze()
+        self._cancel_tick(timer)
+        self.events.publish(TimerPaused(name, timer.remaining, bulk))
 
-        # Stop alert if timer is alerting
-        if timer.alerting:
+        # Stop alert if timer is alerting, or recurring and just fired
+        if timer.alerting or timer.schedule is not None:
             self.alert_manager.stop_alert(name)
             timer.alerting = False
 
+    @locked
     def resume_timer(self, name: str) -> None:
         if name not in self.timers:
             raise ValueError(f"Timer '{name}' does not exist")
@@ -148,86 +1407,211 @@ class TimerManager:
         if not timer.running:
             self._print(f"Timer '{name}' is not running")
             return
+        self._resume(timer)
 
+    def _resume(self, timer: Timer, bulk: bool = False) -> None:
+        name = timer.name
         # Stop alert if timer is alerting
         if timer.alerting:
             self.alert_manager.stop_alert(name)
             timer.alerting = False
 
+        was_paused = timer.paused
         timer.paused = False
-        self._print(f"[{name}]: {timer.format_time(timer.remaining)}")
+        if was_paused and timer.remaining > 0:
+            timer.start_countdown()
+            self._schedule_tick(timer)
+        self.events.publish(TimerResumed(name, timer.remaining, bulk))
 
+    @locked
+    def snooze_timer(self, name: str, seconds: Optional[float] = None) -> None:
+        """Silence a finished timer's alert for `seconds`, by default the
+        alert policy's snooze time. The alert sounds again afterwards."""
+        if name not in self.timers:
+            raise ValueError(f"Timer '{name}' does not exist")
+
+        seconds = self.alert_manager.snooze_alert(name, seconds)
+        if seconds is None:
+            self._print(f"Timer '{name}' is not alerting")
+            return
+        self.events.publish(TimerSnoozed(name, seconds))
+
+    @locked
     def stop_timer(self, name: str) -> None:
         if name not in self.timers:
             raise ValueError(f"Timer '{name}' does not exist")
 
-        timer = self.timers[name]
+        self._stop(self.timers[name])
+
+    def _stop(self, timer: Timer, bulk: bool = False) -> None:
+        name = timer.name
         timer.running = False
-        if timer.thread:
-            timer.thread.join(0.1)
-        timer.remaining = timer.duration
+        self._cancel_tick(timer)
+        timer.deadline = None
+        timer.banked = float(timer.duration)
 
-        # Stop alert if timer is alerting
-        if timer.alerting:
+        # Stop alert if timer is alerting, or recurring and just fired
+        if timer.alerting or timer.schedule is not None:
             self.alert_manager.stop_alert(name)
             timer.alerting = False
 
-        self._print(f"Stopped timer '{name}'")
-        self._print(f"[{name}]: Complete!")
+        self.events.publish(TimerStopped(name, bulk))
 
+    @locked
     def delete_timer(self, name: str) -> None:
         if name not in self.timers:
             raise ValueError(f"Timer '{name}' does not exist")
+        self._delete(self.timers[name])
 
-        # Stop alert if timer is alerting
-        if self.timers[name].alerting:
-            self.alert_manager.stop_alert(name)
+    def _delete(self, timer: Timer, bulk: bool = False) -> None:
+        name = timer.name
+        self._stop(timer, bulk)
+        self.timers.pop(name)
+        self.index.remove(name, timer.tags)
+        timer.detach()
+        self.events.publish(TimerDeleted(name, bulk))
+
+    def select(self, tag: Optional[str] = None, pattern: Optional[str] = None) -> List[str]:
+        """Sorted names of timers with `tag` whose names match the glob `pattern`.
+
+        Either may be None, and with neither every timer is selected.
+        """
+        return self.index.select(tag, pattern)
+
+    def _bulk(self, action: str, tag: Optional[str], pattern: Optional[str],
+              applies: Callable[[Timer], bool], apply: Callable[[Timer, bool], None],
+              quiet: bool = False) -> List[str]:
+        """Apply a command to the selected timers in one pass and announce
+        it with a single TimersUpdated event. Returns the names changed;
+        with quiet, an empty selection isn't reported."""
+        changed = []
+        with self.timers.lock_all():
+            for name in self.index.select(tag, pattern):
+                timer = self.timers.get(name)
+                if timer is not None and applies(timer):
+                    apply(timer, True)
+                    changed.append(name)
+        if changed:
+            self.events.publish(TimersUpdated(action, changed))
+        elif not quiet:
+            self._print(f"No timers to {action}")
+        return changed
+
+    def pause_timers(self, tag: Optional[str] = None, pattern: Optional[str] = None,
+                     quiet: bool = False) -> List[str]:
+        """Pause the selected timers that are counting down (see select())."""
+        return self._bulk('pause', tag, pattern, lambda timer: timer.deadline is not None, self._pause,
+                          quiet)
+
+    def resume_timers(self, tag: Optional[str] = None, pattern: Optional[str] = None,
+                      quiet: bool = False) -> List[str]:
+        """Resume the selected timers that are paused."""
+        return self._bulk('resume', tag, pattern, lambda timer: timer.running and timer.paused,
+                          self._resume, quiet)
 
-        self.stop_timer(name)
-        del self.timers[name]
-        self._print(f"Deleted timer '{name}'")
+    def stop_timers(self, tag: Optional[str] = None, pattern: Optional[str] = None,
+                    quiet: bool = False) -> List[str]:
+        """Stop the selected timers that are running or alerting."""
+        return self._bulk('stop', tag, pattern, lambda timer: timer.running or timer.alerting,
+                          self._stop, quiet)
+
+    def delete_timers(self, tag: Optional[str] = None, pattern: Optional[str] = None,
+                      quiet: bool = False) -> List[str]:
+        """Delete the selected timers."""
+        return self._bulk('delete', tag, pattern, lambda timer: True, self._delete, quiet)
+
+    def lateness_stats(self) -> Dict[str, float]:
+        """Summarize recent firing lateness in seconds."""
+        samples = sorted(self.lateness_samples)
+        if not samples:
+            return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+        return {
+            'count': len(samples),
+            'mean': sum(samples) / len(samples),
+            'p50': samples[len(samples) // 2],
+            'p99': samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+            'max': samples[-1],
+        }
+
+    def timer_counts(self) -> Dict[str, int]:
+        """Number of timers counting down, paused, alerting and stopped."""
+        return self.store.counts()
+
+    def expiring_within(self, seconds: float) -> List[str]:
+        """Names of counting-down timers that finish within `seconds`."""
+        # Under the stripe locks, so a timer being deleted is either listed
+        # or gone from both the registry and the store
+        with self.timers.lock_all():
+            return self.store.expiring_within(seconds)
 
     def list_timers(self) -> None:
         if not self.timers:
             self._print("No active timers")
             return
 
-        for name, timer in self.timers.items():
-            if timer.running:
-                self._print(f"[{name}]: {timer.format_time(timer.remaining)}")
+        # Read every timer at one instant, then publish outside the locks
+        with self.timers.lock_all():
+            running = [(name, timer.remaining, timer.paused)
+                       for name, timer in self.timers.items() if timer.running]
+        for name, remaining, paused in running:
+            self.events.publish(TimerTick(name, remaining, format_time(remaining), paused))
 
     def stop_all_timers(self) -> None:
-        self.alert_manager.stop_all_alerts()
-        for name in list(self.timers.keys()):
-            self.stop_timer(name)
+        self.stop_timers()
     
     def clear_all_timers(self) -> None:
         """Clear all timers (stop and delete them)"""
-        if not self.timers:
-            self._print("No timers to clear")
-            return
-        
-        # Stop all alerts first
-        self.alert_manager.stop_all_alerts()
-        
-        # Get list of timer names
-        timer_names = list(self.timers.keys())
-        
-        # Clear all timers
-        self.timers.clear()
-        
-        self._print(f"Cleared {len(timer_names)} timer(s): {', '.join(timer_names)}")
-        
-        # Notify the UI to remove all timer displays
-        if hasattr(self, 'ui_update_callback') and self.ui_update_callback:
-            for name in timer_names:
-                self.ui_update_callback('remove_timer', name)
-
-    def execute_command(self, command: dict) -> None:
+        with self.timers.lock_all():
+            if not self.timers:
+                self._print("No timers to clear")
+                return
+
+            # Stop all alerts first
+            self.alert_manager.stop_all_alerts()
+
+            # Clear all timers
+            removed = self.timers.clear()
+            self.index.clear()
+            for name, timer in removed:
+                timer.running = False
+                self._cancel_tick(timer)
+                timer.detach()
+
+        self.events.publish(TimersCleared([name for name, _ in removed]))
+
+    def execute_command(self, command: dict) -> Optional[List[str]]:
+        """Run a command dict. Returns the names a bulk command changed, else None.
+
+        Without a "name", pause, resume, stop and delete are bulk commands on
+        the timers selected by the optional "tag" and "pattern" keys.
+        """
+        metrics = self.metrics
+        if metrics is None:
+            return self._execute_command(command)
+        metrics.commands.inc(str(command.get("type")))
+        start = time.perf_counter()
+        try:
+            return self._execute_command(command)
+        finally:
+            metrics.command_seconds.observe(time.perf_counter() - start)
+
+    def _execute_command(self, command: dict) -> Optional[List[str]]:
         cmd_type = command["type"]
 
+        if cmd_type in BULK_VERBS and "name" not in command:
+            bulk = {"pause": self.pause_timers, "resume": self.resume_timers,
+                    "stop": self.stop_timers, "delete": self.delete_timers}[cmd_type]
+            return bulk(command.get("tag"), command.get("pattern"))
+
         if cmd_type == "create":
-            self.create_timer(command["name"], command["duration"])
+            self.create_timer(command["name"], command["duration"], command.get("tags", ()))
+        elif cmd_type == "recurring":
+            from schedules import Cron, Every
+            if "cron" in command:
+                schedule = Cron(command["cron"], command.get("count"), command.get("catch_up", 1))
+            else:
+                schedule = Every(command["every"], command.get("count"), command.get("catch_up", 1))
+            self.create_recurring(command["name"], schedule, command.get("tags", ()))
         elif cmd_type == "start":
             self.start_timer(command["name"])
         elif cmd_type == "pause":
@@ -236,9 +1620,12 @@ class TimerManager:
             self.resume_timer(command["name"])
         elif cmd_type == "stop":
             self.stop_timer(command["name"])
+        elif cmd_type == "snooze":
+            self.snooze_timer(command["name"], command.get("seconds"))
         elif cmd_type == "delete":
             self.delete_timer(command["name"])
         elif cmd_type == "list":
             self.list_timers()
         elif cmd_type == "clear":
-            self.clear_all_timers()
\ No newline at end of file
+            self.clear_all_timers()
+        return None